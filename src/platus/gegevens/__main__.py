@@ -1,4 +1,32 @@
-from .gegevens import verwerken_maand
+import argparse
+
+from grienetsiis import invoer_kiezen
+from .gegevens import verwerken_maand, verwerken_export, omzetten_opslag, koppelen_overboekingen, aanvullen_salaris, aanvullen_vingerafdrukken, importeren, beoordelen, controleren
 
 if __name__ == "__main__":
-    verwerken_maand()
\ No newline at end of file
+    
+    parser      =   argparse.ArgumentParser(prog = "python -m platus.gegevens", description = "zonder opdracht volgt het menu")
+    opdrachten  =   parser.add_subparsers(dest = "opdracht")
+    
+    parser_importeren   =   opdrachten.add_parser("importeren", help = "bankexports verwerken zonder invoer, met een wachtrij voor wat niet automatisch kan")
+    parser_importeren.add_argument("rekeningen", nargs = "+", help = "naam of uuid van de bankrekeningen")
+    parser_importeren.add_argument("--van", required = True, help = "eerste maand (JJJJ-MM)")
+    parser_importeren.add_argument("--tot", default = None, help = "laatste maand (JJJJ-MM), standaard gelijk aan --van")
+    parser_importeren.add_argument("--processen", type = int, default = None, help = "aantal processen voor het ontleden, standaard het aantal kernen")
+    
+    opdrachten.add_parser("beoordelen", help = "de wachtrij van de verwerking zonder invoer afhandelen, per groep")
+    
+    parser_controleren  =   opdrachten.add_parser("controleren", help = "saldi, index, dagindex en verwijzingen van alle opgeslagen rekeningen controleren")
+    parser_controleren.add_argument("--processen", type = int, default = None, help = "aantal processen, standaard het aantal kernen")
+    
+    argumenten  =   parser.parse_args()
+    
+    if argumenten.opdracht == "importeren":
+        importeren(argumenten.rekeningen, argumenten.van, argumenten.tot, argumenten.processen)
+    elif argumenten.opdracht == "beoordelen":
+        beoordelen()
+    elif argumenten.opdracht == "controleren":
+        controleren(argumenten.processen)
+    else:
+        opdracht    =   invoer_kiezen("opdracht", {"verwerken": verwerken_maand, "exportbestand verwerken": verwerken_export, "opslag omzetten": omzetten_opslag, "overboekingen koppelen": koppelen_overboekingen, "salaris aanvullen": aanvullen_salaris, "vingerafdrukken aanvullen": aanvullen_vingerafdrukken, "beoordelen": beoordelen, "controleren": controleren})
+        opdracht()
\ No newline at end of file
@@ -0,0 +1,295 @@
+import csv
+import datetime as dt
+import os
+import re
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+import xml.etree.ElementTree as ElementTree
+
+import openpyxl
+
+
+class BankexportRij(NamedTuple):
+    
+    # de genormaliseerde rij waar Transactie.van_bankexport mee werkt, in de
+    # vorm van de Excel-export van ABN AMRO: datums als JJJJMMDD, bedragen in euro
+    rekeningnummer  :   Any
+    muntsoort       :   str
+    transactiedatum :   int
+    rentedatum      :   int
+    beginsaldo      :   float
+    eindsaldo       :   float
+    transactiebedrag:   float
+    omschrijving    :   str
+
+IMPORTEURS  =   {}
+
+def registreren_importeur(
+    extensies   :   Iterable[str],
+    importeur   :   Callable[[str], Iterator[BankexportRij]],
+    ):
+    
+    for extensie in extensies:
+        IMPORTEURS[extensie.casefold()] =   importeur
+
+def lezen_bankexport(pad: str) -> Iterator[BankexportRij]:
+    
+    # kiest de importeur op de extensie van het bestand; elke importeur leest
+    # het bestand rij voor rij, zodat ook een jaaroverzicht niet in één keer in
+    # het geheugen hoeft
+    extensie    =   os.path.splitext(pad)[1].casefold()
+    
+    if extensie not in IMPORTEURS:
+        raise NotImplementedError(f"geen importeur voor bestanden \"{extensie}\" ({pad})")
+    
+    return IMPORTEURS[extensie](pad)
+
+def normaliseren_waarde(waarde: Any) -> Any:
+    
+    # openpyxl geeft hele getallen soms als float, pandas las die als int
+    if isinstance(waarde, float) and waarde.is_integer():
+        return int(waarde)
+    return waarde
+
+def normaliseren_bedrag(bedrag: str) -> float:
+    
+    # "1.234,56", "1234,56" en "1234.56"
+    bedrag  =   bedrag.strip().replace(" ", "")
+    if "," in bedrag:
+        bedrag  =   bedrag.replace(".", "").replace(",", ".")
+    return float(bedrag)
+
+def normaliseren_rekeningnummer(iban: str) -> Any:
+    
+    # bij een Nederlands IBAN het rekeningnummer zoals in de Excel-export
+    iban    =   iban.replace(" ", "")
+    if iban[:2].upper() == "NL" and iban[8:].isdigit():
+        return int(iban[8:])
+    if iban.isdigit():
+        return int(iban)
+    return iban
+
+def maken_rij(
+    rekeningnummer  :   Any,
+    muntsoort       :   str,
+    transactiedatum :   dt.date,
+    rentedatum      :   dt.date,
+    beginsaldo      :   float,
+    transactiebedrag:   float,
+    omschrijving    :   str,
+    ) -> BankexportRij:
+    
+    # voor afschriften zonder eindsaldo per rij: het saldo loopt vanaf het
+    # beginsaldo. een boeking zonder omschrijving kan niet worden ontleed, maar
+    # overslaan zou de keten van saldi breken
+    if beginsaldo is None:
+        raise ValueError(f"geen beginsaldo gevonden voor rekening {rekeningnummer}")
+    if omschrijving is None or omschrijving.strip() == "":
+        raise ValueError(f"boeking zonder omschrijving op {transactiedatum} met bedrag {transactiebedrag:.2f} voor rekening {rekeningnummer}")
+    
+    return BankexportRij(
+        rekeningnummer      =   rekeningnummer,
+        muntsoort           =   muntsoort,
+        transactiedatum     =   int(transactiedatum.strftime("%Y%m%d")),
+        rentedatum          =   int(rentedatum.strftime("%Y%m%d")),
+        beginsaldo          =   round(beginsaldo, 2),
+        eindsaldo           =   round(beginsaldo + transactiebedrag, 2),
+        transactiebedrag    =   round(transactiebedrag, 2),
+        omschrijving        =   omschrijving,
+        )
+
+def lezen_xlsx(pad: str) -> Iterator[BankexportRij]:
+    
+    # Excel-export (read-only), kolommen op naam
+    werkboek    =   openpyxl.load_workbook(pad, read_only = True, data_only = True)
+    
+    try:
+        rijen       =   werkboek.active.iter_rows(values_only = True)
+        kopregel    =   next(rijen, None)
+        
+        if kopregel is None:
+            return
+        
+        kolommen    =   {str(kolom).strip().casefold(): positie for positie, kolom in enumerate(kopregel) if kolom is not None}
+        
+        for waarden in rijen:
+            if all(waarde is None for waarde in waarden):
+                continue
+            yield BankexportRij(*(normaliseren_waarde(waarden[kolommen[veld]]) if veld in kolommen and kolommen[veld] < len(waarden) else None for veld in BankexportRij._fields))
+    finally:
+        werkboek.close()
+
+def lezen_tekst(pad: str) -> Iterator[BankexportRij]:
+    
+    # TXT/TAB/CSV-export: met kopregel op kolomnaam, anders in de volgorde van
+    # de TXT-export van ABN AMRO (rekeningnummer, muntsoort, transactiedatum,
+    # beginsaldo, eindsaldo, rentedatum, transactiebedrag, omschrijving)
+    volgorde    =   ["rekeningnummer", "muntsoort", "transactiedatum", "beginsaldo", "eindsaldo", "rentedatum", "transactiebedrag", "omschrijving"]
+    
+    with open(pad, "r", encoding = "utf-8-sig", newline = "") as bestand:
+        
+        begin       =   bestand.read(4096)
+        bestand.seek(0)
+        dialect     =   csv.Sniffer().sniff(begin, delimiters = "\t;,") if begin.strip() != "" else csv.excel_tab
+        kolommen    =   None
+        
+        for waarden in csv.reader(bestand, dialect):
+            
+            if len(waarden) == 0 or all(waarde.strip() == "" for waarde in waarden):
+                continue
+            
+            if kolommen is None:
+                if "rekeningnummer" in (waarde.strip().casefold() for waarde in waarden):
+                    kolommen    =   {waarde.strip().casefold(): positie for positie, waarde in enumerate(waarden)}
+                    continue
+                kolommen    =   {veld: positie for positie, veld in enumerate(volgorde)}
+            
+            rij =   {veld: waarden[positie].strip() if positie < len(waarden) else "" for veld, positie in kolommen.items()}
+            
+            yield BankexportRij(
+                rekeningnummer      =   normaliseren_waarde(int(rij["rekeningnummer"])) if rij.get("rekeningnummer", "").isdigit() else rij.get("rekeningnummer"),
+                muntsoort           =   rij.get("muntsoort"),
+                transactiedatum     =   int(rij["transactiedatum"]),
+                rentedatum          =   int(rij["rentedatum"]),
+                beginsaldo          =   normaliseren_bedrag(rij["beginsaldo"]),
+                eindsaldo           =   normaliseren_bedrag(rij["eindsaldo"]),
+                transactiebedrag    =   normaliseren_bedrag(rij["transactiebedrag"]),
+                omschrijving        =   rij.get("omschrijving", ""),
+                )
+
+PATROON_MT940_TAG       =   re.compile(r"^:(?P<tag>\d{2}[A-Z]?):(?P<inhoud>.*)$")
+PATROON_MT940_SALDO     =   re.compile(r"^(?P<teken>[CD])(?P<datum>\d{6})(?P<muntsoort>[A-Z]{3})(?P<bedrag>[\d,\.]+)")
+PATROON_MT940_REGEL     =   re.compile(r"^(?P<rentedatum>\d{6})(?P<boekdatum>\d{4})?(?P<teken>R?[CD])[A-Z]?(?P<bedrag>[\d,\.]+)")
+PATROON_MT940_REKENING  =   re.compile(r"^(?P<rekening>.*\d)[A-Z]{3}$")
+
+def lezen_mt940(pad: str) -> Iterator[BankexportRij]:
+    
+    # SWIFT MT940 regel voor regel: :25: rekening, :60F:/:60M: beginsaldo,
+    # :61: een transactie en :86: de omschrijving, die over meerdere regels
+    # kan doorlopen tot de volgende tag
+    rekeningnummer  =   None
+    muntsoort       =   None
+    saldo           =   None
+    regel           =   None
+    omschrijving    =   []
+    
+    def afronden() -> Iterator[BankexportRij]:
+        nonlocal saldo, regel, omschrijving
+        if regel is not None:
+            rentedatum  =   dt.datetime.strptime(regel.group("rentedatum"), "%y%m%d").date()
+            boekdatum   =   rentedatum
+            if regel.group("boekdatum") is not None:
+                boekdatum   =   dt.date(rentedatum.year, int(regel.group("boekdatum")[:2]), int(regel.group("boekdatum")[2:]))
+                # een boekdatum in januari bij een rentedatum in december (of andersom)
+                if (boekdatum - rentedatum).days > 180:
+                    boekdatum   =   boekdatum.replace(year = boekdatum.year - 1)
+                elif (rentedatum - boekdatum).days > 180:
+                    boekdatum   =   boekdatum.replace(year = boekdatum.year + 1)
+            bedrag      =   normaliseren_bedrag(regel.group("bedrag")) * (1 if regel.group("teken") in ("C", "RD") else -1)
+            yield maken_rij(rekeningnummer, muntsoort, boekdatum, rentedatum, saldo, bedrag, "".join(omschrijving).strip())
+            saldo   =   round(saldo + bedrag, 2)
+        regel           =   None
+        omschrijving    =   []
+    
+    with open(pad, "r", encoding = "utf-8", errors = "replace") as bestand:
+        
+        tag =   None
+        
+        for lijn in bestand:
+            
+            lijn        =   lijn.rstrip("\r\n")
+            resultaat   =   PATROON_MT940_TAG.match(lijn)
+            
+            if resultaat is None:
+                if tag == "86":
+                    omschrijving.append(lijn)
+                continue
+            
+            tag, inhoud =   resultaat.group("tag"), resultaat.group("inhoud")
+            
+            if tag in ("61", "62F", "62M", "20"):
+                yield from afronden()
+            
+            if tag == "25":
+                # na het IBAN of rekeningnummer soms de muntsoort (NL91ABNA0417164300EUR)
+                rekeningnummer      =   inhoud.split("/")[-1].strip()
+                resultaat_rekening  =   PATROON_MT940_REKENING.match(rekeningnummer)
+                if resultaat_rekening is not None:
+                    rekeningnummer  =   resultaat_rekening.group("rekening")
+                rekeningnummer      =   normaliseren_rekeningnummer(rekeningnummer)
+            elif tag in ("60F", "60M"):
+                resultaat_saldo =   PATROON_MT940_SALDO.match(inhoud)
+                muntsoort       =   resultaat_saldo.group("muntsoort")
+                saldo           =   normaliseren_bedrag(resultaat_saldo.group("bedrag")) * (1 if resultaat_saldo.group("teken") == "C" else -1)
+            elif tag == "61":
+                regel           =   PATROON_MT940_REGEL.match(inhoud)
+            elif tag == "86":
+                omschrijving    =   [inhoud]
+        
+        yield from afronden()
+
+def lezen_camt053(pad: str) -> Iterator[BankexportRij]:
+    
+    # ISO 20022 CAMT.053 met iterparse: elk afgerond onderdeel van een
+    # afschrift (Stmt), zoals een boeking (Ntry), en het afschrift zelf wordt
+    # verwerkt en direct weer uit de boom verwijderd, zodat het geheugengebruik
+    # niet met de lengte of het aantal afschriften meegroeit. namespaces
+    # worden genegeerd
+    def naam(element: ElementTree.Element) -> str:
+        return element.tag.rsplit("}", 1)[-1]
+    
+    def zoeken(element: ElementTree.Element, *pad: str) -> ElementTree.Element | None:
+        for stap in pad:
+            element =   next((kind for kind in element if naam(kind) == stap), None) if element is not None else None
+        return element
+    
+    def tekst(element: ElementTree.Element, *pad: str) -> str | None:
+        element =   zoeken(element, *pad)
+        return None if element is None or element.text is None else element.text.strip()
+    
+    def datum(element: ElementTree.Element, *pad: str) -> dt.date | None:
+        waarde  =   tekst(element, *pad, "Dt") or tekst(element, *pad, "DtTm")
+        return None if waarde is None else dt.date.fromisoformat(waarde[:10])
+    
+    rekeningnummer  =   None
+    muntsoort       =   None
+    saldo           =   None
+    ouders          =   []
+    
+    for gebeurtenis, element in ElementTree.iterparse(pad, events = ("start", "end")):
+        
+        if gebeurtenis == "start":
+            ouders.append(element)
+            continue
+        
+        ouders.pop()
+        
+        if naam(element) == "Acct" and ouders and naam(ouders[-1]) == "Stmt":
+            iban            =   tekst(element, "Id", "IBAN") or tekst(element, "Id", "Othr", "Id")
+            rekeningnummer  =   normaliseren_rekeningnummer(iban) if iban is not None else None
+            muntsoort       =   tekst(element, "Ccy") or muntsoort
+        
+        elif naam(element) == "Bal" and tekst(element, "Tp", "CdOrPrtry", "Cd") in ("OPBD", "PRCD"):
+            saldo       =   float(tekst(element, "Amt")) * (1 if tekst(element, "CdtDbtInd") == "CRDT" else -1)
+            muntsoort   =   muntsoort or zoeken(element, "Amt").get("Ccy")
+        
+        elif naam(element) == "Ntry":
+            bedrag          =   float(tekst(element, "Amt")) * (1 if tekst(element, "CdtDbtInd") == "CRDT" else -1)
+            omschrijving    =   tekst(element, "AddtlNtryInf")
+            if omschrijving is None:
+                omschrijving    =   " ".join(ustrd.text.strip() for ustrd in element.iter() if naam(ustrd) == "Ustrd" and ustrd.text)
+            boekdatum       =   datum(element, "BookgDt")
+            yield maken_rij(rekeningnummer, zoeken(element, "Amt").get("Ccy", muntsoort), boekdatum, datum(element, "ValDt") or boekdatum, saldo, bedrag, omschrijving)
+            saldo           =   round(saldo + bedrag, 2)
+        
+        elif naam(element) != "Stmt" and not (ouders and naam(ouders[-1]) == "Stmt"):
+            continue
+        
+        # verwerkte elementen loslaten
+        element.clear()
+        if ouders:
+            ouders[-1].remove(element)
+
+registreren_importeur([".xlsx"], lezen_xlsx)
+registreren_importeur([".txt", ".tab", ".csv"], lezen_tekst)
+registreren_importeur([".sta", ".940", ".mt940"], lezen_mt940)
+registreren_importeur([".xml", ".053"], lezen_camt053)
\ No newline at end of file
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from .register import register
+from .transactie import Transactie
+
+
+def ontbrekend(transactie: Transactie) -> List[str]:
+    
+    # dezelfde velden waarvoor Transactie.aanvullen om invoer vraagt
+    velden  =   []
+    
+    if transactie.derde_uuid is None:
+        velden.append("derde_uuid")
+    if transactie.cat_uuid is None:
+        velden.append("cat_uuid")
+    if transactie.details.get("locatie_uuid", ...) is None:
+        velden.append("locatie_uuid")
+    
+    return velden
+
+def groeperen(
+    transactie  :   Transactie,
+    veld        :   str,
+    ) -> str:
+    
+    # transacties met dezelfde onbekende tegenpartij (of plaats) komen in
+    # dezelfde groep, zodat één antwoord ze allemaal oplost
+    tijdelijk   =   transactie.tijdelijk
+    
+    if veld == "derde_uuid":
+        return f"derde: {(tijdelijk.get("derde_iban") or tijdelijk.get("naam") or "").casefold()}"
+    if veld == "cat_uuid":
+        return f"categorie: {transactie.derde_uuid}"
+    return f"locatie: {tijdelijk.get("locatie_oud", "").casefold()}, {tijdelijk.get("land_oud", "").casefold()}"
+
+def zelfde_locatie(
+    tijdelijk   :   Dict[str, Any],
+    opgelost    :   Dict[str, Any],
+    ) -> bool:
+    
+    return all(tijdelijk.get(veld, "").casefold() == opgelost.get(veld, "").casefold() for veld in ("locatie_oud", "land_oud"))
+
+class Beoordelingen:
+    
+    # wachtrij van transacties die bij een verwerking zonder invoer niet
+    # volledig konden worden aangevuld, per transactie-uuid met de rekening, de
+    # ontbrekende velden, de groep en de tijdelijke gegevens uit de bankexport.
+    # blijft bewaard in het register (beoordeling.json)
+    
+    def __init__(self) -> "Beoordelingen":
+        
+        self.wachtrij   =   register.bewerken("beoordeling") if register.kenmerk("beoordeling") is not None else {}
+    
+    def __len__(self) -> int:
+        return len(self.wachtrij)
+    
+    def toevoegen(
+        self,
+        rekening_uuid   :   str,
+        transactie_uuid :   str,
+        transactie      :   Transactie,
+        ) -> bool:
+        
+        velden  =   ontbrekend(transactie)
+        
+        if len(velden) == 0:
+            self.wachtrij.pop(transactie_uuid, None)
+            return False
+        
+        self.wachtrij[transactie_uuid]  =   {
+            "rekening_uuid":    rekening_uuid,
+            "ontbreekt":        velden,
+            "groep":            groeperen(transactie, velden[0]),
+            "datumtijd":        transactie.datumtijd.isoformat(),
+            "bedrag":           transactie.bedrag,
+            "tijdelijk":        dict(transactie.tijdelijk),
+            }
+        return True
+    
+    def groepen(self) -> Dict[str, List[str]]:
+        
+        # de grootste groepen eerst
+        groepen =   defaultdict(list)
+        for transactie_uuid, beoordeling in self.wachtrij.items():
+            groepen[beoordeling["groep"]].append(transactie_uuid)
+        
+        return dict(sorted(groepen.items(), key = lambda item: len(item[1]), reverse = True))
+    
+    def tijdelijk(
+        self,
+        transactie_uuid :   str,
+        ) -> Dict[str, Any]:
+        
+        return dict(self.wachtrij[transactie_uuid]["tijdelijk"])
+    
+    def toepassen(
+        self,
+        transactie_uuid :   str,
+        transactie      :   Transactie,
+        opgelost        :   Transactie,
+        ) -> Transactie:
+        
+        # de velden die bij deze transactie ontbraken overnemen van de
+        # opgeloste transactie uit dezelfde groep; de groep is meestal de
+        # tegenpartij, dus de locatie enkel bij dezelfde plaats en hetzelfde
+        # land uit de bankexport (anders blijft de transactie in de wachtrij)
+        for veld in self.wachtrij[transactie_uuid]["ontbreekt"]:
+            if veld == "locatie_uuid":
+                if opgelost.details.get("locatie_uuid") is not None and zelfde_locatie(self.wachtrij[transactie_uuid]["tijdelijk"], opgelost.tijdelijk):
+                    transactie.details["locatie_uuid"]  =   opgelost.details["locatie_uuid"]
+            elif getattr(opgelost, veld) is not None:
+                setattr(transactie, veld, getattr(opgelost, veld))
+        
+        transactie.tijdelijk    =   self.tijdelijk(transactie_uuid)
+        self.toevoegen(self.wachtrij[transactie_uuid]["rekening_uuid"], transactie_uuid, transactie)
+        
+        return transactie
+    
+    def hernoemen(
+        self,
+        hernoemingen    :   Dict[str, str],
+        ):
+        
+        # na het hernoemen van opgeslagen transacties (oud naar nieuw)
+        self.wachtrij   =   {hernoemingen.get(transactie_uuid, transactie_uuid): beoordeling for transactie_uuid, beoordeling in self.wachtrij.items()}
+    
+    def opslaan(self):
+        register.opslaan("beoordeling", self.wachtrij)
\ No newline at end of file
@@ -0,0 +1,472 @@
+from collections import Counter
+from collections.abc import MutableMapping
+import datetime as dt
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from .transactie import Transactie
+
+
+VELDEN_GEHEEL   =   ("index", "bedrag", "beginsaldo", "eindsaldo", "dagindex")
+VELDEN_CODE     =   ("transactiemethode", "cat_uuid", "derde_uuid")
+EPOCHE          =   dt.date(1970, 1, 1)
+
+class TransactieBlok(MutableMapping):
+    
+    # de transacties van een rekening als kolommen (structure-of-arrays):
+    # gehele getallen als int64, datumtijd als datetime64, herhaalde teksten
+    # als codes in een woordenlijst per veld en details alleen voor de rijen
+    # die ze hebben. per uuid geeft het blok een TransactieWeergave terug die
+    # zijn velden uit het blok leest en er wijzigingen direct in terugschrijft,
+    # zodat blok[uuid].cat_uuid = ... werkt als bij een dict met Transacties.
+    # het blok is ook de op index geordende verzameling van een rekening en
+    # vervangt daarmee de eerdere Transacties: laatste, volgende_index en
+    # aantal_op kosten constante tijd, ook bij toevoegen per transactie
+    
+    def __init__(
+        self,
+        transacties :   Dict[str, Transactie]   =   None,
+        ) -> "TransactieBlok":
+        
+        self.lengte     =   0
+        self.geheel     =   {veld: np.empty(0, dtype = "int64") for veld in VELDEN_GEHEEL}
+        self.datumtijd  =   np.empty(0, dtype = "datetime64[us]")
+        self.codes      =   {veld: np.empty(0, dtype = "int32") for veld in VELDEN_CODE}
+        self.woorden    =   {veld: [] for veld in VELDEN_CODE}
+        self.woordcodes =   {veld: {} for veld in VELDEN_CODE}
+        self.uuids      =   []
+        self.rijen      =   {}
+        self.details    =   {}
+        self.per_dag    =   Counter()
+        self.gesorteerd =   True
+        self._laatste   =   None
+        self._lijst     =   None
+        
+        if transacties is not None:
+            for transactie_uuid, transactie in sorted(transacties.items(), key = lambda item: item[1].index):
+                self[transactie_uuid]   =   transactie
+    
+    @classmethod
+    def van_kolommen(
+        cls,
+        kolommen    :   pd.DataFrame,
+        ) -> "TransactieBlok":
+        
+        # rechtstreeks uit de kolommen van de opslag, zonder Transactie-objecten
+        Transactie.controleren_saldi(list(kolommen["uuid"]), kolommen["bedrag"], kolommen["beginsaldo"], kolommen["eindsaldo"])
+        
+        blok            =   cls()
+        blok.lengte     =   len(kolommen)
+        blok.geheel     =   {veld: kolommen[veld].to_numpy(dtype = "int64", copy = True) for veld in VELDEN_GEHEEL}
+        blok.datumtijd  =   kolommen["datumtijd"].to_numpy(dtype = "datetime64[us]", copy = True)
+        
+        for veld in VELDEN_CODE:
+            waarden                 =   kolommen[veld].astype("category")
+            blok.woorden[veld]      =   [str(woord) for woord in waarden.cat.categories]
+            blok.woordcodes[veld]   =   {woord: code for code, woord in enumerate(blok.woorden[veld])}
+            blok.codes[veld]        =   waarden.cat.codes.to_numpy(dtype = "int32", copy = True)
+        
+        blok.uuids      =   [str(transactie_uuid) for transactie_uuid in kolommen["uuid"]]
+        blok.rijen      =   {transactie_uuid: rij for rij, transactie_uuid in enumerate(blok.uuids)}
+        blok.details    =   {rij: details for rij, details in enumerate(kolommen["details"]) if isinstance(details, dict) and len(details) > 0}
+        
+        dagen, aantallen    =   np.unique(blok.datumtijd.astype("datetime64[D]").astype("int64"), return_counts = True)
+        blok.per_dag        =   Counter(dict(zip(dagen.tolist(), aantallen.tolist())))
+        blok.gesorteerd     =   bool(np.all(np.diff(blok.geheel["index"]) >= 0))
+        blok._laatste       =   blok.bepalen_laatste()
+        
+        return blok
+    
+    def __len__(self) -> int:
+        return self.lengte
+    
+    def __iter__(self) -> Iterator[str]:
+        return (self.uuids[rij] for rij in self.volgorde())
+    
+    def __contains__(
+        self,
+        transactie_uuid :   str,
+        ) -> bool:
+        
+        return transactie_uuid in self.rijen
+    
+    def __getitem__(
+        self,
+        transactie_uuid :   str,
+        ) -> Transactie:
+        
+        if transactie_uuid not in self.rijen:
+            raise KeyError(transactie_uuid)
+        return TransactieWeergave(self, transactie_uuid)
+    
+    def __setitem__(
+        self,
+        transactie_uuid :   str,
+        transactie      :   Transactie,
+        ):
+        
+        # een weergave (ook van dit blok) eerst losmaken, anders leest het
+        # toewijzen uit de rij die het aan het overschrijven is
+        if isinstance(transactie, TransactieWeergave):
+            transactie  =   transactie.losmaken()
+        
+        if transactie_uuid in self.rijen:
+            rij         =   self.rijen[transactie_uuid]
+            oude_index  =   int(self.geheel["index"][rij])
+            self.per_dag[self.dag(self.datumtijd[rij])] -=  1
+        else:
+            oude_index  =   None
+            rij         =   self.lengte
+            self.reserveren(self.lengte + 1)
+            self.lengte +=  1
+            self.uuids.append(transactie_uuid)
+            self.rijen[transactie_uuid] =   rij
+        
+        for veld in VELDEN_GEHEEL:
+            self.geheel[veld][rij]  =   getattr(transactie, veld)
+        for veld in VELDEN_CODE:
+            self.codes[veld][rij]   =   self.codering(veld, getattr(transactie, veld))
+        
+        self.datumtijd[rij] =   np.datetime64(transactie.datumtijd, "us")
+        self.per_dag[self.dag(self.datumtijd[rij])] +=  1
+        
+        if transactie.details:
+            self.details[rij]   =   dict(transactie.details)
+        else:
+            self.details.pop(rij, None)
+        
+        index   =   self.geheel["index"]
+        if (rij > 0 and index[rij - 1] > index[rij]) or (rij < self.lengte - 1 and index[rij] > index[rij + 1]):
+            self.gesorteerd =   False
+        
+        # de rij met de hoogste index (bij gelijke index de laatste rij, zoals
+        # na stabiel sorteren); enkel als die zelf een lagere index krijgt
+        # moet er opnieuw worden gezocht
+        if rij == self._laatste and oude_index is not None and index[rij] < oude_index:
+            self._laatste   =   self.bepalen_laatste()
+        elif self._laatste is None or (index[rij], rij) >= (index[self._laatste], self._laatste):
+            self._laatste   =   rij
+        
+        self._lijst =   None
+    
+    def __delitem__(
+        self,
+        transactie_uuid :   str,
+        ):
+        
+        rij     =   self.rijen.pop(transactie_uuid)
+        behoud  =   np.arange(self.lengte) != rij
+        
+        self.per_dag[self.dag(self.datumtijd[rij])] -=  1
+        
+        self.geheel     =   {veld: waarden[:self.lengte][behoud] for veld, waarden in self.geheel.items()}
+        self.codes      =   {veld: waarden[:self.lengte][behoud] for veld, waarden in self.codes.items()}
+        self.datumtijd  =   self.datumtijd[:self.lengte][behoud]
+        self.lengte     -=  1
+        
+        del self.uuids[rij]
+        self.rijen      =   {transactie_uuid: positie for positie, transactie_uuid in enumerate(self.uuids)}
+        self.details    =   {positie - (positie > rij): details for positie, details in self.details.items() if positie != rij}
+        self.gesorteerd =   bool(np.all(np.diff(self.geheel["index"]) >= 0))
+        self._laatste   =   self.bepalen_laatste()
+        self._lijst     =   None
+    
+    def pop(
+        self,
+        transactie_uuid :   str,
+        *standaard,
+        ) -> Transactie:
+        
+        # een losse Transactie, een weergave van een verwijderde rij kan niets
+        # meer lezen (bijvoorbeeld bij hernoemen: blok[nieuw] = blok.pop(oud))
+        if transactie_uuid not in self.rijen:
+            if standaard:
+                return standaard[0]
+            raise KeyError(transactie_uuid)
+        
+        transactie  =   self.transactie(self.rijen[transactie_uuid])
+        del self[transactie_uuid]
+        return transactie
+    
+    def popitem(self) -> tuple:
+        
+        if self.lengte == 0:
+            raise KeyError("popitem(): blok is leeg")
+        
+        transactie_uuid =   self.uuids[self._laatste]
+        return transactie_uuid, self.pop(transactie_uuid)
+    
+    def reserveren(
+        self,
+        lengte  :   int,
+        ):
+        
+        # capaciteit verdubbelen, zodat toevoegen gemiddeld constante tijd kost
+        capaciteit  =   len(self.datumtijd)
+        
+        if lengte <= capaciteit:
+            return
+        
+        capaciteit  =   max(lengte, 2 * capaciteit, 64)
+        
+        for waarden in (self.geheel, self.codes):
+            for veld, oud in waarden.items():
+                waarden[veld]   =   np.concatenate([oud[:self.lengte], np.zeros(capaciteit - self.lengte, dtype = oud.dtype)])
+        self.datumtijd  =   np.concatenate([self.datumtijd[:self.lengte], np.zeros(capaciteit - self.lengte, dtype = self.datumtijd.dtype)])
+    
+    def codering(
+        self,
+        veld    :   str,
+        waarde  :   str | None,
+        ) -> int:
+        
+        if waarde is None:
+            return -1
+        
+        if waarde not in self.woordcodes[veld]:
+            self.woordcodes[veld][waarde]   =   len(self.woorden[veld])
+            self.woorden[veld].append(waarde)
+        
+        return self.woordcodes[veld][waarde]
+    
+    @staticmethod
+    def dag(datumtijd: np.datetime64) -> int:
+        return int(datumtijd.astype("datetime64[D]").astype("int64"))
+    
+    def volgorde(self) -> np.ndarray:
+        
+        if not self.gesorteerd:
+            self.sorteren()
+        return np.arange(self.lengte)
+    
+    def sorteren(self):
+        
+        # de rijen zelf op volgorde van index zetten, zodat het sorteren maar
+        # één keer gebeurt in plaats van bij elke opvraging
+        volgorde        =   np.argsort(self.geheel["index"][:self.lengte], kind = "stable")
+        rij_nieuw       =   np.argsort(volgorde)
+        
+        self.geheel     =   {veld: waarden[:self.lengte][volgorde] for veld, waarden in self.geheel.items()}
+        self.codes      =   {veld: waarden[:self.lengte][volgorde] for veld, waarden in self.codes.items()}
+        self.datumtijd  =   self.datumtijd[:self.lengte][volgorde]
+        self.uuids      =   [self.uuids[rij] for rij in volgorde]
+        self.rijen      =   {transactie_uuid: rij for rij, transactie_uuid in enumerate(self.uuids)}
+        self.details    =   {int(rij_nieuw[rij]): details for rij, details in self.details.items()}
+        self.gesorteerd =   True
+        self._laatste   =   self.lengte - 1 if self.lengte > 0 else None
+    
+    def bepalen_laatste(self) -> int | None:
+        
+        if self.lengte == 0:
+            return None
+        return int(self.lengte - 1 - np.argmax(self.geheel["index"][:self.lengte][::-1]))
+    
+    def transactie(
+        self,
+        rij :   int,
+        ) -> Transactie:
+        
+        return Transactie(
+            index               =   int(self.geheel["index"][rij]),
+            bedrag              =   int(self.geheel["bedrag"][rij]),
+            beginsaldo          =   int(self.geheel["beginsaldo"][rij]),
+            eindsaldo           =   int(self.geheel["eindsaldo"][rij]),
+            transactiemethode   =   self.woord("transactiemethode", rij),
+            datumtijd           =   self.datumtijd[rij].item(),
+            dagindex            =   int(self.geheel["dagindex"][rij]),
+            cat_uuid            =   self.woord("cat_uuid", rij),
+            derde_uuid          =   self.woord("derde_uuid", rij),
+            details             =   dict(self.details[rij]) if rij in self.details else None,
+            controleren         =   False,
+            )
+    
+    def zoeken(
+        self,
+        veld    :   str,
+        waarden :   Iterable[str],
+        ) -> List[str]:
+        
+        # de uuids van de rijen met een van de waarden in een gecodeerd veld,
+        # op de codes in plaats van per transactie
+        codes   =   [self.woordcodes[veld][waarde] for waarde in waarden if waarde in self.woordcodes[veld]]
+        rijen   =   np.flatnonzero(np.isin(self.codes[veld][:self.lengte], codes))
+        
+        return [self.uuids[rij] for rij in rijen]
+    
+    def woord(
+        self,
+        veld    :   str,
+        rij     :   int,
+        ) -> str | None:
+        
+        code    =   self.codes[veld][rij]
+        return None if code < 0 else self.woorden[veld][code]
+    
+    def waarde(
+        self,
+        transactie_uuid :   str,
+        veld            :   str,
+        ) -> Any:
+        
+        rij =   self.rijen[transactie_uuid]
+        
+        if veld in VELDEN_GEHEEL:
+            return int(self.geheel[veld][rij])
+        if veld in VELDEN_CODE:
+            return self.woord(veld, rij)
+        if veld == "datumtijd":
+            return self.datumtijd[rij].item()
+        return dict(self.details.get(rij, {}))
+    
+    def wijzigen(
+        self,
+        transactie_uuid :   str,
+        veld            :   str,
+        waarde          :   Any,
+        ):
+        
+        # via __setitem__, zodat de volgorde, laatste en per_dag kloppen
+        transactie  =   self.transactie(self.rijen[transactie_uuid])
+        setattr(transactie, veld, dict(waarde) if veld == "details" and waarde is not None else waarde)
+        self[transactie_uuid]   =   transactie
+    
+    def kolommen(self) -> pd.DataFrame:
+        
+        # dezelfde kolommen als Opslag.kolommen, op volgorde van index
+        volgorde    =   self.volgorde()
+        
+        return pd.DataFrame({
+            "uuid":                 pd.Categorical([self.uuids[rij] for rij in volgorde]),
+            **{veld: self.geheel[veld][volgorde] for veld in ("index", "bedrag", "beginsaldo", "eindsaldo")},
+            "transactiemethode":    pd.Categorical.from_codes(self.codes["transactiemethode"][volgorde], categories = self.woorden["transactiemethode"]),
+            "datumtijd":            self.datumtijd[volgorde].astype("datetime64[ns]"),
+            "dagindex":             self.geheel["dagindex"][volgorde],
+            **{veld: pd.Categorical.from_codes(self.codes[veld][volgorde], categories = self.woorden[veld]) for veld in ("cat_uuid", "derde_uuid")},
+            "details":              pd.Series([self.details.get(rij) for rij in volgorde], dtype = object),
+            })
+    
+    @property
+    def lijst(self) -> List[Transactie]:
+        
+        # gedeelde lijst die pas opnieuw wordt opgebouwd na een wijziging
+        if self._lijst is None:
+            self._lijst =   [TransactieWeergave(self, self.uuids[rij]) for rij in self.volgorde()]
+        return self._lijst
+    
+    @property
+    def laatste(self) -> Transactie | None:
+        return TransactieWeergave(self, self.uuids[self._laatste]) if self._laatste is not None else None
+    
+    @property
+    def volgende_index(self) -> int:
+        return self.lengte
+    
+    def aantal_op(
+        self,
+        datum   :   dt.date,
+        ) -> int:
+        
+        return self.per_dag[(datum - EPOCHE).days]
+
+class DetailsWeergave(dict):
+    
+    # de details van een TransactieWeergave; elke wijziging gaat terug naar het blok
+    
+    def __init__(
+        self,
+        weergave    :   "TransactieWeergave",
+        details     :   dict,
+        ) -> "DetailsWeergave":
+        
+        super().__init__(details)
+        self.weergave   =   weergave
+    
+    def terugschrijven(self):
+        self.weergave.blok.wijzigen(self.weergave.transactie_uuid, "details", dict(self))
+    
+    def __setitem__(self, sleutel, waarde):
+        super().__setitem__(sleutel, waarde)
+        self.terugschrijven()
+    
+    def __delitem__(self, sleutel):
+        super().__delitem__(sleutel)
+        self.terugschrijven()
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.terugschrijven()
+    
+    def setdefault(self, sleutel, standaard = None):
+        waarde  =   super().setdefault(sleutel, standaard)
+        self.terugschrijven()
+        return waarde
+    
+    def pop(self, sleutel, *standaard):
+        waarde  =   super().pop(sleutel, *standaard)
+        self.terugschrijven()
+        return waarde
+    
+    def popitem(self):
+        item    =   super().popitem()
+        self.terugschrijven()
+        return item
+    
+    def clear(self):
+        super().clear()
+        self.terugschrijven()
+    
+    def __reduce_ex__(self, protocol):
+        return dict(self).__reduce_ex__(protocol)
+
+def maken_veld(veld: str) -> property:
+    
+    def lezen(weergave: "TransactieWeergave") -> Any:
+        waarde  =   weergave.blok.waarde(weergave.transactie_uuid, veld)
+        return DetailsWeergave(weergave, waarde) if veld == "details" else waarde
+    
+    def schrijven(weergave: "TransactieWeergave", waarde: Any):
+        weergave.blok.wijzigen(weergave.transactie_uuid, veld, waarde)
+    
+    return property(lezen, schrijven)
+
+class TransactieWeergave(Transactie):
+    
+    # een Transactie die zijn velden uit een rij van het blok leest en er
+    # toewijzingen in terugschrijft. tijdelijk hoort niet bij de opgeslagen
+    # velden en blijft bij de weergave zelf. kopiëren of pickelen (naar een
+    # werkproces) geeft een losse Transactie, net als losmaken()
+    
+    index               =   maken_veld("index")
+    bedrag              =   maken_veld("bedrag")
+    beginsaldo          =   maken_veld("beginsaldo")
+    eindsaldo           =   maken_veld("eindsaldo")
+    transactiemethode   =   maken_veld("transactiemethode")
+    datumtijd           =   maken_veld("datumtijd")
+    dagindex            =   maken_veld("dagindex")
+    cat_uuid            =   maken_veld("cat_uuid")
+    derde_uuid          =   maken_veld("derde_uuid")
+    details             =   maken_veld("details")
+    
+    def __init__(
+        self,
+        blok            :   TransactieBlok,
+        transactie_uuid :   str,
+        ) -> "TransactieWeergave":
+        
+        self.blok               =   blok
+        self.transactie_uuid    =   transactie_uuid
+        self.tijdelijk          =   {}
+    
+    def losmaken(self) -> Transactie:
+        
+        transactie              =   self.blok.transactie(self.blok.rijen[self.transactie_uuid])
+        transactie.tijdelijk    =   self.tijdelijk
+        return transactie
+    
+    def __reduce_ex__(self, protocol):
+        
+        # als losse Transactie (copyreg.__newobj__ weigert een andere klasse)
+        transactie  =   self.losmaken()
+        return object.__new__, (Transactie,), (None, {veld: getattr(transactie, veld) for veld in Transactie.__slots__})
\ No newline at end of file
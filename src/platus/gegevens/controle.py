@@ -0,0 +1,117 @@
+from multiprocessing import Pool
+import os
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .opslag import alle_rekeningen, opslag
+from .overboeking import INTERNE_OVERBOEKING
+from .register import register
+
+
+# waar een verwijzing naar moet bestaan, per kolom of veld in details
+VERWIJZINGEN    =   {
+    "cat_uuid":     ("categorie",),
+    "derde_uuid":   ("persoon", "bedrijf", "bankrekening", "lening", "bank", "cpsp"),
+    "locatie_uuid": ("locatie",),
+    "cpsp_uuid":    ("cpsp",),
+    "bank_uuid":    ("bank",),
+    }
+
+class Breuk(NamedTuple):
+    
+    controle        :   str
+    positie         :   int
+    transactie_uuid :   str
+    aantal          :   int
+    melding         :   str
+
+def geldige_verwijzingen() -> Dict[str, FrozenSet[str]]:
+    
+    geldig  =   {veld: frozenset().union(*(register[tabel].keys() for tabel in tabellen if register.kenmerk(tabel) is not None)) for veld, tabellen in VERWIJZINGEN.items()}
+    geldig["cat_uuid"]  |=  {INTERNE_OVERBOEKING}
+    
+    return geldig
+
+def eerste_breuk(
+    controle    :   str,
+    kolommen    :   pd.DataFrame,
+    masker      :   np.ndarray,
+    melding     :   Callable[[int], str],
+    ) -> Breuk | None:
+    
+    # de eerste afwijkende rij (op volgorde van index) en het aantal afwijkende rijen
+    posities    =   np.flatnonzero(masker)
+    
+    if len(posities) == 0:
+        return None
+    
+    positie =   int(posities[0])
+    
+    return Breuk(controle, positie, str(kolommen["uuid"].iat[positie]), len(posities), melding(positie))
+
+def controleren_kolommen(
+    kolommen    :   pd.DataFrame,
+    geldig      :   Dict[str, FrozenSet[str]],
+    ) -> List[Breuk]:
+    
+    # de kolommen van één rekening, op volgorde van index
+    index       =   kolommen["index"].to_numpy()
+    bedrag      =   kolommen["bedrag"].to_numpy()
+    beginsaldo  =   kolommen["beginsaldo"].to_numpy()
+    eindsaldo   =   kolommen["eindsaldo"].to_numpy()
+    dagindex    =   kolommen["dagindex"].to_numpy()
+    
+    # dagindex is het aantal eerdere transacties (op index) op dezelfde dag
+    dagen       =   kolommen["datumtijd"].dt.normalize()
+    verwacht    =   kolommen.groupby(dagen, sort = False).cumcount().to_numpy()
+    
+    keten       =   np.zeros(len(kolommen), dtype = bool)
+    keten[1:]   =   beginsaldo[1:] != eindsaldo[:-1]
+    
+    breuken     =   [
+        eerste_breuk("index", kolommen, index != np.arange(len(kolommen)), lambda positie: f"index {index[positie]} op positie {positie}"),
+        eerste_breuk("saldo", kolommen, eindsaldo != beginsaldo + bedrag, lambda positie: f"{beginsaldo[positie]} + {bedrag[positie]} != {eindsaldo[positie]}"),
+        eerste_breuk("keten", kolommen, keten, lambda positie: f"beginsaldo {beginsaldo[positie]} != eindsaldo vorige transactie {eindsaldo[positie - 1]}"),
+        eerste_breuk("dagindex", kolommen, dagindex != verwacht, lambda positie: f"dagindex {dagindex[positie]} in plaats van {verwacht[positie]}"),
+        ]
+    
+    for veld in ("cat_uuid", "derde_uuid"):
+        waarden =   kolommen[veld].astype(object)
+        breuken.append(eerste_breuk(veld, kolommen, (waarden.notna() & ~waarden.isin(geldig[veld])).to_numpy(), lambda positie: f"onbekende {veld} {waarden.iat[positie]}"))
+    
+    for veld in ("locatie_uuid", "cpsp_uuid", "bank_uuid"):
+        waarden =   kolommen["details"].map(lambda details: details.get(veld) if isinstance(details, dict) else None)
+        breuken.append(eerste_breuk(veld, kolommen, (waarden.notna() & ~waarden.isin(geldig[veld])).to_numpy(), lambda positie: f"onbekende {veld} {waarden.iat[positie]}"))
+    
+    return sorted((breuk for breuk in breuken if breuk is not None), key = lambda breuk: breuk.positie)
+
+def controleren_rekening(rekening_uuid: str) -> List[Breuk]:
+    
+    # in een werkproces: het register wordt daar zelf (alleen-lezend) ingelezen
+    try:
+        kolommen    =   opslag().kolommen(rekening_uuid)
+    except Exception as fout:
+        return [Breuk("openen", -1, None, 1, f"{type(fout).__name__}: {fout}")]
+    
+    return controleren_kolommen(kolommen, geldige_verwijzingen())
+
+def controleren_rekeningen(
+    rekening_uuids  :   Iterable[str]   =   None,
+    processen       :   int             =   None,
+    ) -> Dict[str, List[Breuk]]:
+    
+    # alle bankrekeningen en leningen, elke rekening in een eigen werkproces;
+    # per rekening de breuken op volgorde, de eerste is de eerste kapotte transactie
+    opslag_huidig   =   opslag()
+    rekening_uuids  =   [rekening_uuid for rekening_uuid in (alle_rekeningen() if rekening_uuids is None else rekening_uuids) if opslag_huidig.bestaat(rekening_uuid)]
+    
+    if len(rekening_uuids) == 0:
+        return {}
+    
+    if processen == 1:
+        return {rekening_uuid: controleren_rekening(rekening_uuid) for rekening_uuid in rekening_uuids}
+    
+    with Pool(min(processen or os.cpu_count(), len(rekening_uuids))) as pool:
+        return dict(zip(rekening_uuids, pool.map(controleren_rekening, rekening_uuids)))
\ No newline at end of file
@@ -0,0 +1,90 @@
+from typing import Dict, List
+
+from .register import register
+from .trefwoord import Automaat
+
+
+class CpspHerkenner:
+    
+    # herkent een betaaldienstverlener (cpsp) aan het IBAN via een hash-index,
+    # of aan de naam via één automaat over alle namen en synoniemen. bij
+    # meerdere cpsp's gaat, net als voorheen, de eerste in het register voor.
+    # nieuw geleerde IBAN's worden gebufferd en pas met wegschrijven in één
+    # keer in het register opgeslagen, aan het einde van een verwerking
+    
+    def __init__(self) -> "CpspHerkenner":
+        
+        self.bron       =   None
+        self.automaat   =   Automaat()
+        self.iban       =   {}
+        self.volgorde   =   {}
+        self.geleerd    =   {}
+    
+    def actueel(self) -> "CpspHerkenner":
+        
+        # het register geeft dezelfde tabel terug zolang die niet is gewijzigd
+        cpsps   =   register["cpsp"]
+        
+        if self.bron is not cpsps:
+            self.volgorde   =   {cpsp_uuid: positie for positie, cpsp_uuid in enumerate(cpsps.keys())}
+            self.automaat.opbouwen((trefwoord.casefold(), cpsp_uuid) for cpsp_uuid, cpsp in cpsps.items() for trefwoord in [cpsp.naam, *cpsp.synoniemen])
+            self.iban       =   {}
+            for cpsp_uuid, cpsp in cpsps.items():
+                for iban in [*cpsp.iban, *self.geleerd.get(cpsp_uuid, [])]:
+                    self.iban.setdefault(iban, cpsp_uuid)
+            self.bron       =   cpsps
+        
+        return self
+    
+    def herkennen(
+        self,
+        naam    :   str,
+        iban    :   str,
+        ) -> str | None:
+        
+        self.actueel()
+        
+        kandidaten  =   {self.automaat.prioriteit[trefwoord][1] for _, trefwoord in self.automaat.zoeken(naam)}
+        if iban in self.iban:
+            kandidaten.add(self.iban[iban])
+        
+        if len(kandidaten) == 0:
+            return None
+        
+        cpsp_uuid   =   min(kandidaten, key = self.volgorde.get)
+        self.leren(cpsp_uuid, iban)
+        
+        return cpsp_uuid
+    
+    def leren(
+        self,
+        cpsp_uuid   :   str,
+        iban        :   str,
+        ):
+        
+        if not iban or iban in self.bron[cpsp_uuid].iban or iban in self.geleerd.get(cpsp_uuid, []):
+            return
+        
+        self.geleerd.setdefault(cpsp_uuid, []).append(iban)
+        self.iban.setdefault(iban, cpsp_uuid)
+    
+    def wegschrijven(self) -> Dict[str, List[str]]:
+        
+        # de gebufferde IBAN's in één keer opslaan
+        geleerd         =   self.geleerd
+        self.geleerd    =   {}
+        
+        if len(geleerd) == 0:
+            return geleerd
+        
+        cpsps   =   register.bewerken("cpsp", geleerd.keys())
+        for cpsp_uuid, ibans in geleerd.items():
+            if cpsp_uuid not in cpsps:
+                continue
+            for iban in ibans:
+                cpsps[cpsp_uuid].toevoegen_iban(iban)
+        register.opslaan("cpsp", cpsps)
+        
+        return geleerd
+
+cpsp_herkenner  =   CpspHerkenner()
\ No newline at end of file
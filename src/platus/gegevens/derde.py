@@ -0,0 +1,99 @@
+from typing import Any, Tuple
+
+from .register import register
+
+
+TABELLEN_DERDE  =   ("bankrekening", "persoon", "bedrijf")
+
+class DerdeIndex:
+    
+    # hash-index over de derden in het register: IBAN naar uuid per tabel en
+    # naam of synoniem (casefold) naar bedrijf. de index wordt één keer
+    # opgebouwd en bij een nieuwe derde, IBAN of synoniem ter plekke
+    # bijgewerkt; als het register een tabel opnieuw inleest (bestand op schijf
+    # veranderd) wordt de index opnieuw opgebouwd
+    
+    def __init__(self) -> "DerdeIndex":
+        
+        self.iban       =   {tabel: {} for tabel in TABELLEN_DERDE}
+        self.namen      =   {}
+        self.bronnen    =   {}
+    
+    def opbouwen(self) -> "DerdeIndex":
+        
+        self.iban   =   {tabel: {} for tabel in TABELLEN_DERDE}
+        self.namen  =   {}
+        
+        for tabel in TABELLEN_DERDE:
+            self.bronnen[tabel] =   register[tabel]
+            for derde_uuid, derde in self.bronnen[tabel].items():
+                self.indexeren(tabel, derde_uuid, derde)
+        
+        return self
+    
+    def actueel(self) -> "DerdeIndex":
+        
+        # het register geeft dezelfde tabel terug zolang die niet opnieuw is ingelezen
+        if any(self.bronnen.get(tabel) is not register[tabel] for tabel in TABELLEN_DERDE):
+            self.opbouwen()
+        return self
+    
+    def indexeren(
+        self,
+        tabel       :   str,
+        derde_uuid  :   str,
+        derde       :   Any,
+        ):
+        
+        # bij dubbelingen blijft de eerste staan, net als bij de oude lussen
+        if tabel == "bankrekening":
+            if "iban" in derde:
+                self.iban[tabel].setdefault(derde["iban"], derde_uuid)
+            return
+        
+        for iban in getattr(derde, "iban", []):
+            self.iban[tabel].setdefault(iban, derde_uuid)
+        
+        if tabel == "bedrijf":
+            self.namen.setdefault(derde.naam.casefold(), derde_uuid)
+            for synoniem in derde.synoniemen:
+                self.namen.setdefault(synoniem, derde_uuid)
+    
+    def bijwerken(
+        self,
+        tabel       :   str,
+        derde_uuid  :   str,
+        ):
+        
+        # aan te roepen na register.opslaan van een nieuwe of gewijzigde derde
+        if any(self.bronnen.get(andere_tabel) is not register[andere_tabel] for andere_tabel in TABELLEN_DERDE if andere_tabel != tabel):
+            self.opbouwen()
+            return
+        
+        self.bronnen[tabel] =   register[tabel]
+        self.indexeren(tabel, derde_uuid, self.bronnen[tabel][derde_uuid])
+    
+    def zoeken(
+        self,
+        iban    :   str =   "",
+        naam    :   str =   "",
+        ) -> Tuple[str | None, str | None]:
+        
+        self.actueel()
+        
+        if iban != "":
+            if iban in self.iban["bankrekening"]:
+                return self.iban["bankrekening"][iban], register["transactie"]["interne overboeking"]["cat_uuid"]
+            if iban in self.iban["persoon"]:
+                return self.iban["persoon"][iban], None
+            if iban in self.iban["bedrijf"]:
+                derde_uuid  =   self.iban["bedrijf"][iban]
+                return derde_uuid, getattr(self.bronnen["bedrijf"][derde_uuid], "cat_uuid", None)
+        
+        if naam != "" and naam.casefold() in self.namen:
+            derde_uuid  =   self.namen[naam.casefold()]
+            return derde_uuid, getattr(self.bronnen["bedrijf"][derde_uuid], "cat_uuid", None)
+        
+        return None, None
+
+derde_index =   DerdeIndex()
\ No newline at end of file
@@ -1,12 +1,21 @@
+from contextlib import nullcontext
 import datetime as dt
+import os
+from typing import Iterator, List, Tuple
 
-from grienetsiis import open_json, invoer_kiezen, invoer_validatie
+from grienetsiis import invoer_kiezen, invoer_validatie
+from .beoordeling import Beoordelingen
+from .controle import controleren_rekeningen
+from .opslag import OPSLAGEN, omzetten, opslag
+from .overboeking import InterneOverboekingen
+from .parallel import maken_pool
+from .register import register
 from .rekening import Bankrekening
 
 
 def verwerken_maand():
     
-    eigen_bankrekeningen    =   open_json("gegevens\\configuratie", "bankrekening", "json")
+    eigen_bankrekeningen    =   register["bankrekening"]
     bankrekening_uuid       =   invoer_kiezen("bankrekening", {eigen_bankrekening["naam"]: bankrekening_uuid  for bankrekening_uuid, eigen_bankrekening in eigen_bankrekeningen.items()})
     
     bankrekening    =   Bankrekening.openen(bankrekening_uuid)
@@ -14,5 +23,208 @@ def verwerken_maand():
     jaar    =   invoer_validatie("jaar", int, bereik = (1998, dt.datetime.now().year))
     maand   =   invoer_validatie("maand", int, bereik = (1, dt.datetime.now().month) if jaar == dt.datetime.now().year else (1, 12))
     
-    bankrekening.verwerken_maand(jaar, maand)
-    bankrekening.opslaan()
\ No newline at end of file
+    # de referentiegegevens die tijdens de verwerking veranderen worden aan het
+    # einde in één keer opgeslagen, vóór de transacties die ernaar verwijzen
+    with register.sessie():
+        bankrekening.verwerken_maand(jaar, maand)
+    bankrekening.opslaan()
+
+def verwerken_export():
+    
+    eigen_bankrekeningen    =   register["bankrekening"]
+    bankrekening_uuid       =   invoer_kiezen("bankrekening", {eigen_bankrekening["naam"]: bankrekening_uuid  for bankrekening_uuid, eigen_bankrekening in eigen_bankrekeningen.items()})
+    
+    bankrekening    =   Bankrekening.openen(bankrekening_uuid)
+    
+    pad     =   invoer_validatie("bestand", str)
+    
+    with register.sessie():
+        bankrekening.verwerken_export(pad)
+    bankrekening.opslaan()
+
+def omzetten_opslag():
+    
+    formaat_huidig  =   opslag().formaat
+    formaat_nieuw   =   invoer_kiezen("opslagformaat", [formaat for formaat in OPSLAGEN.keys() if formaat != formaat_huidig])
+    
+    omzetten(formaat_nieuw, formaat_huidig)
+    
+    configuratie_opslag             =   register.bewerken("opslag") if register.kenmerk("opslag") is not None else {}
+    configuratie_opslag["formaat"]  =   formaat_nieuw
+    register.opslaan("opslag", configuratie_opslag)
+    
+    print(f"opslag omgezet van \"{formaat_huidig}\" naar \"{formaat_nieuw}\"")
+
+def koppelen_overboekingen():
+    
+    resultaat   =   InterneOverboekingen().alles_koppelen()
+    rekeningen  =   {**register["bankrekening"], **register["lening"]}
+    
+    print(f"{len(resultaat['gekoppeld'])} interne overboekingen gekoppeld")
+    print(f"{len(resultaat['ongekoppeld'])} interne overboekingen zonder tegenboeking")
+    for rekening_uuid, transactie_uuid in resultaat["ongekoppeld"]:
+        print(f"  {rekening_uuid if rekening_uuid not in rekeningen else rekeningen[rekening_uuid]['naam']}: {transactie_uuid}")
+
+def aanvullen_salaris():
+    
+    # alle historische salarisbetalingen in één keer aanvullen
+    for bankrekening_uuid in register["bankrekening"].keys():
+        
+        if not opslag().bestaat(bankrekening_uuid):
+            continue
+        
+        bankrekening    =   Bankrekening.openen(bankrekening_uuid)
+        aantal          =   bankrekening.aanvullen_salaris()
+        
+        if aantal > 0:
+            bankrekening.opslaan(volledig = True)
+        
+        print(f"{aantal} salarisbetalingen aangevuld voor \"{bankrekening.naam}\"")
+
+def aanvullen_vingerafdrukken():
+    
+    # eenmalig voor rekeningen die al zijn geïmporteerd voordat er
+    # vingerafdrukken waren: alle bankexports per maand sinds actief_van
+    for bankrekening_uuid in register["bankrekening"].keys():
+        
+        if not opslag().bestaat(bankrekening_uuid):
+            continue
+        
+        bankrekening    =   Bankrekening.openen(bankrekening_uuid)
+        aantal          =   0
+        
+        for jaar, maand in maanden(bankrekening.actief_van.strftime("%Y-%m"), dt.date.today().strftime("%Y-%m")):
+            if os.path.exists(bankrekening.pad_maand(jaar, maand)):
+                aantal  +=  bankrekening.aanvullen_vingerafdrukken(bankrekening.pad_maand(jaar, maand))
+        
+        print(f"{aantal} vingerafdrukken aangevuld voor \"{bankrekening.naam}\"")
+
+def maanden(
+    van :   str,
+    tot :   str =   None,
+    ) -> Iterator[Tuple[int, int]]:
+    
+    # (jaar, maand) van "JJJJ-MM" tot en met "JJJJ-MM"
+    begin   =   dt.datetime.strptime(van, "%Y-%m")
+    einde   =   begin if tot is None else dt.datetime.strptime(tot, "%Y-%m")
+    
+    for positie in range(begin.year * 12 + begin.month - 1, einde.year * 12 + einde.month):
+        yield positie // 12, positie % 12 + 1
+
+def importeren(
+    rekeningen  :   List[str],
+    van         :   str,
+    tot         :   str =   None,
+    processen   :   int =   None,
+    ):
+    
+    # zonder invoer: wat niet automatisch kan worden aangevuld gaat naar de
+    # wachtrij om later met beoordelen af te handelen. de index van interne
+    # overboekingen en de pool van werkprocessen worden één keer voor alle
+    # rekeningen en maanden opgebouwd
+    eigen_bankrekeningen    =   register["bankrekening"]
+    overboekingen           =   None
+    
+    with nullcontext() if processen == 1 else maken_pool(processen) as pool:
+        for rekening in rekeningen:
+            
+            bankrekening_uuid   =   rekening if rekening in eigen_bankrekeningen else next((bankrekening_uuid for bankrekening_uuid, eigen_bankrekening in eigen_bankrekeningen.items() if eigen_bankrekening["naam"].casefold() == rekening.casefold()), None)
+            
+            if bankrekening_uuid is None:
+                print(f"onbekende bankrekening \"{rekening}\"")
+                continue
+            
+            bankrekening    =   Bankrekening.openen(bankrekening_uuid)
+            wachtrij        =   Beoordelingen()
+            
+            aantal          =   0
+            
+            # na elke maand een controlepunt: een afgebroken import gaat bij de
+            # volgende keer verder waar die is gebleven, omdat de rijen van de al
+            # opgeslagen maanden worden herkend en overgeslagen
+            with register.sessie():
+                for jaar, maand in maanden(van, tot):
+                    if not os.path.exists(bankrekening.pad_maand(jaar, maand)):
+                        print(f"geen bankexport voor \"{bankrekening.naam}\" in {jaar}-{maand:02}")
+                        continue
+                    if overboekingen is None:
+                        overboekingen   =   InterneOverboekingen()
+                    bankrekening.verwerken_maand(jaar, maand, wachtrij, processen, overboekingen, pool)
+                    register.vastleggen()
+                    aantal  +=  len(bankrekening.nieuwe_transacties)
+                    bankrekening.opslaan()
+                    wachtrij.opslaan()
+                    register.vastleggen()
+            
+            print(f"{aantal} transacties verwerkt voor \"{bankrekening.naam}\", {bankrekening.vingerafdrukken.overgeslagen} al eerder geïmporteerd, {len(wachtrij)} te beoordelen")
+
+def beoordelen():
+    
+    # per groep één transactie aanvullen en het antwoord toepassen op de hele
+    # groep. na elke groep een controlepunt, zoals bij importeren na elke
+    # maand: eerst het register en de rekeningen, dan pas de wachtrij, zodat
+    # na een onderbreking enkel de lopende groep opnieuw wordt gevraagd en
+    # opgeloste transacties hooguit nog in de wachtrij staan
+    wachtrij        =   Beoordelingen()
+    bankrekeningen  =   {}
+    
+    with register.sessie():
+        for groep, transactie_uuids in wachtrij.groepen().items():
+            
+            rekening_uuids  =   {wachtrij.wachtrij[transactie_uuid]["rekening_uuid"] for transactie_uuid in transactie_uuids}
+            for rekening_uuid in rekening_uuids - bankrekeningen.keys():
+                bankrekeningen[rekening_uuid]   =   Bankrekening.openen(rekening_uuid)
+            
+            # transacties die nooit zijn opgeslagen (afgebroken verwerking) vervallen
+            for transactie_uuid in transactie_uuids:
+                if transactie_uuid not in bankrekeningen[wachtrij.wachtrij[transactie_uuid]["rekening_uuid"]].transacties:
+                    del wachtrij.wachtrij[transactie_uuid]
+            transactie_uuids    =   [transactie_uuid for transactie_uuid in transactie_uuids if transactie_uuid in wachtrij.wachtrij]
+            if len(transactie_uuids) == 0:
+                continue
+            
+            eerste              =   bankrekeningen[wachtrij.wachtrij[transactie_uuids[0]]["rekening_uuid"]].transacties[transactie_uuids[0]]
+            eerste.tijdelijk    =   wachtrij.tijdelijk(transactie_uuids[0])
+            
+            print(f"\n{len(transactie_uuids)} transacties voor {groep}\n")
+            print(eerste)
+            print("")
+            eerste.aanvullen()
+            
+            for transactie_uuid in transactie_uuids:
+                transacties                     =   bankrekeningen[wachtrij.wachtrij[transactie_uuid]["rekening_uuid"]].transacties
+                transacties[transactie_uuid]    =   wachtrij.toepassen(transactie_uuid, transacties[transactie_uuid], eerste)
+            
+            register.vastleggen()
+            for rekening_uuid in rekening_uuids:
+                bankrekeningen[rekening_uuid].opslaan(volledig = True)
+            wachtrij.opslaan()
+            register.vastleggen()
+        
+        # ook de vervallen transacties uit de laatste groepen
+        wachtrij.opslaan()
+    
+    print(f"{len(wachtrij)} transacties nog te beoordelen")
+
+def controleren(
+    processen   :   int =   None,
+    ):
+    
+    # per rekening de eerste kapotte transactie en daarna per controle het aantal afwijkingen
+    rekeningen  =   {**register["bankrekening"], **register["lening"]}
+    resultaat   =   controleren_rekeningen(processen = processen)
+    
+    for rekening_uuid, breuken in resultaat.items():
+        
+        naam    =   rekeningen[rekening_uuid]["naam"] if rekening_uuid in rekeningen else rekening_uuid
+        
+        if len(breuken) == 0:
+            print(f"\"{naam}\" in orde")
+            continue
+        
+        eerste  =   breuken[0]
+        print(f"\"{naam}\" eerste fout bij transactie {eerste.transactie_uuid} (positie {eerste.positie}): {eerste.melding}")
+        for breuk in breuken:
+            print(f"  {breuk.controle}: {breuk.aantal} transactie(s), eerst bij {breuk.transactie_uuid} (positie {breuk.positie}): {breuk.melding}")
+    
+    print(f"{sum(1 for breuken in resultaat.values() if len(breuken) > 0)} van {len(resultaat)} rekeningen met fouten")
\ No newline at end of file
@@ -0,0 +1,82 @@
+import re
+from typing import Iterable, List
+
+import pandas as pd
+
+
+# lengte van het IBAN per land in de SEPA-zone
+LENGTES_IBAN    =   {
+    "AD":   24, # Andorra
+    "AT":   20, # Oostenrijk
+    "BE":   16, # België
+    "BG":   22, # Bulgarije
+    "CH":   21, # Zwitserland
+    "CY":   28, # Cyprus
+    "CZ":   24, # Tsjechië
+    "DE":   22, # Duitsland
+    "DK":   18, # Denemarken
+    "EE":   20, # Estland
+    "ES":   24, # Spanje
+    "FI":   18, # Finland
+    "FR":   27, # Frankrijk
+    "GB":   22, # Groot-Brittannië
+    "GI":   23, # Gibraltar
+    "GR":   27, # Griekenland
+    "HR":   21, # Kroatië
+    "HU":   28, # Hongarije
+    "IE":   22, # Ierland
+    "IS":   26, # IJsland
+    "IT":   27, # Italië
+    "LI":   21, # Liechtenstein
+    "LT":   20, # Litouwen
+    "LU":   20, # Luxemburg
+    "LV":   21, # Letland
+    "MC":   27, # Monaco
+    "MT":   31, # Malta
+    "NL":   18, # Nederland
+    "NO":   15, # Noorwegen
+    "PL":   28, # Polen
+    "PT":   25, # Portugal
+    "RO":   24, # Roemenië
+    "SE":   24, # Zweden
+    "SI":   19, # Slovenië
+    "SK":   24, # Slowakije
+    "SM":   27, # San Marino
+    "VA":   22, # Vaticaanstad
+    }
+
+# alle landen in één patroon; de lookahead laat elkaar overlappende kandidaten toe
+PATROON_IBAN    =   re.compile("(?=(" + "|".join(f"{land}\\d{{2}}[0-9A-Z]{{{lengte - 4}}}" for land, lengte in LENGTES_IBAN.items()) + "))")
+LETTERS_CIJFERS =   str.maketrans({chr(ord("A") + positie): str(10 + positie) for positie in range(26)})
+
+def normaliseren_tekst(tekst: str) -> str:
+    return tekst.upper().replace(" ", "")
+
+def controleren_iban(iban: str) -> bool:
+    
+    # mod-97: landcode en controlegetal achteraan, letters als getallen
+    iban    =   normaliseren_tekst(iban)
+    
+    if LENGTES_IBAN.get(iban[:2]) != len(iban):
+        return False
+    
+    herschikt   =   (iban[4:] + iban[:4]).translate(LETTERS_CIJFERS)
+    return herschikt.isdigit() and int(herschikt) % 97 == 1
+
+def kandidaten_iban(tekst: str) -> List[str]:
+    
+    # alles in de tekst met de vorm van een IBAN, ook zonder geldig controlegetal
+    return PATROON_IBAN.findall(normaliseren_tekst(tekst))
+
+def zoeken_iban(tekst: str) -> List[str]:
+    
+    # alle geldige IBAN's in de tekst, in volgorde van voorkomen
+    return [kandidaat for kandidaat in kandidaten_iban(tekst) if controleren_iban(kandidaat)]
+
+def zoeken_iban_bulk(teksten: Iterable[str] | pd.Series) -> pd.Series:
+    
+    # voor een hele kolom omschrijvingen tegelijk, met per omschrijving een lijst
+    teksten     =   teksten if isinstance(teksten, pd.Series) else pd.Series(list(teksten), dtype = object)
+    kandidaten  =   teksten.fillna("").astype(str).str.upper().str.replace(" ", "", regex = False).str.findall(PATROON_IBAN)
+    
+    return kandidaten.map(lambda kandidaten_tekst: [kandidaat for kandidaat in kandidaten_tekst if controleren_iban(kandidaat)])
\ No newline at end of file
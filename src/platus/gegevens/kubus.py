@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .blok import TransactieBlok
+from .opslag import opslag
+from .tabel import maken_tabel, referentietabellen
+
+
+DIMENSIES   =   ["jaar", "maand", "hoofdcategorie", "categorie", "type", "derde", "richting"]
+GEHEEL      =   {"jaar": "int64", "maand": "int64", "bedrag": "int64", "aantal": "int64"}
+
+def typeren_kubus(kubus: pd.DataFrame) -> pd.DataFrame:
+    
+    # ontbrekende namen als None, net als in maken_tabel
+    return kubus.astype(object).where(kubus.notna(), None).astype(GEHEEL)
+
+def maken_kubus(tabel: pd.DataFrame) -> pd.DataFrame:
+    
+    # som (in centen) en aantal per combinatie van dimensies, uit een tabel van maken_tabel
+    if len(tabel) == 0:
+        return typeren_kubus(pd.DataFrame(columns = [*DIMENSIES, "bedrag", "aantal"]))
+    
+    bedrag  =   np.round(tabel["bedrag"].to_numpy(dtype = "float64") * 100).astype("int64")
+    rijen   =   pd.DataFrame({
+        "jaar":             tabel["datumtijd"].dt.year.astype("int64"),
+        "maand":            tabel["datumtijd"].dt.month.astype("int64"),
+        "hoofdcategorie":   tabel["hoofdcategorie"],
+        "categorie":        tabel["categorie"],
+        "type":             tabel["type"],
+        "derde":            tabel["derde"],
+        "richting":         np.select([bedrag > 0, bedrag < 0], ["inkomsten", "uitgaven"], "nul"),
+        "bedrag":           bedrag,
+        })
+    
+    kubus   =   rijen.groupby(DIMENSIES, dropna = False, sort = True).agg(bedrag = ("bedrag", "sum"), aantal = ("bedrag", "size")).reset_index()
+    
+    return typeren_kubus(kubus)
+
+def versie_referenties(referenties: Dict[str, pd.DataFrame]) -> str:
+    
+    # verandert alleen als een naam, type of hoofdcategorie in de kubus verandert;
+    # op volgorde van uuid, met de uuid in de hash zodat ook een verwisseling telt
+    tabellen    =   [
+        referenties["derde"][["derde", "type"]],
+        referenties["categorie"][["categorie", "hoofdcategorie"]],
+        ]
+    
+    return hashlib.blake2b(
+        b"".join(pd.util.hash_pandas_object(tabel.sort_index().astype(str), index = True).to_numpy().tobytes() for tabel in tabellen),
+        digest_size = 16,
+        ).hexdigest()
+
+class Kubus:
+    
+    # per rekening een vooraf geaggregeerde kubus van som en aantal per jaar,
+    # maand, hoofdcategorie, categorie, type derde, derde en richting, naast
+    # de transacties opgeslagen ({uuid}.kubus.json). bij het opslaan van nieuwe
+    # transacties worden enkel hun maanden opnieuw berekend; bij een andere
+    # versie van de opgeslagen transacties of van de namen wordt de kubus bij
+    # het openen opnieuw opgebouwd
+    
+    map =   "gegevens\\rekeningen"
+    
+    def __init__(
+        self,
+        rekening_uuid   :   str,
+        ) -> "Kubus":
+        
+        self.rekening_uuid  =   rekening_uuid
+    
+    @property
+    def pad(self) -> str:
+        return os.path.join(self.map, f"{self.rekening_uuid}.kubus.json")
+    
+    def versie(
+        self,
+        referenties :   Dict[str, pd.DataFrame],
+        ) -> Dict[str, Any]:
+        
+        # zoals het na opslaan in JSON terugkomt, om direct te vergelijken
+        return json.loads(json.dumps({"opslag": opslag().kenmerk(self.rekening_uuid), "referenties": versie_referenties(referenties)}))
+    
+    def lezen(self) -> Tuple[Dict[str, Any], pd.DataFrame] | Tuple[None, None]:
+        
+        if not os.path.exists(self.pad):
+            return None, None
+        
+        try:
+            with open(self.pad, "r", encoding = "utf-8") as bestand:
+                inhoud  =   json.load(bestand)
+        except json.JSONDecodeError:
+            return None, None
+        
+        kubus   =   typeren_kubus(pd.DataFrame(inhoud["rijen"], columns = [*DIMENSIES, "bedrag", "aantal"]))
+        
+        return inhoud["versie"], kubus
+    
+    def schrijven(
+        self,
+        versie  :   Dict[str, Any],
+        kubus   :   pd.DataFrame,
+        ):
+        
+        # eerst naar een tijdelijk bestand, dan in één keer vervangen
+        with open(f"{self.pad}.nieuw", "w", encoding = "utf-8") as bestand:
+            json.dump({"versie": versie, "rijen": kubus.astype(object).values.tolist()}, bestand, ensure_ascii = False)
+        os.replace(f"{self.pad}.nieuw", self.pad)
+    
+    def geldig(
+        self,
+        referenties :   Dict[str, pd.DataFrame] =   None,
+        ) -> bool:
+        
+        versie, _   =   self.lezen()
+        return versie is not None and versie == self.versie(referentietabellen() if referenties is None else referenties)
+    
+    def openen(
+        self,
+        referenties :   Dict[str, pd.DataFrame] =   None,
+        ) -> pd.DataFrame:
+        
+        referenties         =   referentietabellen() if referenties is None else referenties
+        versie              =   self.versie(referenties)
+        opgeslagen, kubus   =   self.lezen()
+        
+        if opgeslagen != versie:
+            kubus   =   maken_kubus(maken_tabel(opslag().kolommen(self.rekening_uuid), referenties)) if opslag().bestaat(self.rekening_uuid) else maken_kubus(pd.DataFrame())
+            self.schrijven(versie, kubus)
+        
+        return kubus
+    
+    def bijwerken(
+        self,
+        transacties :   TransactieBlok,
+        maanden     :   Set[Tuple[int, int]]    =   None,
+        referenties :   Dict[str, pd.DataFrame] =   None,
+        ):
+        
+        # na het opslaan van de transacties; maanden None: alles opnieuw
+        referenties =   referentietabellen() if referenties is None else referenties
+        _, kubus    =   self.lezen()
+        
+        if maanden is None or kubus is None:
+            kubus   =   maken_kubus(maken_tabel(transacties.kolommen(), referenties))
+        elif len(maanden) > 0:
+            kolommen    =   transacties.kolommen()
+            sleutels    =   [jaar * 12 + maand for jaar, maand in maanden]
+            selectie    =   np.isin(kolommen["datumtijd"].dt.year.to_numpy() * 12 + kolommen["datumtijd"].dt.month.to_numpy(), sleutels)
+            kubus       =   typeren_kubus(pd.concat(
+                [
+                    kubus[~np.isin(kubus["jaar"].to_numpy() * 12 + kubus["maand"].to_numpy(), sleutels)],
+                    maken_kubus(maken_tabel(kolommen[selectie].reset_index(drop = True), referenties)),
+                    ],
+                ignore_index = True,
+                ).sort_values(["jaar", "maand"], kind = "stable", ignore_index = True))
+        
+        self.schrijven(self.versie(referenties), kubus)
+
+def selecteren(
+    kubus       :   pd.DataFrame,
+    uitsluiten  :   Iterable[str]   =   (),
+    **filters,
+    ) -> pd.DataFrame:
+    
+    # filters per dimensie: een waarde of een lijst van waarden; uitsluiten:
+    # categorieën die niet meetellen (zoals interne overboekingen)
+    selectie    =   ~kubus["categorie"].isin(list(uitsluiten))
+    
+    for dimensie, waarde in filters.items():
+        selectie    &=  kubus[dimensie].isin(waarde) if isinstance(waarde, (list, tuple, set, frozenset)) else kubus[dimensie] == waarde
+    
+    return kubus[selectie]
+
+def waarde(
+    kubus       :   pd.DataFrame,
+    uitsluiten  :   Iterable[str]   =   (),
+    **filters,
+    ) -> float:
+    
+    # de som in euro's, zoals tabel["bedrag"].sum() op de gefilterde transacties
+    return int(selecteren(kubus, uitsluiten, **filters)["bedrag"].sum()) / 100
+
+def draaien(
+    kubus       :   pd.DataFrame,
+    index       :   str,
+    kolommen    :   str,
+    uitsluiten  :   Iterable[str]   =   (),
+    **filters,
+    ) -> pd.DataFrame:
+    
+    # som in euro's met index en kolommen als dimensies, zoals pivot_table
+    return (selecteren(kubus, uitsluiten, **filters).groupby([index, kolommen])["bedrag"].sum() / 100).unstack(kolommen)
\ No newline at end of file
@@ -0,0 +1,152 @@
+from collections import defaultdict
+import unicodedata
+from typing import Any, List, Set
+
+from .register import register
+
+
+TABELLEN_LOCATIE    =   ("land", "locatie")
+DREMPEL_GELIJKENIS  =   0.8
+
+def normaliseren_plaats(plaats: str) -> str:
+    
+    # zonder hoofdletters, accenten, leestekens en dubbele spaties
+    plaats  =   unicodedata.normalize("NFKD", plaats.casefold())
+    plaats  =   "".join(teken if teken.isalnum() else " " for teken in plaats if not unicodedata.combining(teken))
+    return " ".join(plaats.split())
+
+def trigrammen(plaats: str) -> Set[str]:
+    
+    plaats  =   f"  {plaats} "
+    return {plaats[positie:positie + 3] for positie in range(len(plaats) - 2)}
+
+class LocatieIndex:
+    
+    # hash-index over locaties en landen: plaats (naam of synoniem, casefold)
+    # naar locaties en land (naam of synoniem, casefold) naar landen, zodat een
+    # pinbetaling direct op (plaats, land) wordt gevonden. zonder directe
+    # treffer wordt binnen het land gezocht op de genormaliseerde plaats en
+    # daarna op trigrammen, zodat een iets andere schrijfwijze van de terminal
+    # toch wordt herkend. de index wordt bij een nieuwe locatie of synoniem
+    # ter plekke bijgewerkt en opnieuw opgebouwd als het register een tabel
+    # opnieuw inleest
+    
+    def __init__(self) -> "LocatieIndex":
+        
+        self.plaatsen       =   defaultdict(list)
+        self.landen         =   defaultdict(list)
+        self.genormaliseerd =   defaultdict(list)
+        self.trigrammen     =   defaultdict(set)
+        self.bronnen        =   {}
+    
+    def opbouwen(self) -> "LocatieIndex":
+        
+        self.plaatsen       =   defaultdict(list)
+        self.landen         =   defaultdict(list)
+        self.genormaliseerd =   defaultdict(list)
+        self.trigrammen     =   defaultdict(set)
+        
+        for tabel in TABELLEN_LOCATIE:
+            self.bronnen[tabel] =   register[tabel]
+            for uuid, waarde in self.bronnen[tabel].items():
+                self.indexeren(tabel, uuid, waarde)
+        
+        return self
+    
+    def actueel(self) -> "LocatieIndex":
+        
+        # het register geeft dezelfde tabel terug zolang die niet opnieuw is ingelezen
+        if any(self.bronnen.get(tabel) is not register[tabel] for tabel in TABELLEN_LOCATIE):
+            self.opbouwen()
+        return self
+    
+    def indexeren(
+        self,
+        tabel   :   str,
+        uuid    :   str,
+        waarde  :   Any,
+        ):
+        
+        namen   =   [waarde.naam.casefold(), *waarde.synoniemen]
+        
+        if tabel == "land":
+            for naam in namen:
+                for sleutel in (naam, normaliseren_plaats(naam)):
+                    if uuid not in self.landen[sleutel]:
+                        self.landen[sleutel].append(uuid)
+            return
+        
+        for naam in namen:
+            if uuid not in self.plaatsen[naam]:
+                self.plaatsen[naam].append(uuid)
+            genormaliseerd  =   normaliseren_plaats(naam)
+            if uuid not in self.genormaliseerd[genormaliseerd]:
+                self.genormaliseerd[genormaliseerd].append(uuid)
+            for trigram in trigrammen(genormaliseerd):
+                self.trigrammen[trigram].add((genormaliseerd, uuid))
+    
+    def bijwerken(
+        self,
+        tabel   :   str,
+        uuid    :   str,
+        ):
+        
+        # aan te roepen na register.opslaan van een nieuwe of gewijzigde locatie of land
+        if any(self.bronnen.get(andere_tabel) is not register[andere_tabel] for andere_tabel in TABELLEN_LOCATIE if andere_tabel != tabel):
+            self.opbouwen()
+            return
+        
+        self.bronnen[tabel] =   register[tabel]
+        self.indexeren(tabel, uuid, self.bronnen[tabel][uuid])
+    
+    def in_land(
+        self,
+        locatie_uuids   :   List[str],
+        land_uuids      :   List[str],
+        ) -> List[str]:
+        
+        return [locatie_uuid for locatie_uuid in locatie_uuids if self.bronnen["locatie"][locatie_uuid].land_uuid in land_uuids]
+    
+    def zoeken(
+        self,
+        plaats  :   str,
+        land    :   str,
+        ) -> List[str]:
+        
+        # de mogelijke locaties, van exact naar bij benadering
+        self.actueel()
+        
+        land_uuids  =   self.landen.get(land.casefold()) or self.landen.get(normaliseren_plaats(land), [])
+        if len(land_uuids) == 0:
+            return []
+        
+        locatie_uuids   =   self.in_land(self.plaatsen.get(plaats.casefold(), []), land_uuids)
+        if len(locatie_uuids) > 0:
+            return locatie_uuids
+        
+        genormaliseerd  =   normaliseren_plaats(plaats)
+        locatie_uuids   =   self.in_land(self.genormaliseerd.get(genormaliseerd, []), land_uuids)
+        if len(locatie_uuids) > 0 or genormaliseerd == "":
+            return locatie_uuids
+        
+        # gelijkenis (Dice) op trigrammen, alleen een eenduidige beste treffer telt
+        trigrammen_plaats   =   trigrammen(genormaliseerd)
+        gedeeld             =   defaultdict(int)
+        for trigram in trigrammen_plaats:
+            for kandidaat in self.trigrammen.get(trigram, ()):
+                gedeeld[kandidaat]  +=  1
+        
+        gelijkenissen   =   defaultdict(float)
+        for (naam, locatie_uuid), aantal in gedeeld.items():
+            if self.bronnen["locatie"][locatie_uuid].land_uuid not in land_uuids:
+                continue
+            gelijkenis  =   2 * aantal / (len(trigrammen_plaats) + len(trigrammen(naam)))
+            gelijkenissen[locatie_uuid] =   max(gelijkenissen[locatie_uuid], gelijkenis)
+        
+        beste   =   sorted(gelijkenissen.items(), key = lambda item: item[1], reverse = True)[:2]
+        if len(beste) == 0 or beste[0][1] < DREMPEL_GELIJKENIS or (len(beste) == 2 and beste[1][1] == beste[0][1]):
+            return []
+        
+        return [beste[0][0]]
+
+locatie_index   =   LocatieIndex()
\ No newline at end of file
@@ -0,0 +1,139 @@
+from collections import Counter
+import re
+from typing import Callable, Dict, List, NamedTuple, Pattern, Tuple
+
+
+class Omschrijving(NamedTuple):
+    
+    formaat :   str
+    velden  :   Dict[str, str]
+
+class Ontleder:
+    
+    # herkent het formaat van een omschrijving uit de bankexport aan het begin
+    # ervan, met één reguliere expressie over alle prefixen, en ontleedt de
+    # omschrijving daarna met de vooraf gecompileerde patronen van dat formaat.
+    # per formaat worden de treffers en de verwerkingstijd bijgehouden
+    
+    def __init__(self) -> "Ontleder":
+        
+        self.prefixen   =   {}
+        self.treffers   =   Counter()
+        self.tijden     =   Counter()
+        self.meters     =   []
+        self._patroon   =   None
+        self._volgorde  =   None
+    
+    def registreren(
+        self,
+        formaat     :   str,
+        prefix      :   str,
+        varianten   :   List[Tuple[Tuple[str, ...], str]]   =   None,
+        ) -> "Ontleder":
+        
+        # varianten: (teksten die in de omschrijving moeten staan, patroon), de
+        # eerste variant waarvan alle teksten voorkomen wordt gebruikt
+        self.prefixen[prefix.casefold()]    =   (
+            formaat,
+            [(tuple(tekst.casefold() for tekst in teksten), re.compile(patroon)) for teksten, patroon in (varianten or [])],
+            )
+        self._patroon   =   None
+        self._volgorde  =   None
+        
+        return self
+    
+    @property
+    def patroon(self) -> Pattern:
+        
+        # langste prefix eerst, zodat een langer prefix voorgaat op een korter
+        if self._patroon is None:
+            self._volgorde  =   sorted(self.prefixen.keys(), key = len, reverse = True)
+            self._patroon   =   re.compile("|".join(f"(?P<p{positie}>{re.escape(prefix)})" for positie, prefix in enumerate(self._volgorde)))
+        return self._patroon
+    
+    def ontleden(
+        self,
+        omschrijving    :   str,
+        ) -> Omschrijving:
+        
+        omschrijving_casefold   =   omschrijving.casefold()
+        resultaat_prefix        =   self.patroon.match(omschrijving_casefold)
+        
+        if resultaat_prefix is None:
+            raise NotImplementedError(f"onbekend formaat van omschrijving \"{omschrijving}\"")
+        
+        formaat, varianten  =   self.prefixen[self._volgorde[int(resultaat_prefix.lastgroup[1:])]]
+        self.treffers[formaat]  +=  1
+        
+        for teksten, patroon in varianten:
+            if all(tekst in omschrijving_casefold for tekst in teksten):
+                resultaat   =   patroon.match(omschrijving)
+                if resultaat is None:
+                    raise ValueError(f"omschrijving \"{omschrijving}\" past niet in het formaat \"{formaat}\"")
+                return Omschrijving(formaat, resultaat.groupdict())
+        
+        return Omschrijving(formaat, {})
+    
+    def meten(
+        self,
+        formaat :   str,
+        duur    :   float,
+        ):
+        
+        self.tijden[formaat]    +=  duur
+        for meter in self.meters:
+            meter(formaat, duur)
+    
+    def toevoegen_meter(
+        self,
+        meter   :   Callable[[str, float], None],
+        ) -> "Ontleder":
+        
+        self.meters.append(meter)
+        return self
+    
+    def statistiek(self) -> Dict[str, Tuple[int, float]]:
+        return {formaat: (aantal, self.tijden[formaat]) for formaat, aantal in self.treffers.most_common()}
+
+PATROON_PINPAS  =   r"(?i)^(?:B|G)EA, Betaalpas\s+(?P<derde_naam>.*),PAS(?P<pasnummer>\d{3})\s+NR:(?P<terminal>.*),?\s+(?P<datumtijd>\d{2}.\d{2}.\d{2}\/\d{2}(.?:|.)\d{2})\s+(?P<locatie>.*)$"
+PATROON_TIKKIE  =   re.compile(r"(?i)^Tikkie ID (?:[0-9 ]+), ?(?P<betalingsomschrijving_tikkie>.+), ?Van ?(?P<derde_naam>[\w\s\.]+),? ?(?P<derde_iban>.*)?$")
+
+ontleder    =   Ontleder()
+
+ontleder.registreren("rente", "rente")
+
+ontleder.registreren("pinbetaling", "BEA, Betaalpas", [
+    ((), PATROON_PINPAS),
+    ])
+ontleder.registreren("geldopname", "GEA, Betaalpas", [
+    ((), PATROON_PINPAS),
+    ])
+
+ontleder.registreren("overboeking", "SEPA Overboeking", [
+    (("Betalingskenm.:",), r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Betalingskenm.:\s(?P<betalingskenmerk>.*)$"),
+    (("Kenmerk:",), r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*Kenmerk:\s(?P<betalingskenmerk>.*)$"),
+    (("Omschrijving:",), r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)$"),
+    ((), r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)$"),
+    ])
+ontleder.registreren("overboeking", "/TRTP/SEPA OVERBOEKING/", [
+    (("/REMI/",), r"(?i)^\/TRTP\/SEPA OVERBOEKING\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/EREF\/(?P<betalingskenmerk>.*)$"),
+    ((), r"(?i)^\/TRTP\/SEPA OVERBOEKING\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/EREF\/(?P<betalingskenmerk>.*)$"),
+    ])
+
+ontleder.registreren("ideal", "SEPA iDEAL", [
+    ((), r"(?i)^SEPA iDEAL\s*IBAN:\s(?P<iban>.*)\s*BIC:\s(?P<bic>.*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*Kenmerk:\s(?P<datumtijd>\d{2}-\d{2}-\d{4} \d{2}:\d{2})\s(?P<betalingskenmerk>.*)$"),
+    ])
+ontleder.registreren("ideal", "/TRTP/iDEAL/", [
+    ((), r"(?i)^\/TRTP\/iDEAL\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/EREF\/(?P<datumtijd>\d{2}-\d{2}-\d{4} \d{2}:\d{2}) (?P<betalingskenmerk>.*)$"),
+    ])
+
+ontleder.registreren("incasso", "SEPA Incasso algemeen doorlopend", [
+    (("Kenmerk:",), r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*IBAN:\s(?P<iban>.*)\s*Kenmerk:\s(?P<betalingskenmerk>.*)$"),
+    (("IBAN:",), r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*IBAN:\s(?P<iban>.*)$"),
+    ((), r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)$"),
+    ])
+ontleder.registreren("incasso", "/TRTP/SEPA Incasso algemeen doorlopend", [
+    ((), r"(?i)^\/TRTP\/SEPA Incasso algemeen doorlopend\/CSID\/(?P<incassant>.*)\/NAME\/(?P<naam>.*)\/MARF\/(?P<machtiging>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/EREF\/(?P<betalingskenmerk>.*)$"),
+    ])
+
+ontleder.registreren("bankkosten", "ABN AMRO")
\ No newline at end of file
@@ -0,0 +1,651 @@
+from abc import ABC, abstractmethod
+import datetime as dt
+import json
+import os
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from grienetsiis import open_json, opslaan_json
+from .blok import TransactieBlok
+from .register import register
+from .transactie import Transactie
+
+
+KOLOMMEN            =   ["uuid", "index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "dagindex", "cat_uuid", "derde_uuid", "details"]
+KOLOMMEN_GEHEEL     =   ["index", "bedrag", "beginsaldo", "eindsaldo", "dagindex"]
+KOLOMMEN_CATEGORIE  =   ["uuid", "transactiemethode", "cat_uuid", "derde_uuid"]
+
+def naar_kolommen(
+    transacties :   Dict[str, Transactie],
+    ) -> pd.DataFrame:
+    
+    if isinstance(transacties, TransactieBlok):
+        return transacties.kolommen()
+    
+    kolommen    =   pd.DataFrame(
+        [
+            [
+                transactie_uuid,
+                transactie.index,
+                transactie.bedrag,
+                transactie.beginsaldo,
+                transactie.eindsaldo,
+                transactie.transactiemethode,
+                transactie.datumtijd,
+                transactie.dagindex,
+                transactie.cat_uuid,
+                transactie.derde_uuid,
+                transactie.details if transactie.details != {} else None,
+                ] for transactie_uuid, transactie in transacties.items()
+            ],
+        columns = KOLOMMEN,
+        )
+    
+    return typeren_kolommen(kolommen)
+
+def typeren_kolommen(
+    kolommen    :   pd.DataFrame,
+    ) -> pd.DataFrame:
+    
+    kolommen                =   kolommen.astype({kolom: "int64" for kolom in KOLOMMEN_GEHEEL} | {kolom: "category" for kolom in KOLOMMEN_CATEGORIE})
+    kolommen["datumtijd"]   =   pd.to_datetime(kolommen["datumtijd"], format = "ISO8601").astype("datetime64[ns]")
+    
+    return kolommen.sort_values("index", ignore_index = True)
+
+def van_kolommen(
+    kolommen    :   pd.DataFrame,
+    ) -> Dict[str, Transactie]:
+    
+    Transactie.controleren_saldi(list(kolommen["uuid"]), kolommen["bedrag"], kolommen["beginsaldo"], kolommen["eindsaldo"])
+    
+    transacties =   {}
+    
+    for rij in kolommen.itertuples(index = False):
+        transacties[rij.uuid]   =   Transactie(
+            index               =   int(rij.index),
+            bedrag              =   int(rij.bedrag),
+            beginsaldo          =   int(rij.beginsaldo),
+            eindsaldo           =   int(rij.eindsaldo),
+            transactiemethode   =   rij.transactiemethode,
+            datumtijd           =   rij.datumtijd.to_pydatetime(),
+            dagindex            =   int(rij.dagindex),
+            cat_uuid            =   None if pd.isna(rij.cat_uuid) else rij.cat_uuid,
+            derde_uuid          =   None if pd.isna(rij.derde_uuid) else rij.derde_uuid,
+            details             =   rij.details if isinstance(rij.details, dict) else None,
+            controleren         =   False,
+            )
+    
+    return transacties
+
+class Opslag(ABC):
+    
+    formaat     =   None
+    extensie    =   None
+    map         =   "gegevens\\rekeningen"
+    
+    def pad(
+        self,
+        rekening_uuid   :   str,
+        ) -> str:
+        
+        return os.path.join(self.map, f"{rekening_uuid}.{self.extensie}")
+    
+    def bestaat(
+        self,
+        rekening_uuid   :   str,
+        ) -> bool:
+        
+        return os.path.exists(self.pad(rekening_uuid))
+    
+    def paden(
+        self,
+        rekening_uuid   :   str,
+        ) -> List[str]:
+        
+        return [self.pad(rekening_uuid)]
+    
+    def kenmerk(
+        self,
+        rekening_uuid   :   str,
+        ) -> List[Tuple[int, int]]:
+        
+        # verandert bij elke wijziging van de opgeslagen transacties, net als
+        # Register.kenmerk (mtime en grootte van de bestanden)
+        return [(status.st_mtime_ns, status.st_size) for status in (os.stat(pad) for pad in self.paden(rekening_uuid) if os.path.exists(pad))]
+    
+    def openen(
+        self,
+        rekening_uuid   :   str,
+        ) -> Dict[str, Transactie]:
+        
+        return van_kolommen(self.kolommen(rekening_uuid))
+    
+    @abstractmethod
+    def kolommen(
+        self,
+        rekening_uuid   :   str,
+        ) -> pd.DataFrame:
+        
+        ...
+    
+    def blok(
+        self,
+        rekening_uuid   :   str,
+        ) -> TransactieBlok:
+        
+        return TransactieBlok.van_kolommen(self.kolommen(rekening_uuid)) if self.bestaat(rekening_uuid) else TransactieBlok()
+    
+    def zoeken(
+        self,
+        rekening_uuid   :   str,
+        van             :   dt.datetime =   None,
+        tot             :   dt.datetime =   None,
+        derde_uuid      :   str         =   None,
+        cat_uuid        :   str         =   None,
+        ) -> Dict[str, Transactie]:
+        
+        kolommen    =   self.kolommen(rekening_uuid)
+        selectie    =   pd.Series(True, index = kolommen.index)
+        
+        if van is not None:
+            selectie    &=  kolommen["datumtijd"] >= pd.Timestamp(van)
+        if tot is not None:
+            selectie    &=  kolommen["datumtijd"] <= pd.Timestamp(tot)
+        if derde_uuid is not None:
+            selectie    &=  kolommen["derde_uuid"] == derde_uuid
+        if cat_uuid is not None:
+            selectie    &=  kolommen["cat_uuid"] == cat_uuid
+        
+        return van_kolommen(kolommen[selectie])
+    
+    @abstractmethod
+    def opslaan(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        nieuw           :   Iterable[str]           =   None,
+        ):
+        
+        # nieuw: de uuids die sinds de vorige keer opslaan zijn toegevoegd,
+        # voor opslagformaten die kunnen aanvullen in plaats van herschrijven
+        ...
+    
+    def opslaan_referentie(
+        self,
+        tabel   :   str,
+        waarden :   Dict[str, Any],
+        ):
+        
+        # enkel opslagformaten met een eigen kopie van de referentiegegevens
+        pass
+    
+    def backup(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        ):
+        
+        self.opslaan(f"{dt.datetime.strftime(dt.datetime.today(), "%Y-%m-%d")} - {rekening_uuid}", transacties)
+
+class JsonOpslag(Opslag):
+    
+    # nieuwe transacties worden achteraan een journaal ({uuid}.jsonl) geschreven
+    # in plaats van het hele rekeningbestand te herschrijven; bij openen wordt
+    # het journaal over het basisbestand heen gelegd en zodra het journaal
+    # lang genoeg is, wordt het in het basisbestand opgenomen
+    
+    formaat     =   "json"
+    extensie    =   "json"
+    
+    @property
+    def compacteren_vanaf(self) -> int:
+        return register["opslag"].get("journaal_compacteren", 1000) if register.kenmerk("opslag") is not None else 1000
+    
+    def pad_journaal(
+        self,
+        rekening_uuid   :   str,
+        ) -> str:
+        
+        return os.path.join(self.map, f"{rekening_uuid}.jsonl")
+    
+    def bestaat(
+        self,
+        rekening_uuid   :   str,
+        ) -> bool:
+        
+        return os.path.exists(self.pad(rekening_uuid)) or os.path.exists(self.pad_journaal(rekening_uuid))
+    
+    def paden(
+        self,
+        rekening_uuid   :   str,
+        ) -> List[str]:
+        
+        return [self.pad(rekening_uuid), self.pad_journaal(rekening_uuid)]
+    
+    def journaal(
+        self,
+        rekening_uuid   :   str,
+        ) -> Dict[str, Dict[str, Any]]:
+        
+        transacties_json    =   {}
+        
+        if os.path.exists(self.pad_journaal(rekening_uuid)):
+            with open(self.pad_journaal(rekening_uuid), "r", encoding = "utf-8") as bestand:
+                for regel in bestand:
+                    if regel.strip() == "":
+                        continue
+                    try:
+                        journaalregel   =   json.loads(regel)
+                    except json.JSONDecodeError:
+                        break # half geschreven laatste regel na een onderbreking
+                    transacties_json[journaalregel["uuid"]] =   journaalregel["transactie"]
+        
+        return transacties_json
+    
+    def openen(
+        self,
+        rekening_uuid   :   str,
+        ) -> Dict[str, Transactie]:
+        
+        transacties_json    =   open_json(self.map, rekening_uuid, "json") if os.path.exists(self.pad(rekening_uuid)) else {}
+        transacties_json.update(self.journaal(rekening_uuid))
+        
+        return Transactie.van_json_bulk(transacties_json)
+    
+    def kolommen(
+        self,
+        rekening_uuid   :   str,
+        ) -> pd.DataFrame:
+        
+        transacties_json    =   open_json(self.map, rekening_uuid, "json") if os.path.exists(self.pad(rekening_uuid)) else {}
+        transacties_json.update(self.journaal(rekening_uuid))
+        
+        # reindex: een rekening zonder transacties (of zonder details) heeft
+        # anders niet alle kolommen
+        kolommen            =   pd.DataFrame.from_dict(transacties_json, orient = "index").rename_axis("uuid").reset_index().reindex(columns = KOLOMMEN)
+        kolommen["details"] =   kolommen["details"].map(lambda details: details if isinstance(details, dict) else None).astype(object)
+        
+        return typeren_kolommen(kolommen[KOLOMMEN])
+    
+    def opslaan(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        nieuw           :   Iterable[str]           =   None,
+        ):
+        
+        if nieuw is None:
+            self.compacteren(rekening_uuid, transacties)
+            return
+        
+        nieuw   =   list(nieuw)
+        
+        if len(nieuw) == 0:
+            return
+        
+        with open(self.pad_journaal(rekening_uuid), "a", encoding = "utf-8") as bestand:
+            for transactie_uuid in nieuw:
+                bestand.write(json.dumps({"uuid": transactie_uuid, "transactie": transacties[transactie_uuid].naar_json()}, ensure_ascii = False) + "\n")
+            bestand.flush()
+            os.fsync(bestand.fileno())
+        
+        with open(self.pad_journaal(rekening_uuid), "r", encoding = "utf-8") as bestand:
+            lengte_journaal =   sum(1 for _ in bestand)
+        
+        if lengte_journaal >= self.compacteren_vanaf:
+            self.compacteren(rekening_uuid, transacties)
+    
+    def compacteren(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie]   =   None,
+        ):
+        
+        transacties =   self.openen(rekening_uuid) if transacties is None else transacties
+        
+        # eerst het basisbestand via een tijdelijk bestand in één keer
+        # vervangen, dan pas het journaal weg: na een onderbreking is het
+        # basisbestand heel en levert het opnieuw afspelen van het journaal
+        # hetzelfde resultaat
+        opslaan_json(dict(transacties), self.map, f"{rekening_uuid}.nieuw", "json", {"Transactie": "naar_json", "TransactieWeergave": "naar_json"})
+        os.replace(os.path.join(self.map, f"{rekening_uuid}.nieuw.{self.extensie}"), self.pad(rekening_uuid))
+        
+        if os.path.exists(self.pad_journaal(rekening_uuid)):
+            os.remove(self.pad_journaal(rekening_uuid))
+
+class ParquetOpslag(Opslag):
+    
+    # kolomsgewijze opslag: bedragen als int64 centen, datumtijd als datetime64,
+    # uuids dictionary-gecodeerd en details als JSON-tekst per rij
+    
+    formaat     =   "parquet"
+    extensie    =   "parquet"
+    
+    def kolommen(
+        self,
+        rekening_uuid   :   str,
+        ) -> pd.DataFrame:
+        
+        kolommen            =   pd.read_parquet(self.pad(rekening_uuid))
+        kolommen["details"] =   kolommen["details"].map(lambda details: json.loads(details) if isinstance(details, str) else None).astype(object)
+        
+        return typeren_kolommen(kolommen[KOLOMMEN])
+    
+    def opslaan(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        nieuw           :   Iterable[str]           =   None,
+        ):
+        
+        kolommen            =   naar_kolommen(transacties)
+        kolommen["details"] =   kolommen["details"].map(lambda details: json.dumps(details, ensure_ascii = False) if isinstance(details, dict) else None).astype(object)
+        kolommen.to_parquet(self.pad(rekening_uuid), index = False)
+
+class SqliteOpslag(Opslag):
+    
+    # alle rekeningen in één database, met indexen op de kolommen waarop
+    # gefilterd wordt; de referentiegegevens blijven in JSON te bewerken en
+    # worden bij elke wijziging via het register hierheen gespiegeld
+    
+    formaat     =   "sqlite"
+    extensie    =   "sqlite"
+    map         =   "gegevens"
+    
+    SCHEMA      =   """
+        CREATE TABLE IF NOT EXISTS transactie (
+            rekening_uuid       TEXT    NOT NULL,
+            uuid                TEXT    NOT NULL,
+            "index"             INTEGER NOT NULL,
+            dagindex            INTEGER NOT NULL,
+            bedrag              INTEGER NOT NULL,
+            beginsaldo          INTEGER NOT NULL,
+            eindsaldo           INTEGER NOT NULL,
+            transactiemethode   TEXT    NOT NULL,
+            datumtijd           TEXT    NOT NULL,
+            cat_uuid            TEXT,
+            derde_uuid          TEXT,
+            details             TEXT,
+            PRIMARY KEY (rekening_uuid, uuid),
+            CHECK (eindsaldo = beginsaldo + bedrag)
+            );
+        CREATE UNIQUE INDEX IF NOT EXISTS transactie_index ON transactie (rekening_uuid, "index");
+        CREATE INDEX IF NOT EXISTS transactie_datumtijd ON transactie (rekening_uuid, datumtijd);
+        CREATE INDEX IF NOT EXISTS transactie_derde ON transactie (derde_uuid, datumtijd);
+        CREATE INDEX IF NOT EXISTS transactie_categorie ON transactie (cat_uuid, datumtijd);
+        
+        -- ook rekeningen zonder transacties bestaan; een database van vóór
+        -- deze tabel krijgt hier eenmalig de rekeningen met transacties
+        CREATE TABLE IF NOT EXISTS rekening (rekening_uuid TEXT PRIMARY KEY);
+        INSERT OR IGNORE INTO rekening SELECT DISTINCT rekening_uuid FROM transactie;
+        
+        CREATE TABLE IF NOT EXISTS hoofdcategorie (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, kleur TEXT);
+        CREATE TABLE IF NOT EXISTS categorie (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, hoofdcat_uuid TEXT, kleur TEXT, trefwoorden TEXT);
+        CREATE TABLE IF NOT EXISTS land (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, iso_3166_1_alpha_3 TEXT, synoniemen TEXT);
+        CREATE TABLE IF NOT EXISTS locatie (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, land_uuid TEXT, breedtegraad REAL, lengtegraad REAL, synoniemen TEXT);
+        CREATE TABLE IF NOT EXISTS persoon (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, groep TEXT, iban TEXT, rekeningnummer TEXT, giro TEXT);
+        CREATE TABLE IF NOT EXISTS bedrijf (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, synoniemen TEXT, uitsluiten INTEGER, iban TEXT, rekeningnummer TEXT, giro TEXT, cat_uuid TEXT);
+        CREATE TABLE IF NOT EXISTS cpsp (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, synoniemen TEXT, uitsluiten INTEGER, iban TEXT, rekeningnummer TEXT);
+        CREATE TABLE IF NOT EXISTS bank (uuid TEXT PRIMARY KEY, naam TEXT NOT NULL, synoniemen TEXT, iban TEXT, rekeningnummer TEXT, bic TEXT);
+        CREATE TABLE IF NOT EXISTS iban (iban TEXT NOT NULL, tabel TEXT NOT NULL, derde_uuid TEXT NOT NULL, PRIMARY KEY (iban, tabel, derde_uuid));
+        CREATE INDEX IF NOT EXISTS categorie_hoofdcategorie ON categorie (hoofdcat_uuid);
+        CREATE INDEX IF NOT EXISTS locatie_land ON locatie (land_uuid);
+        CREATE INDEX IF NOT EXISTS bedrijf_categorie ON bedrijf (cat_uuid);
+        CREATE INDEX IF NOT EXISTS iban_derde ON iban (derde_uuid);
+        """
+    
+    REFERENTIETABELLEN  =   {
+        "hoofdcategorie":   ["naam", "kleur"],
+        "categorie":        ["naam", "hoofdcat_uuid", "kleur", "trefwoorden"],
+        "land":             ["naam", "iso_3166_1_alpha_3", "synoniemen"],
+        "locatie":          ["naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen"],
+        "persoon":          ["naam", "groep", "iban", "rekeningnummer", "giro"],
+        "bedrijf":          ["naam", "synoniemen", "uitsluiten", "iban", "rekeningnummer", "giro", "cat_uuid"],
+        "cpsp":             ["naam", "synoniemen", "uitsluiten", "iban", "rekeningnummer"],
+        "bank":             ["naam", "synoniemen", "iban", "rekeningnummer", "bic"],
+        }
+    
+    SELECTIE    =   """SELECT uuid, "index", bedrag, beginsaldo, eindsaldo, transactiemethode, datumtijd, dagindex, cat_uuid, derde_uuid, details FROM transactie"""
+    
+    def pad(
+        self,
+        rekening_uuid   :   str =   None,
+        ) -> str:
+        
+        return os.path.join(self.map, f"platus.{self.extensie}")
+    
+    def __init__(self) -> "SqliteOpslag":
+        
+        self.schema         =   False
+        self._rekeningen    =   (None, frozenset())
+    
+    def verbinding(self) -> sqlite3.Connection:
+        
+        # het schema één keer per instantie, of opnieuw als de database weg is
+        nieuw       =   not self.schema or not os.path.exists(self.pad())
+        verbinding  =   sqlite3.connect(self.pad())
+        if nieuw:
+            verbinding.executescript(self.SCHEMA)
+            self.schema =   True
+        return verbinding
+    
+    def bestaat(
+        self,
+        rekening_uuid   :   str,
+        ) -> bool:
+        
+        # de rekeningen in de database, opnieuw opgevraagd zodra het bestand
+        # is veranderd (mtime en grootte, net als Register.kenmerk)
+        if not os.path.exists(self.pad()):
+            return False
+        
+        status  =   os.stat(self.pad())
+        kenmerk =   (status.st_mtime_ns, status.st_size)
+        
+        if self._rekeningen[0] != kenmerk:
+            with closing(self.verbinding()) as verbinding:
+                self._rekeningen    =   (kenmerk, frozenset(rij[0] for rij in verbinding.execute("SELECT rekening_uuid FROM rekening")))
+        
+        return rekening_uuid in self._rekeningen[1]
+    
+    def selecteren(
+        self,
+        voorwaarden :   Dict[str, Any],
+        ) -> pd.DataFrame:
+        
+        with closing(self.verbinding()) as verbinding:
+            kolommen    =   pd.read_sql_query(
+                f"{self.SELECTIE} WHERE {" AND ".join(voorwaarden.keys())} ORDER BY \"index\"",
+                verbinding,
+                params = tuple(voorwaarden.values()),
+                )
+        
+        kolommen["details"] =   kolommen["details"].map(lambda details: json.loads(details) if isinstance(details, str) else None).astype(object)
+        
+        return typeren_kolommen(kolommen[KOLOMMEN])
+    
+    def kolommen(
+        self,
+        rekening_uuid   :   str,
+        ) -> pd.DataFrame:
+        
+        return self.selecteren({"rekening_uuid = ?": rekening_uuid})
+    
+    def zoeken(
+        self,
+        rekening_uuid   :   str,
+        van             :   dt.datetime =   None,
+        tot             :   dt.datetime =   None,
+        derde_uuid      :   str         =   None,
+        cat_uuid        :   str         =   None,
+        ) -> Dict[str, Transactie]:
+        
+        voorwaarden =   {"rekening_uuid = ?": rekening_uuid}
+        
+        if van is not None:
+            voorwaarden["datumtijd >= ?"]   =   self.naar_tekst(van)
+        if tot is not None:
+            voorwaarden["datumtijd <= ?"]   =   self.naar_tekst(tot)
+        if derde_uuid is not None:
+            voorwaarden["derde_uuid = ?"]   =   derde_uuid
+        if cat_uuid is not None:
+            voorwaarden["cat_uuid = ?"]     =   cat_uuid
+        
+        return van_kolommen(self.selecteren(voorwaarden))
+    
+    @staticmethod
+    def naar_tekst(datumtijd: dt.datetime) -> str:
+        return dt.datetime.strftime(datumtijd, "%Y-%m-%dT%H:%M:%S")
+    
+    def naar_rij(
+        self,
+        rekening_uuid   :   str,
+        transactie_uuid :   str,
+        transactie      :   Transactie,
+        ) -> tuple:
+        
+        return (
+            rekening_uuid,
+            transactie_uuid,
+            transactie.index,
+            transactie.dagindex,
+            transactie.bedrag,
+            transactie.beginsaldo,
+            transactie.eindsaldo,
+            transactie.transactiemethode,
+            self.naar_tekst(transactie.datumtijd),
+            transactie.cat_uuid,
+            transactie.derde_uuid,
+            json.dumps(transactie.details, ensure_ascii = False) if transactie.details != {} else None,
+            )
+    
+    def opslaan(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        nieuw           :   Iterable[str]           =   None,
+        ):
+        
+        with closing(self.verbinding()) as verbinding:
+            self.schrijven(verbinding, rekening_uuid, transacties, nieuw)
+        
+        self._rekeningen    =   (None, frozenset())
+    
+    def schrijven(
+        self,
+        verbinding      :   sqlite3.Connection,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        nieuw           :   Iterable[str]           =   None,
+        ):
+        
+        with verbinding:
+            verbinding.execute("INSERT OR IGNORE INTO rekening VALUES (?)", (rekening_uuid,))
+            if nieuw is None:
+                verbinding.execute("DELETE FROM transactie WHERE rekening_uuid = ?", (rekening_uuid,))
+                nieuw   =   transacties.keys()
+            verbinding.executemany(
+                "INSERT OR REPLACE INTO transactie VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.naar_rij(rekening_uuid, transactie_uuid, transacties[transactie_uuid]) for transactie_uuid in nieuw),
+                )
+    
+    def pad_backup(
+        self,
+        rekening_uuid   :   str,
+        ) -> str:
+        
+        return os.path.join(self.map, f"{dt.datetime.strftime(dt.datetime.today(), "%Y-%m-%d")} - {rekening_uuid}.{self.extensie}")
+    
+    def backup(
+        self,
+        rekening_uuid   :   str,
+        transacties     :   Dict[str, Transactie],
+        ):
+        
+        # net als bij de andere formaten één bestand per rekening en dag, met
+        # enkel de meegegeven transacties van die rekening
+        with closing(sqlite3.connect(self.pad_backup(rekening_uuid))) as verbinding:
+            verbinding.executescript(self.SCHEMA)
+            self.schrijven(verbinding, rekening_uuid, transacties)
+    
+    def opslaan_referentie(
+        self,
+        tabel   :   str,
+        waarden :   Dict[str, Any],
+        ):
+        
+        if tabel not in self.REFERENTIETABELLEN.keys():
+            return
+        
+        kolommen    =   self.REFERENTIETABELLEN[tabel]
+        rijen       =   []
+        ibans       =   []
+        
+        for uuid, waarde in waarden.items():
+            waarde_json =   waarde.naar_json()
+            rijen.append((uuid, *[json.dumps(waarde_json[kolom], ensure_ascii = False) if isinstance(waarde_json.get(kolom), list) else waarde_json.get(kolom) for kolom in kolommen]))
+            ibans.extend((iban, tabel, uuid) for iban in waarde_json.get("iban", []))
+        
+        with closing(self.verbinding()) as verbinding:
+            with verbinding:
+                verbinding.execute(f"DELETE FROM {tabel}")
+                verbinding.executemany(f"INSERT INTO {tabel} (uuid, {", ".join(kolommen)}) VALUES ({", ".join("?" * (len(kolommen) + 1))})", rijen)
+                verbinding.execute("DELETE FROM iban WHERE tabel = ?", (tabel,))
+                verbinding.executemany("INSERT OR IGNORE INTO iban VALUES (?, ?, ?)", ibans)
+
+OPSLAGEN    =   {
+    "json":     JsonOpslag,
+    "parquet":  ParquetOpslag,
+    "sqlite":   SqliteOpslag,
+    }
+
+_instanties =   {}
+
+def opslag(
+    formaat :   str =   None,
+    ) -> Opslag:
+    
+    if formaat is None:
+        formaat =   register["opslag"].get("formaat", "json") if register.kenmerk("opslag") is not None else "json"
+    
+    if formaat not in OPSLAGEN.keys():
+        raise ValueError(f"opslagformaat \"{formaat}\" onbekend, kies uit {", ".join(OPSLAGEN.keys())}")
+    
+    # één instantie per formaat, zodat bijvoorbeeld het schema van SQLite
+    # maar één keer per proces wordt aangemaakt
+    if formaat not in _instanties.keys():
+        _instanties[formaat]    =   OPSLAGEN[formaat]()
+    
+    return _instanties[formaat]
+
+def spiegelen_referentie(
+    tabel   :   str,
+    waarden :   Dict[str, Any],
+    ):
+    
+    opslag().opslaan_referentie(tabel, waarden)
+
+register.bij_schrijven.append(spiegelen_referentie)
+
+def alle_rekeningen() -> List[str]:
+    return list(register["bankrekening"].keys()) + list(register["lening"].keys())
+
+def omzetten(
+    naar            :   str,
+    van             :   str             =   None,
+    rekening_uuids  :   Iterable[str]   =   None,
+    ):
+    
+    opslag_van      =   opslag(van)
+    opslag_naar     =   opslag(naar)
+    rekening_uuids  =   alle_rekeningen() if rekening_uuids is None else rekening_uuids
+    
+    for rekening_uuid in rekening_uuids:
+        if opslag_van.bestaat(rekening_uuid):
+            opslag_naar.opslaan(rekening_uuid, opslag_van.openen(rekening_uuid))
+    
+    for tabel in getattr(opslag_naar, "REFERENTIETABELLEN", {}).keys():
+        opslag_naar.opslaan_referentie(tabel, register[tabel])
\ No newline at end of file
@@ -0,0 +1,153 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from .beoordeling import Beoordelingen
+from .opslag import alle_rekeningen, opslag
+from .transactie import Transactie
+from .vingerafdruk import Vingerafdrukken
+
+
+INTERNE_OVERBOEKING =   "1e8fd286-4cdd-4836-a1c5-7e815123ea25"
+
+class InterneOverboekingen:
+    
+    # hash-index over de interne overboekingen van alle eigen rekeningen, één
+    # keer per sessie opgebouwd. een interne overboeking staat op beide
+    # rekeningen met dezelfde uuid; de tegenboeking wordt gevonden op sleutel
+    # (rekening, datum, absoluut bedrag, categorie) in plaats van door telkens
+    # de hele tegenrekening in te lezen
+    
+    def __init__(
+        self,
+        rekening_uuids  :   Iterable[str]   =   None,
+        cat_uuid        :   str             =   INTERNE_OVERBOEKING,
+        ) -> "InterneOverboekingen":
+        
+        self.cat_uuid       =   cat_uuid
+        self.index          =   defaultdict(list)
+        self.per_rekening   =   defaultdict(dict)
+        
+        opslag_huidig   =   opslag()
+        
+        for rekening_uuid in (alle_rekeningen() if rekening_uuids is None else rekening_uuids):
+            if not opslag_huidig.bestaat(rekening_uuid):
+                continue
+            for transactie_uuid, transactie in opslag_huidig.zoeken(rekening_uuid, cat_uuid = self.cat_uuid).items():
+                self.toevoegen(rekening_uuid, transactie_uuid, transactie)
+    
+    @staticmethod
+    def sleutel(
+        rekening_uuid   :   str,
+        transactie      :   Transactie,
+        ) -> Tuple:
+        
+        return rekening_uuid, transactie.datumtijd.date(), abs(transactie.bedrag), transactie.cat_uuid
+    
+    def toevoegen(
+        self,
+        rekening_uuid   :   str,
+        transactie_uuid :   str,
+        transactie      :   Transactie,
+        ):
+        
+        if transactie.cat_uuid != self.cat_uuid or transactie_uuid in self.per_rekening[rekening_uuid]:
+            return
+        
+        self.per_rekening[rekening_uuid][transactie_uuid]   =   transactie
+        self.index[self.sleutel(rekening_uuid, transactie)].append(transactie_uuid)
+    
+    def zoeken(
+        self,
+        rekening_uuid   :   str,
+        transactie      :   Transactie,
+        ) -> str | None:
+        
+        # de uuid van een nog niet gekoppelde tegenboeking op de rekening van de
+        # derde, bij voorkeur met exact dezelfde datumtijd
+        if transactie.cat_uuid != self.cat_uuid or transactie.derde_uuid is None:
+            return None
+        
+        eigen       =   self.per_rekening[rekening_uuid]
+        ander       =   self.per_rekening.get(transactie.derde_uuid, {})
+        kandidaten  =   [
+            ander_uuid for ander_uuid in self.index.get(self.sleutel(transactie.derde_uuid, transactie), [])
+            if ander[ander_uuid].bedrag == -transactie.bedrag and ander_uuid not in eigen
+            ]
+        
+        for ander_uuid in kandidaten:
+            if ander[ander_uuid].datumtijd == transactie.datumtijd:
+                return ander_uuid
+        
+        return kandidaten[0] if len(kandidaten) > 0 else None
+    
+    def hernoemen(
+        self,
+        rekening_uuid   :   str,
+        oud_uuid        :   str,
+        nieuw_uuid      :   str,
+        ):
+        
+        transactie  =   self.per_rekening[rekening_uuid].pop(oud_uuid)
+        self.per_rekening[rekening_uuid][nieuw_uuid]    =   transactie
+        
+        uuids   =   self.index[self.sleutel(rekening_uuid, transactie)]
+        uuids[uuids.index(oud_uuid)]    =   nieuw_uuid
+    
+    def alles_koppelen(
+        self,
+        opslaan :   bool    =   True,
+        ) -> Dict[str, List[Tuple[str, ...]]]:
+        
+        # koppelt in één doorgang alle gespiegelde interne overboekingen die nog
+        # niet dezelfde uuid hebben, door de uuid aan de ene kant gelijk te
+        # maken aan die van de tegenboeking
+        gekoppeld   =   []
+        ongekoppeld =   []
+        
+        for rekening_uuid in list(self.per_rekening.keys()):
+            for transactie_uuid, transactie in list(self.per_rekening[rekening_uuid].items()):
+                if transactie_uuid in self.per_rekening.get(transactie.derde_uuid, {}):
+                    continue
+                
+                ander_uuid  =   self.zoeken(rekening_uuid, transactie)
+                
+                if ander_uuid is None:
+                    ongekoppeld.append((rekening_uuid, transactie_uuid))
+                else:
+                    self.hernoemen(rekening_uuid, transactie_uuid, ander_uuid)
+                    gekoppeld.append((rekening_uuid, transactie_uuid, ander_uuid))
+        
+        if opslaan:
+            self.opslaan(gekoppeld)
+        
+        return {"gekoppeld": gekoppeld, "ongekoppeld": ongekoppeld}
+    
+    def opslaan(
+        self,
+        gekoppeld   :   List[Tuple[str, str, str]],
+        ):
+        
+        # de transacties, en daarna de vingerafdrukken en de wachtrij die naar
+        # de oude uuid verwijzen
+        hernoemingen    =   defaultdict(dict)
+        for rekening_uuid, oud_uuid, nieuw_uuid in gekoppeld:
+            hernoemingen[rekening_uuid][oud_uuid]   =   nieuw_uuid
+        
+        if len(hernoemingen) == 0:
+            return
+        
+        opslag_huidig   =   opslag()
+        
+        for rekening_uuid, paren in hernoemingen.items():
+            transacties =   opslag_huidig.openen(rekening_uuid)
+            for oud_uuid, nieuw_uuid in paren.items():
+                transacties[nieuw_uuid] =   transacties.pop(oud_uuid)
+            opslag_huidig.opslaan(rekening_uuid, transacties)
+            Vingerafdrukken(rekening_uuid).hernoemen(paren)
+        
+        alle        =   {oud_uuid: nieuw_uuid for paren in hernoemingen.values() for oud_uuid, nieuw_uuid in paren.items()}
+        wachtrij    =   Beoordelingen()
+        
+        if not alle.keys().isdisjoint(wachtrij.wachtrij.keys()):
+            wachtrij.hernoemen(alle)
+            wachtrij.opslaan()
\ No newline at end of file
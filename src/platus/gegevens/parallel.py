@@ -0,0 +1,96 @@
+from collections import Counter
+from contextlib import ExitStack, nullcontext
+from multiprocessing import Pool
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .bankexport import BankexportRij
+from .cpsp import cpsp_herkenner
+from .omschrijving import ontleder
+from .register import register
+from .transactie import Transactie
+
+
+# per werkproces: de sessie die nooit wordt vastgelegd en de IBAN's per bank bij
+# het begin
+_sessie     =   ExitStack()
+_banken     =   {}
+
+def starten_werkproces():
+    
+    # de referentiegegevens zijn in een werkproces alleen-lezen: wat een rij
+    # leert (IBAN's van banken en cpsp's) blijft in het geheugen en gaat met
+    # het resultaat terug naar het hoofdproces, net als de treffers en tijden
+    # van de ontleder (zonder de tellingen en meters van het hoofdproces)
+    _sessie.enter_context(register.sessie())
+    ontleder.treffers   =   Counter()
+    ontleder.tijden     =   Counter()
+    ontleder.meters     =   []
+    _banken.update({bank_uuid: set(bank.iban) for bank_uuid, bank in register["bank"].items()})
+
+def maken_pool(processen: int = None) -> Pool:
+    return Pool(processen or os.cpu_count(), initializer = starten_werkproces)
+
+def geleerd_werkproces() -> Dict[str, Dict[str, Any]]:
+    
+    # ook de treffers en tijden van de ontleder sinds de vorige rij, die
+    # anders in het werkproces achterblijven
+    geleerd_cpsp, cpsp_herkenner.geleerd    =   cpsp_herkenner.geleerd, {}
+    treffers, ontleder.treffers             =   ontleder.treffers, Counter()
+    tijden, ontleder.tijden                 =   ontleder.tijden, Counter()
+    geleerd_bank                            =   {}
+    
+    for bank_uuid, bank in register["bank"].items():
+        nieuw   =   [iban for iban in bank.iban if iban not in _banken.setdefault(bank_uuid, set())]
+        if len(nieuw) > 0:
+            geleerd_bank[bank_uuid] =   nieuw
+            _banken[bank_uuid].update(nieuw)
+    
+    return {"cpsp": geleerd_cpsp, "bank": geleerd_bank, "treffers": dict(treffers), "tijden": dict(tijden)}
+
+def ontleden_rij(rij: BankexportRij) -> Tuple[Transactie | None, Exception | None, Dict[str, Dict[str, Any]]]:
+    
+    try:
+        transactie  =   Transactie.van_bankexport(rij)
+    except Exception as fout:
+        return None, fout, geleerd_werkproces()
+    
+    return transactie, None, geleerd_werkproces()
+
+def toepassen_geleerd(geleerd: Dict[str, Dict[str, Any]]):
+    
+    # in het hoofdproces, binnen de sessie van de verwerking
+    ontleder.treffers.update(geleerd["treffers"])
+    for formaat, duur in geleerd["tijden"].items():
+        ontleder.meten(formaat, duur)
+    
+    cpsp_herkenner.actueel()
+    for cpsp_uuid, ibans in geleerd["cpsp"].items():
+        for iban in ibans:
+            cpsp_herkenner.leren(cpsp_uuid, iban)
+    
+    if len(geleerd["bank"]) > 0:
+        banken  =   register.bewerken("bank", geleerd["bank"].keys())
+        for bank_uuid, ibans in geleerd["bank"].items():
+            for iban in ibans:
+                banken[bank_uuid].toevoegen_iban(iban)
+        register.opslaan("bank", banken)
+
+def ontleden_parallel(
+    rijen       :   Iterable[BankexportRij],
+    processen   :   int     =   None,
+    grootte     :   int     =   64,
+    pool        :   Pool    =   None,
+    ) -> Iterator[Transactie]:
+    
+    # rijen ontleden en derden, categorieën en locaties opzoeken in een pool
+    # van werkprocessen; de transacties komen in de volgorde van de bankexport
+    # terug, zodat het saldo en de index in het hoofdproces op volgorde blijven.
+    # een pool van maken_pool kan worden meegegeven om die voor meerdere
+    # bankexports te gebruiken, anders wordt er een voor deze export gestart
+    with nullcontext(pool) if pool is not None else maken_pool(processen) as pool:
+        for transactie, fout, geleerd in pool.imap(ontleden_rij, rijen, chunksize = grootte):
+            toepassen_geleerd(geleerd)
+            if fout is not None:
+                raise fout
+            yield transactie
\ No newline at end of file
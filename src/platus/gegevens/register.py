@@ -0,0 +1,205 @@
+from contextlib import contextmanager
+import copy
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Tuple
+
+from grienetsiis import open_json, opslaan_json
+from .types import Categorie, HoofdCategorie, Land, Locatie, Persoon, Bedrijf, Bank, Cpsp
+
+
+TABELLEN    =   {
+    "persoon":          ("gegevens\\derden",        "persoon",          (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),                          {"Persoon": "naar_json"}),
+    "bedrijf":          ("gegevens\\derden",        "bedrijf",          (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),  {"Bedrijf": "naar_json"}),
+    "bank":             ("gegevens\\derden",        "bank",             (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),                         {"Bank": "naar_json"}),
+    "cpsp":             ("gegevens\\derden",        "cpsp",             (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),          {"Cpsp": "naar_json"}),
+    "categorie":        ("gegevens\\configuratie",  "categorie",        (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),                         {"Categorie": "naar_json"}),
+    "hoofdcategorie":   ("gegevens\\configuratie",  "hoofdcategorie",   (HoofdCategorie, frozenset(("naam", "kleur",)), "van_json"),                                                      {"HoofdCategorie": "naar_json"}),
+    "locatie":          ("gegevens\\configuratie",  "locatie",          (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),            {"Locatie": "naar_json"}),
+    "land":             ("gegevens\\configuratie",  "land",             (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),                                      {"Land": "naar_json"}),
+    "bankrekening":     ("gegevens\\configuratie",  "bankrekening",     None,                                                                                                             None),
+    "beoordeling":      ("gegevens\\configuratie",  "beoordeling",      None,                                                                                                             None),
+    "lening":           ("gegevens\\configuratie",  "lening",           None,                                                                                                             None),
+    "muntsoort":        ("gegevens\\configuratie",  "muntsoort",        None,                                                                                                             None),
+    "opslag":           ("gegevens\\configuratie",  "opslag",           None,                                                                                                             None),
+    "persoonsgroep":    ("gegevens\\configuratie",  "persoonsgroep",    None,                                                                                                             None),
+    "salaris":          ("gegevens\\configuratie",  "salaris",          None,                                                                                                             None),
+    "transactie":       ("gegevens\\configuratie",  "transactie",       None,                                                                                                             None),
+    "weergave":         ("gegevens\\configuratie",  "weergave",         None,                                                                                                             None),
+    }
+
+class Register:
+    
+    # eenmalig ingelezen referentietabellen, gedeeld door het hele proces. een
+    # tabel wordt pas opnieuw ingelezen als het bestand op schijf verandert
+    # (mtime of grootte) of als platus de tabel zelf opslaat via dit register.
+    # binnen een sessie blijven opgeslagen tabellen in het geheugen en worden
+    # ze pas aan het einde in één keer per bestand weggeschreven. een tabel is
+    # alleen aan de buitenkant alleen-lezend (MappingProxyType): de objecten
+    # erin zijn gedeeld en mogen niet in plaats worden gewijzigd, daarvoor is
+    # bewerken. na het wegschrijven van een tabel worden de functies in
+    # bij_schrijven aangeroepen, zodat bijvoorbeeld de opslag een kopie kan
+    # bijhouden zonder dat het register de opslag hoeft te kennen
+    
+    def __init__(
+        self,
+        tabellen    :   Dict[str, Tuple]    =   None,
+        ) -> "Register":
+        
+        self.tabellen   =   TABELLEN if tabellen is None else tabellen
+        self._cache     =   {}
+        self._gewijzigd =   {}
+        self._sessies   =   0
+        
+        self.bij_schrijven  =   []
+    
+    def __getitem__(
+        self,
+        tabel   :   str,
+        ) -> Mapping[str, Any]:
+        
+        return self.openen(tabel)
+    
+    @staticmethod
+    def pad(
+        map     :   str,
+        naam    :   str,
+        extensie:   str =   "json",
+        ) -> str:
+        
+        return os.path.join(map, f"{naam}.{extensie}")
+    
+    def kenmerk(
+        self,
+        tabel   :   str,
+        ) -> Tuple[int, int] | None:
+        
+        map, naam, _, _ =   self.tabellen[tabel]
+        
+        try:
+            status  =   os.stat(self.pad(map, naam))
+        except OSError:
+            return None
+        
+        return status.st_mtime_ns, status.st_size
+    
+    def openen(
+        self,
+        tabel   :   str,
+        ) -> Mapping[str, Any]:
+        
+        # een tabel die in de sessie is gewijzigd komt uit het geheugen
+        if tabel in self._gewijzigd:
+            return self._cache[tabel][2]
+        
+        kenmerk =   self.kenmerk(tabel)
+        
+        if tabel not in self._cache or self._cache[tabel][0] != kenmerk:
+            map, naam, class_mapper, _  =   self.tabellen[tabel]
+            if class_mapper is None:
+                waarden =   open_json(map, naam, "json")
+            else:
+                waarden =   open_json(map, naam, "json", class_mapper = class_mapper)
+            self._cache[tabel]  =   (kenmerk, waarden, MappingProxyType(waarden))
+        
+        return self._cache[tabel][2]
+    
+    def bewerken(
+        self,
+        tabel   :   str,
+        sleutels:   Iterable[str]   =   None,
+        ) -> Dict[str, Any]:
+        
+        # een eigen kopie, zodat de gedeelde tabel pas verandert bij opslaan.
+        # met sleutels enkel een eigen kopie van die waarden (de rest wordt
+        # gedeeld en mag dan niet worden gewijzigd), bijvoorbeeld om één IBAN
+        # aan één derde toe te voegen zonder de hele tabel te kopiëren
+        if sleutels is None:
+            return copy.deepcopy(dict(self.openen(tabel)))
+        
+        waarden =   dict(self.openen(tabel))
+        for sleutel in sleutels:
+            if sleutel in waarden:
+                waarden[sleutel]    =   copy.deepcopy(waarden[sleutel])
+        
+        return waarden
+    
+    def opslaan(
+        self,
+        tabel   :   str,
+        waarden :   Dict[str, Any],
+        ):
+        
+        if self._sessies > 0:
+            self._gewijzigd[tabel]  =   waarden
+            self._cache[tabel]      =   (None, waarden, MappingProxyType(waarden))
+            return
+        
+        self.schrijven({tabel: waarden})
+    
+    def schrijven(
+        self,
+        tabellen    :   Dict[str, Dict[str, Any]],
+        ):
+        
+        # eerst alle tabellen naar een tijdelijk bestand, daarna elk bestand in
+        # één keer vervangen, zodat een afgebroken schrijfactie geen half
+        # bestand achterlaat
+        for tabel, waarden in tabellen.items():
+            map, naam, _, encoder   =   self.tabellen[tabel]
+            if encoder is None:
+                opslaan_json(waarden, map, f"{naam}.nieuw", "json")
+            else:
+                opslaan_json(waarden, map, f"{naam}.nieuw", "json", encoder)
+        
+        for tabel, waarden in tabellen.items():
+            map, naam, _, _ =   self.tabellen[tabel]
+            os.replace(self.pad(map, f"{naam}.nieuw"), self.pad(map, naam))
+            self._cache[tabel]  =   (self.kenmerk(tabel), waarden, MappingProxyType(waarden))
+            for functie in self.bij_schrijven:
+                functie(tabel, waarden)
+    
+    @contextmanager
+    def sessie(self) -> Iterator["Register"]:
+        
+        # alle wijzigingen binnen de sessie in één keer vastleggen aan het
+        # einde, of terugdraaien als de sessie met een fout wordt afgebroken
+        self._sessies   +=  1
+        
+        try:
+            yield self
+        except BaseException:
+            self._sessies   -=  1
+            if self._sessies == 0:
+                self.terugdraaien()
+            raise
+        
+        self._sessies   -=  1
+        if self._sessies == 0:
+            self.vastleggen()
+    
+    def vastleggen(self):
+        
+        # ook tussentijds te gebruiken als controlepunt binnen een sessie
+        gewijzigd, self._gewijzigd  =   self._gewijzigd, {}
+        
+        if len(gewijzigd) > 0:
+            self.schrijven(gewijzigd)
+    
+    def terugdraaien(self):
+        
+        for tabel in self._gewijzigd:
+            self._cache.pop(tabel, None)
+        self._gewijzigd =   {}
+    
+    def vernieuwen(
+        self,
+        tabel   :   str =   None,
+        ):
+        
+        if tabel is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(tabel, None)
+
+register    =   Register()
\ No newline at end of file
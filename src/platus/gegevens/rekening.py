@@ -1,13 +1,25 @@
 import datetime as dt
 import locale
+from multiprocessing.pool import Pool
+import os
 from typing import Dict,  List
 from uuid import uuid4
 
 import pandas as pd
 
-from grienetsiis import open_json, opslaan_json
+from .bankexport import IMPORTEURS, lezen_bankexport
+from .beoordeling import Beoordelingen
+from .blok import TransactieBlok
+from .cpsp import cpsp_herkenner
+from .kubus import Kubus
+from .opslag import opslag
+from .overboeking import INTERNE_OVERBOEKING, InterneOverboekingen
+from .parallel import ontleden_parallel
+from .register import register
+from .salaris import salaris_index
+from .tabel import maken_tabel, referentietabellen
 from .transactie import Transactie
-from .types import Categorie, HoofdCategorie, Land, Locatie, Persoon, Bedrijf, Bank, Cpsp
+from .vingerafdruk import Vingerafdrukken
 
 
 locale.setlocale(locale.LC_ALL, "nl_NL.UTF-8")
@@ -26,46 +38,62 @@ class Rekening:
         
         self.naam           =   naam
         self.uuid           =   uuid
-        self.transacties    =   dict() if transacties is None else transacties
+        self.transacties    =   transacties if isinstance(transacties, TransactieBlok) else TransactieBlok(transacties)
         self.actief         =   actief
         self.actief_van     =   actief_van
         self.actief_tot     =   actief_tot
+        
+        self.nieuwe_transacties =   []
+        self.kubus              =   Kubus(uuid)
     
-    def opslaan(self):
-        opslaan_json(self.transacties, "gegevens\\rekeningen", self.uuid, "json", {"Transactie": "naar_json"})
+    def opslaan(
+        self,
+        volledig    :   bool    =   False,
+        ):
+        
+        # standaard worden enkel de sinds het openen toegevoegde transacties
+        # weggeschreven; na het bewerken van bestaande transacties volledig.
+        # van de kubus worden dan enkel de maanden van de nieuwe transacties
+        # opnieuw berekend, mits die bij de opgeslagen transacties hoorde
+        referenties =   referentietabellen()
+        maanden     =   None if volledig or not self.kubus.geldig(referenties) else {(self.transacties[transactie_uuid].datumtijd.year, self.transacties[transactie_uuid].datumtijd.month) for transactie_uuid in self.nieuwe_transacties}
+        
+        opslag().opslaan(self.uuid, self.transacties, nieuw = None if volledig else self.nieuwe_transacties)
+        self.nieuwe_transacties =   []
+        self.kubus.bijwerken(self.transacties, maanden, referenties)
     
     def backup(self):
-        opslaan_json(self.transacties, "gegevens\\rekeningen", f"{dt.datetime.strftime(dt.datetime.today(), "%Y-%m-%d")} - {self.uuid}", "json", {"Transactie": "naar_json"})
+        opslag().backup(self.uuid, self.transacties)
     
     @property
     def transactie_lijst(self) -> List[Transactie]:
-        return list(sorted(self.transacties.values(), key = lambda transactie: transactie.index))
+        return self.transacties.lijst
     
     def tabel(
         self,
         ) -> pd.DataFrame:
         
-        personen        = 	open_json("gegevens\\derden",           "persoon",        "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
-        bedrijven       = 	open_json("gegevens\\derden",           "bedrijf",        "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
-        bankrekeningen  = 	open_json("gegevens\\configuratie",     "bankrekening",   "json")
-        banken          = 	open_json("gegevens\\derden",           "bank",           "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
-        cpsps           = 	open_json("gegevens\\derden",           "cpsp",           "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
-        categorieen     =   open_json("gegevens\\configuratie",     "categorie",      "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
-        hoofdcategorieen=   open_json("gegevens\\configuratie",     "hoofdcategorie", "json", class_mapper = (HoofdCategorie, frozenset(("naam", "kleur",)), "van_json"),)
-        locaties        =   open_json("gegevens\\configuratie",     "locatie",        "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
-        landen          =   open_json("gegevens\\configuratie",     "land",           "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
-        
-        return pd.DataFrame(transactie.naar_tabel(
-            personen,
-            bedrijven,
-            bankrekeningen,
-            banken,
-            cpsps,
-            categorieen,
-            hoofdcategorieen,
-            locaties,
-            landen,
-        ) for transactie in self.transactie_lijst)
+        return maken_tabel(self.transacties.kolommen())
+    
+    def aanvullen_salaris(self) -> int:
+        
+        # de salarisgegevens van alle salarisbetalingen opnieuw afleiden uit de
+        # index met salarisstroken; geeft het aantal gewijzigde transacties
+        aantal  =   0
+        
+        for transactie_uuid in self.transacties.zoeken("derde_uuid", salaris_index.werkgevers()):
+            transactie  =   self.transacties[transactie_uuid]
+            salaris     =   salaris_index.zoeken(transactie.derde_uuid, transactie.datumtijd, transactie.bedrag)
+            
+            if salaris is None or (transactie.details or {}).get("salaris") == salaris:
+                continue
+            
+            transactie.details                  =   transactie.details or {}
+            transactie.details["salaris"]       =   salaris
+            self.transacties[transactie_uuid]   =   transactie
+            aantal                              +=  1
+        
+        return aantal
         
 class Bankrekening(Rekening): 
     
@@ -96,6 +124,16 @@ class Bankrekening(Rekening):
         self.pad            =   pad
         self.rekeningnummer =   rekeningnummer
         self.iban           =   iban
+        
+        self.vingerafdrukken    =   Vingerafdrukken(uuid)
+    
+    def opslaan(
+        self,
+        volledig    :   bool    =   False,
+        ):
+        
+        super().opslaan(volledig)
+        self.vingerafdrukken.opslaan()
     
     @classmethod
     def openen(
@@ -103,7 +141,7 @@ class Bankrekening(Rekening):
         bankrekening_uuid  :   str,
         ):
         
-        eigen_bankrekeningen        =   open_json("gegevens\\configuratie", "bankrekening", "json")
+        eigen_bankrekeningen        =   register["bankrekening"]
         
         bankrekening_dict           =   {}
         
@@ -120,62 +158,129 @@ class Bankrekening(Rekening):
             bankrekening_dict["actief_tot"]         =   dt.datetime.strptime(eigen_bankrekeningen[bankrekening_uuid]["actief_tot"], "%Y-%m-%d").date()
             bankrekening_dict["actief"]             =   False
         
-        bankrekening_dict["transacties"]            =   open_json("gegevens\\rekeningen", bankrekening_uuid, "json", class_mapper = (Transactie, frozenset(("index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "dagindex", "cat_uuid", "uuid", "details", "derde_uuid",)), "van_json"),)
+        bankrekening_dict["transacties"]            =   opslag().blok(bankrekening_uuid)
         
         return cls(**bankrekening_dict)
     
+    def pad_maand(
+        self,
+        jaar : int,
+        maand : int,
+        ) -> str:
+        
+        # de eerste export van die maand in een formaat waarvoor een importeur is
+        for extensie in IMPORTEURS.keys():
+            pad =   f"{self.pad}\\digitaal\\{jaar}-{maand:02}{extensie}"
+            if os.path.exists(pad):
+                return pad
+        return f"{self.pad}\\digitaal\\{jaar}-{maand:02}.xlsx"
+    
     def verwerken_maand(
         self,
         jaar : int,
         maand : int,
+        wachtrij        :   Beoordelingen           =   None,
+        processen       :   int                     =   1,
+        overboekingen   :   InterneOverboekingen    =   None,
+        pool            :   Pool                    =   None,
+        ):
+        
+        self.verwerken_export(self.pad_maand(jaar, maand), wachtrij, processen, overboekingen, pool)
+    
+    def verwerken_export(
+        self,
+        pad             :   str,
+        wachtrij        :   Beoordelingen           =   None,
+        processen       :   int                     =   1,
+        overboekingen   :   InterneOverboekingen    =   None,
+        pool            :   Pool                    =   None,
         ):
         
-        bankexport          =   pd.read_excel(f"{self.pad}\\digitaal\\{jaar}-{maand:02}.xlsx")
-        bankexport.columns  =   [col.casefold() for col in bankexport.columns]
+        # elke bankexport, ook een van meerdere maanden of jaren in één bestand.
+        # met een wachtrij zonder invoer: wat niet automatisch kan worden
+        # aangevuld gaat naar de wachtrij om later te beoordelen, en kunnen de
+        # rijen in meerdere processen worden ontleed (bij invoer niet, omdat een
+        # antwoord de volgende rijen kan veranderen). rijen die al eerder zijn
+        # geïmporteerd worden overgeslagen, zodat een export opnieuw of
+        # overlappend kan worden verwerkt. de index van interne overboekingen
+        # wordt bij voorkeur één keer per sessie meegegeven, anders pas bij de
+        # eerste interne overboeking opgebouwd
+        rijen   =   self.vingerafdrukken.filteren(lezen_bankexport(pad))
+        
+        if wachtrij is not None and (pool is not None or processen != 1):
+            transacties =   ontleden_parallel(rijen, processen, pool = pool)
+        else:
+            transacties =   (Transactie.van_bankexport(rij) for rij in rijen)
+        
+        try:
+            for transactie in transacties:
+                if wachtrij is None:
+                    print(transactie)
+                    print("")
+                    transactie.aanvullen()
+                    transactie.opdracht()
+                if overboekingen is None and transactie.cat_uuid == INTERNE_OVERBOEKING:
+                    overboekingen   =   InterneOverboekingen()
+                self.toevoegen_transactie(transactie, overboekingen)
+                self.vingerafdrukken.toevoegen(self.nieuwe_transacties[-1])
+                if wachtrij is not None:
+                    wachtrij.toevoegen(self.uuid, self.nieuwe_transacties[-1], transactie)
+        finally:
+            cpsp_herkenner.wegschrijven()
+    
+    def aanvullen_vingerafdrukken(
+        self,
+        pad :   str,
+        ) -> int:
         
-        for _, rij in bankexport.iterrows():
-            transactie  =   Transactie.van_bankexport(rij)
-            print(transactie)
-            print("")
-            transactie.aanvullen()
-            transactie.opdracht()
-            self.toevoegen_transactie(transactie)
+        # voor een bankexport die al is verwerkt voordat er vingerafdrukken waren
+        aantal  =   self.vingerafdrukken.aanvullen(lezen_bankexport(pad), self.transacties.kolommen())
+        self.vingerafdrukken.opslaan()
+        
+        return aantal
     
     @property
     def bank(self) -> str:
-        banken  =   open_json("gegevens\\derden", "bank", "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
+        banken  =   register["bank"]
         return banken[self.bank_uuid]
     
     def toevoegen_transactie(
         self,
-        transactie : Transactie,
+        transactie      :   Transactie,
+        overboekingen   :   InterneOverboekingen    =   None,
         ):
         
-        if not transactie.beginsaldo == self.transactie_lijst[-1].eindsaldo:
-            raise ValueError(f"beginsaldo {transactie.beginsaldo} moet gelijk zijn aan eindsaldo laatste transactie {self.transactie_lijst[-1].eindsaldo}")
+        laatste_transactie  =   self.transacties.laatste
+        
+        if laatste_transactie is not None and not transactie.beginsaldo == laatste_transactie.eindsaldo:
+            raise ValueError(f"beginsaldo {transactie.beginsaldo} moet gelijk zijn aan eindsaldo laatste transactie {laatste_transactie.eindsaldo}")
         
         if not transactie.eindsaldo == transactie.beginsaldo + transactie.bedrag:
             raise ValueError(f"eindsaldo {transactie.eindsaldo} is ongelijk aan de som van beginsaldo {transactie.beginsaldo} en bedrag {transactie.bedrag}")
         
         uuid    =   str(uuid4())
         
-        if transactie.cat_uuid    ==   "1e8fd286-4cdd-4836-a1c5-7e815123ea25":
-            bankrekening_ander  =   Bankrekening.openen(transactie.derde_uuid)
-            for ander_transactie_uuid, ander_transactie in bankrekening_ander.transacties.items():
-                if ander_transactie.cat_uuid == "1e8fd286-4cdd-4836-a1c5-7e815123ea25" and transactie.datumtijd == ander_transactie.datumtijd and transactie.bedrag == -ander_transactie.bedrag and ander_transactie_uuid not in self.transacties.keys():
-                    uuid    =   ander_transactie_uuid
+        if transactie.cat_uuid    ==   INTERNE_OVERBOEKING:
+            # zonder index van de sessie enkel de tegenrekening indexeren
+            if overboekingen is None:
+                overboekingen   =   InterneOverboekingen([transactie.derde_uuid])
+            ander_transactie_uuid   =   overboekingen.zoeken(self.uuid, transactie)
+            if ander_transactie_uuid is not None and ander_transactie_uuid not in self.transacties:
+                uuid    =   ander_transactie_uuid
+            overboekingen.toevoegen(self.uuid, uuid, transactie)
         
-        transactie.index    =   len(self.transactie_lijst)
-        transactie.dagindex =   len([_transactie for _transactie in self.transactie_lijst if _transactie.datumtijd.date() == transactie.datumtijd.date()])
+        transactie.index    =   self.transacties.volgende_index
+        transactie.dagindex =   self.transacties.aantal_op(transactie.datumtijd.date())
         
         self.transacties[uuid]  =   transactie
+        self.nieuwe_transacties.append(uuid)
         return self
     
     def salaris(
         self
         ) -> pd.DataFrame:
         
-        categorieen = open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
+        categorieen = register["categorie"]
         
         return pd.DataFrame(
             [
@@ -223,7 +328,7 @@ class Lening(Rekening):
         lening_uuid      :   str,
         ):
         
-        leningen    =   open_json("gegevens\\configuratie", "lening", "json")
+        leningen    =   register["lening"]
         
         lening_dict =   {}
         
@@ -235,6 +340,6 @@ class Lening(Rekening):
             lening_dict["actief_tot"]   =   dt.datetime.strptime(leningen[lening_uuid]["actief_tot"], "%Y-%m-%d").date()
             lening_dict["actief"]       =   False
         
-        lening_dict["transacties"]      =   open_json("gegevens\\rekeningen", lening_uuid, "json", class_mapper = (Transactie, frozenset(("index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "dagindex", "cat_uuid", "uuid", "details", "derde_uuid",)), "van_json"),)
+        lening_dict["transacties"]      =   opslag().blok(lening_uuid)
         
         return cls(**lening_dict)
\ No newline at end of file
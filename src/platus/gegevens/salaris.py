@@ -0,0 +1,91 @@
+import datetime as dt
+import os
+import re
+from typing import Any, Dict, Mapping, NamedTuple
+
+from grienetsiis import open_json
+from .register import register
+
+
+PATROON_SALARISSTROOK   =   re.compile(r"^(?P<maand>\d{4}-\d{2})\.json$")
+
+class Salarisstrook(NamedTuple):
+    
+    netto   :   int
+    salaris :   Dict[str, int]
+
+def categoriseren_salarisstrook(
+    salarisstrook   :   Mapping[str, Any],
+    salaris         :   Mapping[str, Any],
+    ) -> Salarisstrook:
+    
+    # de bedragen van een salarisstrook per categorie, op dezelfde manier als
+    # voorheen per transactie: een regel telt mee voor elke categorie waarvan
+    # een trefwoord in de omschrijving van de regel staat
+    bedragen    =   {}
+    
+    for soort, regels, teken in (("inkomen", "earningsData", 1), ("uitgave", "deductionsData", -1)):
+        for cat_uuid, trefwoorden in salaris[soort].items():
+            for regel in salarisstrook[regels]:
+                if any(trefwoord in regel["codeName"].casefold() for trefwoord in trefwoorden):
+                    bedragen[cat_uuid]  =   bedragen.get(cat_uuid, 0) + teken * int(round(100 * regel["value"]))
+    
+    return Salarisstrook(int(round(100 * salarisstrook["netPay"]["value"])), bedragen)
+
+class SalarisIndex:
+    
+    # de salarisstroken per werkgever, per map één keer ingelezen en per maand
+    # al in categorieën verdeeld, zodat een salarisbetaling zonder schijf-
+    # toegang wordt aangevuld. wordt opnieuw ingelezen als salaris.json wijzigt
+    
+    def __init__(self) -> "SalarisIndex":
+        
+        self.bron       =   None
+        self.stroken    =   {}
+    
+    def actueel(self) -> "SalarisIndex":
+        
+        # het register geeft dezelfde tabel terug zolang die niet is gewijzigd
+        if self.bron is not register["salaris"]:
+            self.bron       =   register["salaris"]
+            self.stroken    =   {}
+        return self
+    
+    def werkgever(
+        self,
+        derde_uuid  :   str,
+        ) -> Dict[str, Salarisstrook]:
+        
+        if derde_uuid not in self.stroken:
+            salaris     =   self.bron[derde_uuid]
+            stroken     =   {}
+            for bestand in os.listdir(salaris["pad"]):
+                resultaat   =   PATROON_SALARISSTROOK.match(bestand)
+                if resultaat is not None:
+                    stroken[resultaat.group("maand")]   =   categoriseren_salarisstrook(open_json(salaris["pad"], resultaat.group("maand"), "json"), salaris)
+            self.stroken[derde_uuid]    =   stroken
+        
+        return self.stroken[derde_uuid]
+    
+    def werkgevers(self) -> frozenset:
+        return frozenset(self.actueel().bron.keys())
+    
+    def zoeken(
+        self,
+        derde_uuid  :   str,
+        datumtijd   :   dt.date,
+        bedrag      :   int,
+        ) -> Dict[str, int] | None:
+        
+        # de bedragen per categorie als het nettoloon van die maand gelijk is aan het bedrag
+        if derde_uuid not in self.actueel().bron:
+            return None
+        
+        salarisstrook   =   self.werkgever(derde_uuid).get(dt.datetime.strftime(datumtijd, "%Y-%m"))
+        
+        if salarisstrook is None or salarisstrook.netto != bedrag:
+            return None
+        
+        return dict(salarisstrook.salaris)
+
+salaris_index   =   SalarisIndex()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import heapq
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# resolutie naar pandas-frequentie; per periode het saldo aan het einde ervan,
+# gelabeld met het einde van de periode
+RESOLUTIES  =   {
+    "gebeurtenis":  None,
+    "dag":          "D",
+    "maand":        "ME",
+    }
+
+def mutaties(
+    tabel   :   pd.DataFrame,
+    groep   :   str,
+    ) -> Iterator[Tuple[int, str, int]]:
+    
+    # per transactie de verandering van het eindsaldo in centen, op volgorde van
+    # datumtijd (ns) en daarbinnen index. het verschil wordt in die volgorde
+    # genomen, zodat het lopende totaal op elk tijdstip gelijk is aan het
+    # eindsaldo van de laatste transactie tot en met dat tijdstip (ook als de
+    # datumtijd niet met de index meeloopt, zoals bij pinbetalingen die later
+    # zijn verwerkt); de eerste mutatie is het eerste eindsaldo, zodat een
+    # rekening vóór de eerste transactie niet meetelt
+    if len(tabel) == 0:
+        return iter(())
+    
+    datumtijd   =   tabel["datumtijd"].to_numpy(dtype = "datetime64[ns]").astype("int64")
+    volgorde    =   np.lexsort((tabel["index"].to_numpy(), datumtijd))
+    eindsaldo   =   np.round(tabel["eindsaldo"].to_numpy(dtype = "float64")[volgorde] * 100).astype("int64")
+    mutatie     =   np.diff(eindsaldo, prepend = 0)
+    
+    return zip(datumtijd[volgorde].tolist(), [groep] * len(volgorde), mutatie.tolist())
+
+def samenvoegen_saldi(
+    groepen     :   Dict[str, Iterable[pd.DataFrame]],
+    resolutie   :   str =   "gebeurtenis",
+    ) -> pd.DataFrame:
+    
+    # de tabellen van alle rekeningen in één k-weg-samenvoeging op datumtijd,
+    # met per groep (bijvoorbeeld bankrekening en lening) een lopend subtotaal
+    # en het totaal in eindsaldo; één rij per tijdstip waarop een saldo verandert
+    if resolutie not in RESOLUTIES.keys():
+        raise ValueError(f"resolutie \"{resolutie}\" onbekend, kies uit {", ".join(RESOLUTIES.keys())}")
+    
+    stromen     =   [mutaties(tabel, groep) for groep, tabellen in groepen.items() for tabel in tabellen]
+    totalen     =   dict.fromkeys(groepen.keys(), 0)
+    tijden      =   []
+    rijen       =   []
+    
+    for tijd, groep, mutatie in heapq.merge(*stromen, key = itemgetter(0)):
+        totalen[groep]  +=  mutatie
+        if len(tijden) > 0 and tijden[-1] == tijd:
+            rijen[-1]   =   list(totalen.values())
+        else:
+            tijden.append(tijd)
+            rijen.append(list(totalen.values()))
+    
+    bedragen            =   np.array(rijen, dtype = "int64").reshape(len(rijen), len(totalen))
+    som                 =   pd.DataFrame(bedragen / 100, columns = list(totalen.keys()))
+    som["eindsaldo"]    =   bedragen.sum(axis = 1) / 100
+    som.insert(0, "datumtijd", pd.to_datetime(np.array(tijden, dtype = "int64").view("datetime64[ns]")))
+    
+    if RESOLUTIES[resolutie] is None or len(som) == 0:
+        return som
+    
+    return som.set_index("datumtijd").resample(RESOLUTIES[resolutie]).last().ffill().reset_index()
\ No newline at end of file
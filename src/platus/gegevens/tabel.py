@@ -0,0 +1,92 @@
+import datetime as dt
+from typing import Dict
+
+import pandas as pd
+
+from .opslag import opslag
+from .register import register
+
+
+KOLOMMEN_TABEL  =   ["index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "hoofdcategorie", "hoofdcategorie_kleur", "categorie", "categorie_kleur", "derde", "type", "locatie", "breedtegraad", "lengtegraad", "land"]
+# de resolutie die pandas kiest voor een kolom met dt.datetime, zoals die uit naar_tabel
+DATUMTIJD       =   pd.Series([dt.datetime(2000, 1, 1)]).dtype
+
+def referentietabellen() -> Dict[str, pd.DataFrame]:
+    
+    # de referentiegegevens als tabellen op uuid, één keer op te bouwen en
+    # daarna te gebruiken voor de tabellen van alle rekeningen
+    derden  =   []
+    for tabel in ("persoon", "bedrijf", "bankrekening", "bank", "cpsp"):
+        for derde_uuid, derde in register[tabel].items():
+            derden.append((derde_uuid, derde["naam"], "bankrekening") if tabel == "bankrekening" else (derde_uuid, derde.naam, derde.type))
+    derden  =   pd.DataFrame(derden, columns = ["uuid", "derde", "type"])
+    
+    hoofdcategorieen    =   pd.DataFrame(
+        [(hoofdcat_uuid, hoofdcategorie.naam, hoofdcategorie.kleur.hex) for hoofdcat_uuid, hoofdcategorie in register["hoofdcategorie"].items()],
+        columns = ["hoofdcat_uuid", "hoofdcategorie", "hoofdcategorie_kleur"],
+        )
+    categorieen         =   pd.DataFrame(
+        [(cat_uuid, categorie.naam, categorie.kleur.hex, categorie.hoofdcat_uuid) for cat_uuid, categorie in register["categorie"].items()],
+        columns = ["uuid", "categorie", "categorie_kleur", "hoofdcat_uuid"],
+        ).merge(hoofdcategorieen, on = "hoofdcat_uuid", how = "left")
+    
+    landen              =   pd.DataFrame(
+        [(land_uuid, land.naam) for land_uuid, land in register["land"].items()],
+        columns = ["land_uuid", "land"],
+        )
+    locaties            =   pd.DataFrame(
+        [(locatie_uuid, locatie.naam, locatie.breedtegraad, locatie.lengtegraad, locatie.land_uuid) for locatie_uuid, locatie in register["locatie"].items()],
+        columns = ["uuid", "locatie", "breedtegraad", "lengtegraad", "land_uuid"],
+        ).merge(landen, on = "land_uuid", how = "left")
+    
+    return {
+        # bij een uuid in meerdere tabellen gaat de eerste voor, in dezelfde
+        # volgorde als Transactie.derde
+        "derde":        derden.drop_duplicates("uuid").set_index("uuid"),
+        "categorie":    categorieen.drop(columns = "hoofdcat_uuid").set_index("uuid"),
+        "locatie":      locaties.drop(columns = "land_uuid").set_index("uuid"),
+        }
+
+def maken_tabel(
+    kolommen    :   pd.DataFrame,
+    referenties :   Dict[str, pd.DataFrame] =   None,
+    ) -> pd.DataFrame:
+    
+    # dezelfde tabel als Transactie.naar_tabel per transactie, maar opgebouwd
+    # uit de opgeslagen kolommen met joins op de referentietabellen
+    referenties =   referentietabellen() if referenties is None else referenties
+    
+    if len(kolommen) == 0:
+        return pd.DataFrame(columns = KOLOMMEN_TABEL)
+    
+    tabel   =   pd.DataFrame({
+        "index":                kolommen["index"].astype("int64"),
+        "bedrag":               kolommen["bedrag"] / 100,
+        "beginsaldo":           kolommen["beginsaldo"] / 100,
+        "eindsaldo":            kolommen["eindsaldo"] / 100,
+        "transactiemethode":    kolommen["transactiemethode"].astype(object),
+        "datumtijd":            kolommen["datumtijd"].astype(DATUMTIJD),
+        "cat_uuid":             kolommen["cat_uuid"].astype(object),
+        "derde_uuid":           kolommen["derde_uuid"].astype(object).where(kolommen["derde_uuid"].notna(), register["transactie"]["derde_onbekend"]),
+        "locatie_uuid":         kolommen["details"].map(lambda details: details.get("locatie_uuid") if isinstance(details, dict) else None).astype(object),
+        })
+    
+    tabel   =   tabel.join(referenties["categorie"], on = "cat_uuid").join(referenties["derde"], on = "derde_uuid").join(referenties["locatie"], on = "locatie_uuid")
+    tabel   =   tabel[KOLOMMEN_TABEL].reset_index(drop = True)
+    
+    # een kolom zonder enige waarde blijft, net als bij naar_tabel, een kolom met None
+    for kolom in ("transactiemethode", "hoofdcategorie", "hoofdcategorie_kleur", "categorie", "categorie_kleur", "derde", "type", "locatie", "breedtegraad", "lengtegraad", "land"):
+        if tabel[kolom].isna().all():
+            tabel[kolom]    =   pd.Series([None] * len(tabel), index = tabel.index, dtype = object)
+        else:
+            tabel[kolom]    =   tabel[kolom].astype(object).where(tabel[kolom].notna(), None).infer_objects()
+    
+    return tabel
+
+def laden_tabel(
+    rekening_uuid   :   str,
+    referenties     :   Dict[str, pd.DataFrame] =   None,
+    ) -> pd.DataFrame:
+    
+    # rechtstreeks uit de opslag, zonder Transactie-objecten op te bouwen
+    return maken_tabel(opslag().kolommen(rekening_uuid), referenties)
\ No newline at end of file
@@ -1,17 +1,26 @@
 import datetime as dt
-import re
-from typing import Dict, Tuple,  Any
+import time
+from typing import Dict, List, NamedTuple, Tuple,  Any
 from uuid import uuid4
 
 import pandas as pd
 
-from grienetsiis import open_json, opslaan_json, invoer_validatie, invoer_kiezen
+from grienetsiis import invoer_validatie, invoer_kiezen
+from .cpsp import cpsp_herkenner
+from .derde import derde_index
 from .gereedschap import iban_zoeker
+from .locatie import locatie_index
+from .omschrijving import PATROON_TIKKIE, ontleder
+from .register import register
+from .salaris import salaris_index
+from .trefwoord import trefwoord_automaat
 from .types import Categorie, HoofdCategorie, Land, Locatie, Persoon, Bedrijf, Derde, Bank, Cpsp
 
 class Transactie:
     
-    config = open_json("gegevens\\configuratie", "transactie", "json")
+    __slots__   =   ("index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "dagindex", "cat_uuid", "derde_uuid", "details", "tijdelijk",)
+    
+    config = register["transactie"]
     
     def __init__(
         self,
@@ -26,9 +35,12 @@ class Transactie:
         dagindex           : int    =   0,
         details            : dict   =   None,
         tijdelijk          : dict   =   None,
+        controleren        : bool   =   True,
         ):
         
-        assert eindsaldo == beginsaldo + bedrag
+        # bij het in bulk inlezen zijn de saldi al voor alle transacties tegelijk gecontroleerd
+        if controleren:
+            assert eindsaldo == beginsaldo + bedrag
         
         self.index              =   index
         self.bedrag             =   bedrag
@@ -101,7 +113,7 @@ class Transactie:
     
     def toon_bedrag(self):
         
-        muntsoorten         =   open_json("gegevens\\configuratie", "muntsoort", "json")
+        muntsoorten         =   register["muntsoort"]
         
         def toon_bedrag_iso(bedrag, valuta_iso):
             
@@ -150,6 +162,60 @@ class Transactie:
             details             =   transactie_dict["details"] if "details" in transactie_dict.keys() else None,
             )
     
+    @classmethod
+    def van_json_bulk(
+        cls,
+        transacties_json    :   Dict[str, dict],
+        ) -> Dict[str, "Transactie"]:
+        
+        # alle transacties van een rekening in één keer: de datumtijden worden
+        # samen geparsed en de saldi samen gecontroleerd, met een melding van
+        # alle afwijkingen in plaats van alleen de eerste
+        if len(transacties_json) == 0:
+            return {}
+        
+        transactie_uuids    =   list(transacties_json.keys())
+        transacties_lijst   =   list(transacties_json.values())
+        
+        cls.controleren_saldi(
+            transactie_uuids,
+            pd.Series([transactie_json["bedrag"] for transactie_json in transacties_lijst], dtype = "int64"),
+            pd.Series([transactie_json["beginsaldo"] for transactie_json in transacties_lijst], dtype = "int64"),
+            pd.Series([transactie_json["eindsaldo"] for transactie_json in transacties_lijst], dtype = "int64"),
+            )
+        
+        datumtijden         =   pd.to_datetime(pd.Index([transactie_json["datumtijd"] for transactie_json in transacties_lijst]), format = "ISO8601").to_pydatetime()
+        
+        return {
+            transactie_uuid: cls(
+                index               =   transactie_json["index"],
+                bedrag              =   transactie_json["bedrag"],
+                beginsaldo          =   transactie_json["beginsaldo"],
+                eindsaldo           =   transactie_json["eindsaldo"],
+                transactiemethode   =   transactie_json["transactiemethode"],
+                datumtijd           =   datumtijd,
+                dagindex            =   transactie_json["dagindex"],
+                cat_uuid            =   transactie_json["cat_uuid"],
+                derde_uuid          =   transactie_json["derde_uuid"],
+                details             =   transactie_json.get("details"),
+                controleren         =   False,
+                ) for transactie_uuid, transactie_json, datumtijd in zip(transactie_uuids, transacties_lijst, datumtijden)
+            }
+    
+    @staticmethod
+    def controleren_saldi(
+        transactie_uuids    :   List[str],
+        bedrag              :   pd.Series,
+        beginsaldo          :   pd.Series,
+        eindsaldo           :   pd.Series,
+        ):
+        
+        afwijkend   =   (eindsaldo.to_numpy() != beginsaldo.to_numpy() + bedrag.to_numpy()).nonzero()[0]
+        
+        if len(afwijkend) > 0:
+            meldingen   =   [f"{transactie_uuids[positie]} ({beginsaldo.iat[positie]} + {bedrag.iat[positie]} != {eindsaldo.iat[positie]})" for positie in afwijkend]
+            raise ValueError(f"eindsaldo is ongelijk aan de som van beginsaldo en bedrag bij {len(afwijkend)} transactie(s): {", ".join(meldingen)}")
+    
     def naar_json(self):
         
         if self.datumtijd.minute == 0 and self.datumtijd.hour == 0:
@@ -196,15 +262,15 @@ class Transactie:
         landen          :   Dict[str, Land]             =   None,
         ) -> Dict[str, Any]:
         
-        personen            =   personen            if personen         is not None else open_json("gegevens\\derden",          "persoon",          "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
-        bedrijven           =   bedrijven           if bedrijven        is not None else open_json("gegevens\\derden",          "bedrijf",          "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
-        bankrekeningen      =   bankrekeningen      if bankrekeningen   is not None else open_json("gegevens\\configuratie",    "bankrekening",     "json")
-        banken              =   banken              if banken           is not None else open_json("gegevens\\derden",          "bank",             "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
-        cpsps               =   cpsps               if cpsps            is not None else open_json("gegevens\\derden",          "cpsp",             "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
-        categorieen         =   categorieen         if categorieen      is not None else open_json("gegevens\\configuratie",    "categorie",        "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
-        hoofdcategorieen    =   hoofdcategorieen    if hoofdcategorieen is not None else open_json("gegevens\\configuratie",    "hoofdcategorie",   "json", class_mapper = (HoofdCategorie, frozenset(("naam", "kleur",)), "van_json"),)
-        locaties            =   locaties            if locaties         is not None else open_json("gegevens\\configuratie",    "locatie",          "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
-        landen              =   landen              if landen           is not None else open_json("gegevens\\configuratie",    "land",             "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
+        personen            =   personen            if personen         is not None else register["persoon"]
+        bedrijven           =   bedrijven           if bedrijven        is not None else register["bedrijf"]
+        bankrekeningen      =   bankrekeningen      if bankrekeningen   is not None else register["bankrekening"]
+        banken              =   banken              if banken           is not None else register["bank"]
+        cpsps               =   cpsps               if cpsps            is not None else register["cpsp"]
+        categorieen         =   categorieen         if categorieen      is not None else register["categorie"]
+        hoofdcategorieen    =   hoofdcategorieen    if hoofdcategorieen is not None else register["hoofdcategorie"]
+        locaties            =   locaties            if locaties         is not None else register["locatie"]
+        landen              =   landen              if landen           is not None else register["land"]
         
         derde = self.derde(
             personen,
@@ -245,7 +311,7 @@ class Transactie:
     @classmethod
     def van_bankexport(
         cls, 
-        rij: pd.core.series.Series,
+        rij: NamedTuple,
         ):
         
         if rij.muntsoort.casefold() != "eur":
@@ -260,17 +326,19 @@ class Transactie:
         details         =   {}
         tijdelijk       =   {}
         
-        if rij.omschrijving.casefold().startswith("rente"):
+        begin           =   time.perf_counter()
+        omschrijving    =   ontleder.ontleden(rij.omschrijving)
+        
+        if omschrijving.formaat == "rente":
             
             transactiemethode   =   "rente"
             cat_uuid            =   cls.config["rente"]["cat_uuid"]
             derde_uuid          =   cls.config["rente"]["derde_uuid"]
             details["betalingsomschrijving"]    =   rij.omschrijving.strip()
         
-        elif rij.omschrijving.casefold().startswith("BEA, Betaalpas".casefold()) or rij.omschrijving.casefold().startswith("GEA, Betaalpas".casefold()):
+        elif omschrijving.formaat == "pinbetaling" or omschrijving.formaat == "geldopname":
             
-            patroon_pinpas      =   re.compile(r"(?i)^(?:B|G)EA, Betaalpas\s+(?P<derde_naam>.*),PAS(?P<pasnummer>\d{3})\s+NR:(?P<terminal>.*),?\s+(?P<datumtijd>\d{2}.\d{2}.\d{2}\/\d{2}(.?:|.)\d{2})\s+(?P<locatie>.*)$")
-            resultaat_pinpas    =   patroon_pinpas.match(rij.omschrijving).groupdict()
+            resultaat_pinpas    =   omschrijving.velden
             
             datumtijd               =   dt.datetime.strptime(resultaat_pinpas.get("datumtijd"), "%d.%m.%y/%H:%M") if ":" in resultaat_pinpas.get("datumtijd") else dt.datetime.strptime(resultaat_pinpas.get("datumtijd"), "%d.%m.%y/%H.%M")
             
@@ -298,7 +366,7 @@ class Transactie:
             
             derde_uuid, cat_uuid    =   cls.verwerken_derde_uuid(naam = resultaat_pinpas.get("derde_naam"))
             
-            if rij.omschrijving.casefold().startswith("BEA, Betaalpas".casefold()):
+            if omschrijving.formaat == "pinbetaling":
                 transactiemethode   =   "pinbetaling" 
             else:
                 transactiemethode   =   "geldopname" 
@@ -306,24 +374,9 @@ class Transactie:
             
             tijdelijk["naam"]       =   resultaat_pinpas.get("derde_naam")
         
-        elif rij.omschrijving.casefold().startswith("SEPA Overboeking".casefold()) or rij.omschrijving.casefold().startswith("/TRTP/SEPA OVERBOEKING/".casefold()):
+        elif omschrijving.formaat == "overboeking":
             
-            if rij.omschrijving.startswith("SEPA Overboeking"):
-                if "Betalingskenm.:" in rij.omschrijving or "Kenmerk:" in rij.omschrijving:
-                    if "Betalingskenm.:" in rij.omschrijving:
-                        patroon_overboeking =   re.compile(r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Betalingskenm.:\s(?P<betalingskenmerk>.*)$")
-                    else:
-                        patroon_overboeking =   re.compile(r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*Kenmerk:\s(?P<betalingskenmerk>.*)$")
-                elif "Omschrijving:" in rij.omschrijving:
-                    patroon_overboeking     =   re.compile(r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)$")
-                else:
-                    patroon_overboeking     =   re.compile(r"(?i)^SEPA Overboeking\s*IBAN:\s(?P<iban>\S*)\s*BIC:\s(?P<bic>\S*)\s*Naam:\s(?P<naam>.*)$")
-            else:
-                if "/REMI/" in rij.omschrijving:
-                    patroon_overboeking     =   re.compile(r"(?i)^\/TRTP\/SEPA OVERBOEKING\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/EREF\/(?P<betalingskenmerk>.*)$")
-                else:
-                    patroon_overboeking     =   re.compile(r"(?i)^\/TRTP\/SEPA OVERBOEKING\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/EREF\/(?P<betalingskenmerk>.*)$")
-            resultaat_overboeking   =   patroon_overboeking.match(rij.omschrijving).groupdict()
+            resultaat_overboeking   =   omschrijving.velden
             
             iban                    =   resultaat_overboeking.get("iban").strip()
             bic                     =   resultaat_overboeking.get("bic").strip()
@@ -341,8 +394,7 @@ class Transactie:
                 bank_uuid               =   cls.config["betaalverzoek"]["ontvangen"]["bank_uuid"]
                 details["bank_uuid"]    =   bank_uuid
                 
-                patroon_tikkie          =   re.compile(r"(?i)^Tikkie ID (?:[0-9 ]+), ?(?P<betalingsomschrijving_tikkie>.+), ?Van ?(?P<derde_naam>[\w\s\.]+),? ?(?P<derde_iban>.*)?$")
-                resultaat_tikkie        =   patroon_tikkie.match(betalingsomschrijving).groupdict()
+                resultaat_tikkie        =   PATROON_TIKKIE.match(betalingsomschrijving).groupdict()
                 
                 derde_naam              =   resultaat_tikkie.get("derde_naam")
                 derde_iban              =   iban_zoeker(resultaat_tikkie.get("derde_iban"))
@@ -351,11 +403,12 @@ class Transactie:
                 
                 details["betalingsomschrijving"]    =   resultaat_tikkie.get("betalingsomschrijving_tikkie")
                 
-                banken   =   open_json("gegevens\\derden", "bank", "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
+                banken   =   register["bank"]
                 
                 if iban not in banken[bank_uuid].iban:
+                    banken  =   register.bewerken("bank", [bank_uuid])
                     banken[bank_uuid].iban.append(iban)
-                    opslaan_json(banken, "gegevens\\derden", "bank", "json", {"Bank": "naar_json"})
+                    register.opslaan("bank", banken)
                 
             else:
                 transactiemethode       =   "overboeking"
@@ -378,14 +431,9 @@ class Transactie:
             tijdelijk["naam"]   =   naam
             tijdelijk["bic"]    =   bic
         
-        elif rij.omschrijving.casefold().startswith("SEPA iDEAL".casefold()) or rij.omschrijving.casefold().startswith("/TRTP/iDEAL/".casefold()):
+        elif omschrijving.formaat == "ideal":
             
-            if rij.omschrijving.casefold().startswith("SEPA iDEAL".casefold()):
-                patroon_ideal   =   re.compile(r"(?i)^SEPA iDEAL\s*IBAN:\s(?P<iban>.*)\s*BIC:\s(?P<bic>.*)\s*Naam:\s(?P<naam>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*Kenmerk:\s(?P<datumtijd>\d{2}-\d{2}-\d{4} \d{2}:\d{2})\s(?P<betalingskenmerk>.*)$")
-            else:
-                patroon_ideal   =   re.compile(r"(?i)^\/TRTP\/iDEAL\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/NAME\/(?P<naam>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/EREF\/(?P<datumtijd>\d{2}-\d{2}-\d{4} \d{2}:\d{2}) (?P<betalingskenmerk>.*)$")
-            
-            resultaat_ideal     =   patroon_ideal.match(rij.omschrijving).groupdict()
+            resultaat_ideal     =   omschrijving.velden
             
             iban                    =   resultaat_ideal.get("iban").strip()
             bic                     =   resultaat_ideal.get("bic").strip()
@@ -429,20 +477,11 @@ class Transactie:
             tijdelijk["naam"]   =   naam
             tijdelijk["bic"]    =   bic
         
-        elif "SEPA Incasso algemeen doorlopend".casefold() in rij.omschrijving.casefold():
+        elif omschrijving.formaat == "incasso":
             
             transactiemethode       =   "incasso"
             
-            if rij.omschrijving.casefold().startswith("/trtp/".casefold()):
-                patroon_incasso     =   re.compile(r"(?i)^\/TRTP\/SEPA Incasso algemeen doorlopend\/CSID\/(?P<incassant>.*)\/NAME\/(?P<naam>.*)\/MARF\/(?P<machtiging>.*)\/REMI\/(?P<betalingsomschrijving>.*)\/IBAN\/(?P<iban>.*)\/BIC\/(?P<bic>.*)\/EREF\/(?P<betalingskenmerk>.*)$")
-            else:
-                if "Kenmerk:".casefold() in rij.omschrijving.casefold():
-                    patroon_incasso     =   re.compile(r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*IBAN:\s(?P<iban>.*)\s*Kenmerk:\s(?P<betalingskenmerk>.*)$")
-                elif "IBAN:".casefold() in rij.omschrijving.casefold():
-                    patroon_incasso     =   re.compile(r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)\s*IBAN:\s(?P<iban>.*)$")
-                else:
-                    patroon_incasso     =   re.compile(r"(?i)^SEPA Incasso algemeen doorlopend\s*Incassant:\s(?P<incassant>.*)\s*Naam:\s(?P<naam>.*)\s*Machtiging:\s(?P<machtiging>.*)\s*Omschrijving:\s(?P<betalingsomschrijving>.*)$")
-            resultaat_incasso       =   patroon_incasso.match(rij.omschrijving).groupdict()
+            resultaat_incasso       =   omschrijving.velden
             
             incassant               =   resultaat_incasso.get("incassant").strip()
             naam                    =   resultaat_incasso.get("naam").strip()
@@ -470,7 +509,7 @@ class Transactie:
             tijdelijk["naam"]   =   naam
             tijdelijk["bic"]    =   bic
         
-        elif rij.omschrijving.casefold().startswith("ABN AMRO".casefold()):
+        elif omschrijving.formaat == "bankkosten":
             
             transactiemethode   =   "bankkosten"
             
@@ -479,12 +518,13 @@ class Transactie:
             details["betalingsomschrijving"]    =   rij.omschrijving
         
         else:
-            print(rij.omschrijving)
-            raise NotImplementedError
+            raise NotImplementedError(f"geen verwerking voor formaat \"{omschrijving.formaat}\"")
         
         if cat_uuid is None and "betalingsomschrijving" in details.keys():
             cat_uuid = cls.verwerken_cat_uuid(details.get("betalingsomschrijving"))
         
+        ontleder.meten(omschrijving.formaat, time.perf_counter() - begin)
+        
         return cls(
             bedrag               =   bedrag,
             beginsaldo           =   beginsaldo,
@@ -503,39 +543,8 @@ class Transactie:
         naam: str = "",
         ) -> Tuple[str | None, str | None]:
         
-        personen                =   open_json("gegevens\\derden", "persoon",        "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
-        bedrijven               =   open_json("gegevens\\derden", "bedrijf",        "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
-        bankrekeningen          =   open_json("gegevens\\configuratie", "bankrekening",   "json")
-        
-        if iban != "":
-            for uuid_bankrekening, bankrekening in bankrekeningen.items():
-                if iban == bankrekening.get("iban", "dummy"):
-                    derde_uuid  =   uuid_bankrekening
-                    cat_uuid    =   Transactie.config["interne overboeking"]["cat_uuid"]
-                    return derde_uuid, cat_uuid
-            
-            for uuid_persoon, persoon in personen.items():
-                if iban in getattr(persoon, "iban", "dummy"):
-                    derde_uuid  =   uuid_persoon
-                    return derde_uuid, None
-            
-            for uuid_bedrijf, bedrijf in bedrijven.items():
-                if iban in getattr(bedrijf, "iban", "dummy"):
-                    derde_uuid  =   uuid_bedrijf
-                    cat_uuid    =   getattr(bedrijf, "cat_uuid", None)
-                    return derde_uuid, cat_uuid
-        
-        if naam != "":
-            for uuid_bedrijf, bedrijf in bedrijven.items():
-                if naam.casefold() == getattr(bedrijf, "naam").casefold() or any([naam.casefold() == synoniem for synoniem in getattr(bedrijf, "synoniemen")]):
-                    derde_uuid  =   uuid_bedrijf
-                    cat_uuid    =   getattr(bedrijf, "cat_uuid", None)
-                    return derde_uuid, cat_uuid
-        
-        else:
-            ...
-        
-        return None, None
+        # via de index van derden in plaats van lussen over alle personen en bedrijven
+        return derde_index.zoeken(iban = iban, naam = naam)
     
     @staticmethod
     def verwerken_cpsp_uuid(
@@ -543,15 +552,8 @@ class Transactie:
         iban: str,
         ) -> str | None:
         
-        cpsps   =   open_json("gegevens\\derden", "cpsp", "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
-        
-        for cpsp_uuid, cpsp in cpsps.items():
-            if cpsp.naam.casefold() in naam.casefold() or any([cpsp_synoniem.casefold() in naam.casefold() for cpsp_synoniem in cpsp.synoniemen]) or any([cpsp_iban == iban for cpsp_iban in cpsp.iban]):
-                if iban not in cpsp.iban:
-                    cpsps[cpsp_uuid].iban.append(iban)
-                    opslaan_json(cpsps, "gegevens\\derden", "cpsp", "json", {"Cpsp": "naar_json"})
-                return cpsp_uuid
-        return None
+        # nieuw geleerde IBAN's worden pas aan het einde van de verwerking opgeslagen
+        return cpsp_herkenner.herkennen(naam, iban)
     
     @staticmethod
     def verwerken_bank_uuid(
@@ -561,7 +563,7 @@ class Transactie:
         bank_iban: str,
         ) -> Tuple[str, str ,str ,str]:
         
-        banken   =   open_json("gegevens\\derden", "bank", "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
+        banken   =   register["bank"]
         
         if "asn" in naam.casefold():
             
@@ -601,8 +603,9 @@ class Transactie:
             betalingsomschrijving   =   betalingsomschrijving.split(f"{betalingskenmerk}")[1].split("ING")[0].strip()
         
         if bank_iban not in banken[bank_uuid].iban:
+            banken  =   register.bewerken("bank", [bank_uuid])
             banken[bank_uuid].iban.append(bank_iban)
-            opslaan_json(banken, "gegevens\\derden", "bank", "json", {"Bank": "naar_json"})
+            register.opslaan("bank", banken)
         
         return bank_uuid, derde_iban, derde_naam, betalingsomschrijving
     
@@ -612,15 +615,8 @@ class Transactie:
         land_oud: str,
         ) -> str:
         
-        locaties    =   open_json("gegevens\\configuratie", "locatie", "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
-        landen      =   open_json("gegevens\\configuratie", "land",    "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
-        
-        locaties_mogelijk = []
-        
-        for locatie_uuid, locatie in locaties.items():
-            if any(locatie_oud.casefold() == synoniem for synoniem in locatie.synoniemen) or locatie_oud.casefold() == locatie.naam.casefold():
-                if any(land_oud.casefold() == synoniem for synoniem in landen[locatie.land_uuid].synoniemen) or land_oud.casefold() == landen[locatie.land_uuid].naam.casefold():
-                    locaties_mogelijk.append(locatie_uuid)
+        locaties            =   register["locatie"]
+        locaties_mogelijk   =   locatie_index.zoeken(locatie_oud, land_oud)
         
         if len(locaties_mogelijk) == 1:
             return locaties_mogelijk[0]
@@ -635,13 +631,8 @@ class Transactie:
         betalingsomschrijving: str,
         ) -> str:
         
-        categorieen     =   open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
-        
-        for cat_uuid, categorie in categorieen.items():
-            for trefwoord in getattr(categorie, "trefwoorden"):
-                if trefwoord in betalingsomschrijving.casefold():
-                    return cat_uuid
-        return None        
+        # alle trefwoorden in één doorgang; het langste trefwoord gaat voor
+        return trefwoord_automaat.categoriseren(betalingsomschrijving)
     
     @staticmethod
     def verwerken_salaris(
@@ -651,30 +642,11 @@ class Transactie:
         bedrag: int,
         ) -> Dict[str, int]:
         
-        salaris_json    =   open_json("gegevens\\configuratie", "salaris", "json")
+        # uit de index met alle salarisstroken van de werkgever, één keer ingelezen
+        salaris     =   salaris_index.zoeken(derde_uuid, datumtijd, bedrag)
         
-        if derde_uuid in salaris_json.keys():
-            
-            salaris         =   salaris_json[derde_uuid]
-            salarisstrook   =   open_json(f"{salaris["pad"]}", dt.datetime.strftime(datumtijd, "%Y-%m"), "json")
-            
-            if int(round(100 * salarisstrook["netPay"]["value"])) == bedrag:
-                
-                details["salaris"]  =   {}
-                
-                for cat_uuid, trefwoorden in salaris["inkomen"].items():
-                    for salarisstrook_dict in salarisstrook["earningsData"]:
-                        if any([trefwoord in salarisstrook_dict["codeName"].casefold() for trefwoord in trefwoorden]):
-                            if cat_uuid not in details["salaris"].keys():
-                                details["salaris"][cat_uuid] = 0
-                            details["salaris"][cat_uuid] += int(round(100 * salarisstrook_dict["value"]))
-                
-                for cat_uuid, trefwoorden in salaris["uitgave"].items():
-                    for salarisstrook_dict in salarisstrook["deductionsData"]:
-                        if any([trefwoord in salarisstrook_dict["codeName"].casefold() for trefwoord in trefwoorden]):
-                            if cat_uuid not in details["salaris"].keys():
-                                details["salaris"][cat_uuid] = 0
-                            details["salaris"][cat_uuid] -= int(round(100 * salarisstrook_dict["value"]))
+        if salaris is not None:
+            details["salaris"]  =   salaris
         
         return details
     
@@ -700,12 +672,12 @@ class Transactie:
             
             elif opdracht.get("opdracht") == "velden":
                 print(f"\n\t{"INDEX":<6}{"VELD":<35}WAARDE")
-                for iveld, (veld, waarde) in enumerate(self.__dict__.items()):
+                for iveld, (veld, waarde) in enumerate((veld, getattr(self, veld)) for veld in self.__slots__):
                     if isinstance(waarde, dict):
                         print(f"\t{iveld:<6}{veld:<35}")
                         for subveld, subwaarde in waarde.items():
                             if isinstance(subwaarde, dict):
-                                categorieen     =   open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
+                                categorieen     =   register["categorie"]
                                 print(f"\t       -> {subveld:<31}")
                                 for cat_uuid, bedrag in subwaarde.items():
                                     categorie   =   categorieen[cat_uuid]
@@ -742,15 +714,15 @@ class Transactie:
                 invoer_trefwoord   =   opdracht.get("veld", "")
                 
                 if invoer_trefwoord != "":
-                    categorieen         =   open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
+                    categorieen         =   register.bewerken("categorie")
                     
-                    if any([invoer_trefwoord.casefold() == trefwoord for categorie in categorieen.values() for trefwoord in getattr(categorie, "trefwoorden")]):
-                        categorie   =   next(categorie for cat_uuid, categorie in categorieen.items() for trefwoord in getattr(categorie, "trefwoorden") if invoer_trefwoord.casefold() == trefwoord)
+                    if invoer_trefwoord.casefold() in trefwoord_automaat.actueel().prioriteit:
+                        categorie   =   categorieen[trefwoord_automaat.prioriteit[invoer_trefwoord.casefold()][1]]
                         print(f"het trefwoord \"{invoer_trefwoord.casefold()}\" komt reeds voor bij categorie \"{categorie.naam}\"")
                         continue
                     else:
                         categorieen[self.cat_uuid].trefwoorden.append(invoer_trefwoord.casefold())
-                        opslaan_json(categorieen, "gegevens\\configuratie", "categorie", "json", {"Categorie": "naar_json"})
+                        register.opslaan("categorie", categorieen)
                         print(f"het trefwoord \"{invoer_trefwoord.casefold()}\" is toegevoegd aan de categorie \"{self.categorie().naam} ({self.hoofdcategorie().naam})\"")
                         continue
                 else:
@@ -828,13 +800,14 @@ class Transactie:
                             else:
                                 bedrijf     =   Bedrijf(naam)
                         
-                        bedrijven       =   open_json("gegevens\\derden", "bedrijf", "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
+                        bedrijven       =   register.bewerken("bedrijf")
                         bedrijven[uuid] =   bedrijf
                         self.derde_uuid =   uuid
-                        opslaan_json(bedrijven, "gegevens\\derden", "bedrijf", "json", {"Bedrijf": "naar_json"})
+                        register.opslaan("bedrijf", bedrijven)
+                        derde_index.bijwerken("bedrijf", uuid)
                         break
                     else:
-                        persoonsgroepen =   open_json("gegevens\\configuratie", "persoonsgroep", "json")
+                        persoonsgroepen =   register["persoonsgroep"]
                         persoonsgroep   =   invoer_kiezen("persoonsgroep", persoonsgroepen)
                         
                         if "derde_iban" in self.tijdelijk.keys():
@@ -842,10 +815,11 @@ class Transactie:
                         else:
                             persoon     =   Persoon(naam, persoonsgroep)
                         
-                        personen        =   open_json("gegevens\\derden", "persoon", "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
+                        personen        =   register.bewerken("persoon")
                         personen[uuid]  =   persoon
                         self.derde_uuid =   uuid
-                        opslaan_json(personen, "gegevens\\derden", "persoon", "json", {"Persoon": "naar_json"})
+                        register.opslaan("persoon", personen)
+                        derde_index.bijwerken("persoon", uuid)
                         break
                 
                 elif opdracht.get("opdracht") == "zoek":
@@ -854,7 +828,7 @@ class Transactie:
                         continue
                     
                     if derde_type == "bedrijf":
-                        bedrijven       =   open_json("gegevens\\derden", "bedrijf", "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
+                        bedrijven       =   register.bewerken("bedrijf")
                         bedrijven_match_uuid    =   []
                         for bedrijf_uuid, bedrijf in bedrijven.items():
                             if opdracht.get("zoekterm").casefold() in bedrijf.naam.casefold():
@@ -878,11 +852,12 @@ class Transactie:
                         if bedrijven[uuid].cat_uuid is not None:
                             self.cat_uuid = bedrijven[uuid].cat_uuid
                             print(f"categorie veranderd naar \"{self.categorie().naam} ({self.hoofdcategorie().naam})\"")
-                        opslaan_json(bedrijven, "gegevens\\derden", "bedrijf", "json", {"Bedrijf": "naar_json"})
+                        register.opslaan("bedrijf", bedrijven)
+                        derde_index.bijwerken("bedrijf", uuid)
                         break
                         
                     else:
-                        personen    =   open_json("gegevens\\derden", "persoon", "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
+                        personen    =   register.bewerken("persoon")
                         personen_match_uuid    =   []
                         for persoon_uuid, persoon in personen.items():
                             if opdracht.get("zoekterm").casefold() in persoon.naam.casefold():
@@ -899,7 +874,8 @@ class Transactie:
                         print(f"derde veranderd naar \"{personen[uuid].naam}\"")
                         if "derde_iban" in self.tijdelijk.keys():
                             personen[uuid].iban.append(self.tijdelijk.get("derde_iban"))
-                        opslaan_json(personen, "gegevens\\derden", "persoon", "json", {"Persoon": "naar_json"})
+                        register.opslaan("persoon", personen)
+                        derde_index.bijwerken("persoon", uuid)
                         break
                 else:
                     raise Exception
@@ -914,7 +890,7 @@ class Transactie:
                 if zoekterm == "":
                     continue
                 
-                cpsps   =   open_json("gegevens\\derden", "cpsp", "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
+                cpsps   =   register.bewerken("cpsp")
                 cpsps_match_uuid    =   []
                 for cpsp_uuid, cpsp in cpsps.items():
                     if zoekterm.casefold() in cpsp.naam.casefold():
@@ -933,13 +909,13 @@ class Transactie:
                     cpsps[cpsp_uuid].synoniemen.append(self.tijdelijk.get("naam").casefold())
                 if "medium_iban" in self.tijdelijk.keys():
                     cpsps[cpsp_uuid].iban.append(self.tijdelijk.get("medium_iban"))
-                opslaan_json(cpsps, "gegevens\\derden", "cpsp", "json", {"Cpsp": "naar_json"})
+                register.opslaan("cpsp", cpsps)
                 break
         
         elif veld == "cat_uuid":
             
-            categorieen         =   open_json("gegevens\\configuratie", "categorie",      "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
-            hoofdcategorieen    =   open_json("gegevens\\configuratie", "hoofdcategorie", "json", class_mapper = (HoofdCategorie, frozenset(("naam", "kleur",)), "van_json"),)
+            categorieen         =   register["categorie"]
+            hoofdcategorieen    =   register["hoofdcategorie"]
             
             while True:
                 
@@ -952,7 +928,7 @@ class Transactie:
             print(f"categorie \"{categorieen[cat_uuid].naam}\" gekozen")
             self.cat_uuid       =   cat_uuid
             
-            bedrijven       =   open_json("gegevens\\derden", "bedrijf", "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
+            bedrijven       =   register.bewerken("bedrijf")
             if self.derde_uuid in bedrijven.keys():
                 if not bedrijven[self.derde_uuid].uitsluiten and bedrijven[self.derde_uuid].cat_uuid is None:
                     print(f"toevoegen categorie \"{self.categorie().naam} ({self.hoofdcategorie().naam})\" aan bedrijf \"{bedrijven[self.derde_uuid].naam}\"?")
@@ -961,7 +937,7 @@ class Transactie:
                         bedrijven[self.derde_uuid].cat_uuid     =   cat_uuid
                     elif toevoegen == "uitsluiten":
                         bedrijven[self.derde_uuid].uitsluiten   =   True
-                    opslaan_json(bedrijven, "gegevens\\derden", "bedrijf", "json", {"Bedrijf": "naar_json"})
+                    register.opslaan("bedrijf", bedrijven)
         
         elif veld == "opmerking":
             
@@ -972,8 +948,8 @@ class Transactie:
             
             if "locatie_uuid" in self.details.keys():
                 
-                locaties    =   open_json("gegevens\\configuratie", "locatie", "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
-                landen      =   open_json("gegevens\\configuratie", "land",    "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
+                locaties    =   register.bewerken("locatie")
+                landen      =   register.bewerken("land")
                 
                 if self.details.get("locatie_uuid") is None:
                         print(f"geen automatische locatie toegekend voor locatie \"{self.tijdelijk["locatie_oud"]}\", land \"{self.tijdelijk["land_oud"]}\"")
@@ -1022,7 +998,8 @@ class Transactie:
                                     print(f"land veranderd naar \"{landen[land_uuid].naam}\"")
                                     
                                     landen[land_uuid].synoniemen.append(self.tijdelijk["land_oud"].casefold())
-                                    opslaan_json(landen, "gegevens\\configuratie", "land", "json", {"Land": "naar_json"})
+                                    register.opslaan("land", landen)
+                                    locatie_index.bijwerken("land", land_uuid)
                                     break
                         
                         breedtegraad    =   invoer_validatie("breedtegraad", float, valideren = True)
@@ -1048,7 +1025,8 @@ class Transactie:
                         self.details["locatie_uuid"]    =   locatie_uuid
                         
                         locaties[locatie_uuid] = locatie
-                        opslaan_json(locaties, "gegevens\\configuratie", "locatie", "json", {"Locatie": "naar_json"})
+                        register.opslaan("locatie", locaties)
+                        locatie_index.bijwerken("locatie", locatie_uuid)
                         break
                     
                     elif opdracht.get("opdracht") == "zoek":
@@ -1082,8 +1060,10 @@ class Transactie:
                         if self.tijdelijk["land_oud"].casefold() != landen[locaties[locatie_uuid].land_uuid].naam.casefold() and self.tijdelijk["land_oud"].casefold() not in landen[locaties[locatie_uuid].land_uuid].synoniemen:
                             landen[locaties[locatie_uuid].land_uuid].synoniemen.append(self.tijdelijk["land_oud"].casefold())
                         
-                        opslaan_json(locaties, "gegevens\\configuratie", "locatie", "json", {"Locatie": "naar_json"})
-                        opslaan_json(landen, "gegevens\\configuratie", "land", "json", {"Land": "naar_json"})
+                        register.opslaan("locatie", locaties)
+                        register.opslaan("land", landen)
+                        locatie_index.bijwerken("locatie", locatie_uuid)
+                        locatie_index.bijwerken("land", locaties[locatie_uuid].land_uuid)
                         break
             
             else:
@@ -1096,7 +1076,7 @@ class Transactie:
         categorieen     :   Dict[str, Categorie]        = None,
         ) -> Categorie:
         
-        categorieen         =   categorieen         if categorieen      is not None else open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
+        categorieen         =   categorieen         if categorieen      is not None else register["categorie"]
         return categorieen.get(self.cat_uuid)
     
     def hoofdcategorie(
@@ -1105,8 +1085,8 @@ class Transactie:
         hoofdcategorieen:   Dict[str, HoofdCategorie]   = None,
         ) -> HoofdCategorie:
         
-        categorieen         =   categorieen         if categorieen      is not None else open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
-        hoofdcategorieen    =   hoofdcategorieen    if hoofdcategorieen is not None else open_json("gegevens\\configuratie", "hoofdcategorie", "json", class_mapper = (HoofdCategorie, frozenset(("naam", "kleur",)), "van_json"),)
+        categorieen         =   categorieen         if categorieen      is not None else register["categorie"]
+        hoofdcategorieen    =   hoofdcategorieen    if hoofdcategorieen is not None else register["hoofdcategorie"]
         return hoofdcategorieen.get(self.categorie(categorieen).hoofdcat_uuid)
     
     def locatie(
@@ -1114,7 +1094,7 @@ class Transactie:
         locaties:   Dict[str, Locatie]  = None,
         ) -> Locatie:
         
-        locaties    =   locaties if locaties is not None else open_json("gegevens\\configuratie", "locatie", "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
+        locaties    =   locaties if locaties is not None else register["locatie"]
         
         return locaties.get(self.details["locatie_uuid"]) if self.details.get("locatie_uuid", None) is not None else None
     
@@ -1124,8 +1104,8 @@ class Transactie:
         landen  :   Dict[str, Land]     = None,
         ) -> Land:
         
-        locaties    =   locaties if locaties is not None else open_json("gegevens\\configuratie", "locatie", "json", class_mapper = (Locatie, frozenset(("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen")), "van_json"),)
-        landen      =   landen   if landen   is not None else open_json("gegevens\\configuratie", "land",    "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
+        locaties    =   locaties if locaties is not None else register["locatie"]
+        landen      =   landen   if landen   is not None else register["land"]
         
         return landen[locaties.get(self.details["locatie_uuid"]).land_uuid] if self.details.get("locatie_uuid", None) is not None else None
     
@@ -1138,11 +1118,11 @@ class Transactie:
         cpsps           :   Dict[str, Cpsp]             =   None,
         ) -> Persoon | Bedrijf | Dict | Bank | Cpsp:
         
-        personen            =   personen            if personen         is not None else open_json("gegevens\\derden",          "persoon",      "json", class_mapper = (Persoon, frozenset(("naam", "iban", "rekeningnummer", "giro", "groep",)), "van_json"),)
-        bedrijven           =   bedrijven           if bedrijven        is not None else open_json("gegevens\\derden",          "bedrijf",      "json", class_mapper = (Bedrijf, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten", "cat_uuid",)), "van_json"),)
-        bankrekeningen      =   bankrekeningen      if bankrekeningen   is not None else open_json("gegevens\\configuratie",    "bankrekening", "json")
-        banken              =   banken              if banken           is not None else open_json("gegevens\\derden",          "bank",         "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
-        cpsps               =   cpsps               if cpsps            is not None else open_json("gegevens\\derden",          "cpsp",         "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
+        personen            =   personen            if personen         is not None else register["persoon"]
+        bedrijven           =   bedrijven           if bedrijven        is not None else register["bedrijf"]
+        bankrekeningen      =   bankrekeningen      if bankrekeningen   is not None else register["bankrekening"]
+        banken              =   banken              if banken           is not None else register["bank"]
+        cpsps               =   cpsps               if cpsps            is not None else register["cpsp"]
         
         if self.derde_uuid is None:
             return bedrijven[self.config["derde_onbekend"]]
@@ -1161,14 +1141,14 @@ class Transactie:
     def medium(self) -> Cpsp:
         
         if "cpsp_uuid" in self.details.keys():
-            cpsps = open_json("gegevens\\derden", "cpsp", "json", class_mapper = (Cpsp, frozenset(("naam", "iban", "rekeningnummer", "giro", "synoniemen", "uitsluiten",)), "van_json"),)
+            cpsps = register["cpsp"]
             return cpsps[self.details.get("cpsp_uuid")]
         return None
     
     def bank(self) -> Bank:
         
         if "bank_uuid" in self.details.keys():
-            banken = open_json("gegevens\\derden", "bank", "json", class_mapper = (Bank, frozenset(("naam", "iban", "rekeningnummer", "synoniemen", "bic",)), "van_json"),)
+            banken = register["bank"]
             return banken[self.details.get("bank_uuid")]
         return None
     
@@ -1179,7 +1159,7 @@ class Transactie:
         
         if "salaris" in self.details.keys():
             
-            categorieen = categorieen if categorieen is not None else open_json("gegevens\\configuratie", "categorie", "json", class_mapper = (Categorie, frozenset(("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)), "van_json"),)
+            categorieen = categorieen if categorieen is not None else register["categorie"]
             
             salaris_dict = {
                 "datumtijd": [],
@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Any, Iterable, List, Tuple
+
+import pandas as pd
+
+from .register import register
+
+
+class Automaat:
+    
+    # Aho-Corasick-automaat over een vaste verzameling trefwoorden, zodat een
+    # tekst in één doorgang tegen alle trefwoorden tegelijk wordt gezocht. elk
+    # trefwoord heeft een waarde en een prioriteit (de volgorde van opbouwen);
+    # bij een dubbel trefwoord blijft het eerste staan
+    
+    def __init__(self) -> "Automaat":
+        
+        self.overgangen =   [{}]
+        self.terugval   =   [0]
+        self.uitvoer    =   [[]]
+        self.prioriteit =   {}
+    
+    def opbouwen(
+        self,
+        trefwoorden :   Iterable[Tuple[str, Any]],
+        ) -> "Automaat":
+        
+        # trefwoorden: (trefwoord, waarde) op volgorde van prioriteit
+        self.overgangen =   [{}]
+        self.terugval   =   [0]
+        self.uitvoer    =   [[]]
+        self.prioriteit =   {}
+        
+        for trefwoord, waarde in trefwoorden:
+            if trefwoord == "" or trefwoord in self.prioriteit:
+                continue
+            self.prioriteit[trefwoord]  =   (len(self.prioriteit), waarde)
+            
+            toestand    =   0
+            for teken in trefwoord:
+                if teken not in self.overgangen[toestand]:
+                    self.overgangen.append({})
+                    self.terugval.append(0)
+                    self.uitvoer.append([])
+                    self.overgangen[toestand][teken]    =   len(self.overgangen) - 1
+                toestand    =   self.overgangen[toestand][teken]
+            self.uitvoer[toestand].append(trefwoord)
+        
+        # terugvallinks in breedte-eerst volgorde, met de uitvoer van de
+        # terugvaltoestand erbij zodat ook trefwoorden binnen trefwoorden tellen
+        wachtrij    =   deque(self.overgangen[0].values())
+        while wachtrij:
+            toestand    =   wachtrij.popleft()
+            for teken, volgende in self.overgangen[toestand].items():
+                wachtrij.append(volgende)
+                terugval    =   self.terugval[toestand]
+                while terugval and teken not in self.overgangen[terugval]:
+                    terugval    =   self.terugval[terugval]
+                self.terugval[volgende] =   self.overgangen[terugval].get(teken, 0)
+                self.uitvoer[volgende]  =   self.uitvoer[volgende] + self.uitvoer[self.terugval[volgende]]
+        
+        return self
+    
+    def zoeken(
+        self,
+        tekst   :   str,
+        ) -> List[Tuple[int, str]]:
+        
+        # alle treffers als (beginpositie, trefwoord)
+        treffers    =   []
+        toestand    =   0
+        
+        for positie, teken in enumerate(tekst.casefold()):
+            while toestand and teken not in self.overgangen[toestand]:
+                toestand    =   self.terugval[toestand]
+            toestand    =   self.overgangen[toestand].get(teken, 0)
+            for trefwoord in self.uitvoer[toestand]:
+                treffers.append((positie - len(trefwoord) + 1, trefwoord))
+        
+        return treffers
+
+class TrefwoordAutomaat(Automaat):
+    
+    # de automaat over de trefwoorden van alle categorieën. bij meerdere
+    # treffers gaat het langste trefwoord voor, daarna de categorie die eerder
+    # in het register staat, daarna de eerste treffer in de omschrijving. de
+    # automaat wordt opnieuw opgebouwd zodra het register een gewijzigde
+    # categorietabel heeft (bijvoorbeeld na de opdracht trefwoord)
+    
+    def __init__(self) -> "TrefwoordAutomaat":
+        
+        super().__init__()
+        self.bron   =   None
+    
+    def actueel(self) -> "TrefwoordAutomaat":
+        
+        # het register geeft dezelfde tabel terug zolang die niet is gewijzigd
+        categorieen =   register["categorie"]
+        
+        if self.bron is not categorieen:
+            self.opbouwen((trefwoord, cat_uuid) for cat_uuid, categorie in categorieen.items() for trefwoord in categorie.trefwoorden)
+            self.bron   =   categorieen
+        
+        return self
+    
+    def categoriseren(
+        self,
+        tekst   :   str,
+        ) -> str | None:
+        
+        treffers    =   self.actueel().zoeken(tekst)
+        
+        if len(treffers) == 0:
+            return None
+        
+        _, trefwoord    =   min(treffers, key = lambda treffer: (-len(treffer[1]), self.prioriteit[treffer[1]][0], treffer[0]))
+        return self.prioriteit[trefwoord][1]
+    
+    def categoriseren_bulk(
+        self,
+        teksten :   Iterable[str] | pd.Series,
+        ) -> pd.Series:
+        
+        # voor een hele kolom omschrijvingen; gelijke omschrijvingen maar één keer
+        teksten     =   teksten if isinstance(teksten, pd.Series) else pd.Series(list(teksten), dtype = object)
+        teksten     =   teksten.fillna("").astype(str)
+        self.actueel()
+        
+        uitkomsten  =   {tekst: self.categoriseren(tekst) for tekst in teksten.unique()}
+        return pd.Series([uitkomsten[tekst] for tekst in teksten], index = teksten.index, dtype = object)
+
+trefwoord_automaat  =   TrefwoordAutomaat()
\ No newline at end of file
@@ -1,11 +1,13 @@
 import re
 from typing import Dict, List, Any
 
-from grienetsiis import Kleur, open_json
+from grienetsiis import Kleur
 
 
 class PlatusType:
     
+    __slots__   =   ()
+    
     @classmethod
     def van_json(
         cls,
@@ -24,7 +26,7 @@ class PlatusType:
         
         dict    =   {}
         
-        for veld, waarde in self.__dict__.items():
+        for veld, waarde in self.velden().items():
             
             if veld == "type":
                 continue
@@ -40,9 +42,20 @@ class PlatusType:
                 dict[veld] = waarde
         
         return dict
+    
+    def velden(self) -> Dict[str, Any]:
+        
+        # in dezelfde volgorde als vroeger __dict__ (die van toewijzen in
+        # __init__): per klasse de volgorde van __slots__, en de basisklasse
+        # eerst omdat elke __init__ eerst super().__init__ aanroept. een
+        # subklasse die velden vóór super().__init__ toewijst moet die daarom
+        # in de basisklasse declareren, anders verandert naar_json
+        return {veld: getattr(self, veld) for klasse in reversed(type(self).__mro__) for veld in getattr(klasse, "__slots__", ())}
 
 class HoofdCategorie(PlatusType):
     
+    __slots__   =   ("naam", "kleur",)
+    
     def __init__(
         self,
         naam    :   str,
@@ -57,6 +70,8 @@ class HoofdCategorie(PlatusType):
 
 class Categorie(PlatusType):
     
+    __slots__   =   ("naam", "hoofdcat_uuid", "kleur", "trefwoorden",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -71,11 +86,13 @@ class Categorie(PlatusType):
         self.trefwoorden    =   list() if trefwoorden is None else trefwoorden
     
     def __repr__(self):
-        hoofdcategorieen = open_json("gegevens\\configuratie", "hoofdcategorie", "json", class_mapper = (HoofdCategorie, frozenset(("naam", "type")), "van_json"),)
-        return f"categorie {self.naam} ({hoofdcategorieen[self.hoofdcat_uuid]})"
+        from .register import register
+        return f"categorie {self.naam} ({register["hoofdcategorie"][self.hoofdcat_uuid]})"
 
 class Land(PlatusType):
     
+    __slots__   =   ("naam", "iso_3166_1_alpha_3", "synoniemen",)
+    
     def __init__(self,
         naam                :   str,
         iso_3166_1_alpha_3  :   str,
@@ -91,6 +108,8 @@ class Land(PlatusType):
 
 class Locatie(PlatusType):
     
+    __slots__   =   ("naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -107,11 +126,13 @@ class Locatie(PlatusType):
         self.synoniemen     =   list() if synoniemen is None else synoniemen
     
     def __repr__(self):
-        landen = open_json("gegevens\\configuratie", "land", "json", class_mapper = (Land, frozenset(("naam", "iso_3166_1_alpha_3", "synoniemen")), "van_json"),)
-        return f"locatie {self.naam} ({landen[self.land_uuid]})"
+        from .register import register
+        return f"locatie {self.naam} ({register["land"][self.land_uuid]})"
         
 class Derde(PlatusType):
     
+    __slots__   =   ("naam", "type", "iban", "rekeningnummer",)
+    
     def __init__(
         self, 
         naam            :   str,
@@ -160,6 +181,8 @@ class Derde(PlatusType):
     
 class Persoon(Derde):
     
+    __slots__   =   ("groep", "giro",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -181,6 +204,8 @@ class Persoon(Derde):
 
 class Bedrijf(Derde):
 
+    __slots__   =   ("synoniemen", "giro", "uitsluiten", "cat_uuid",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -206,6 +231,8 @@ class Bedrijf(Derde):
 
 class Cpsp(Derde):
 
+    __slots__   =   ("synoniemen", "uitsluiten",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -227,6 +254,8 @@ class Cpsp(Derde):
 
 class Bank(Derde):
 
+    __slots__   =   ("synoniemen", "bic",)
+    
     def __init__(
         self,
         naam            :   str,
@@ -0,0 +1,186 @@
+from collections import defaultdict, deque
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Iterator
+
+import pandas as pd
+
+from .bankexport import BankexportRij
+
+
+def vingerafdruk(rij: BankexportRij) -> str:
+    
+    # rentedatum, bedragen in centen en een digest van de omschrijving zonder
+    # dubbele spaties en hoofdletters; door de saldi verschillen ook twee
+    # verder gelijke rijen op dezelfde dag
+    omschrijving    =   hashlib.blake2b(" ".join(str(rij.omschrijving).split()).casefold().encode("utf-8"), digest_size = 16).hexdigest()
+    sleutel         =   "|".join((
+        str(rij.rentedatum),
+        str(int(round(100 * rij.transactiebedrag))),
+        str(int(round(100 * rij.beginsaldo))),
+        str(int(round(100 * rij.eindsaldo))),
+        omschrijving,
+        ))
+    
+    return hashlib.blake2b(sleutel.encode("utf-8"), digest_size = 16).hexdigest()
+
+class Vingerafdrukken:
+    
+    # per rekening de vingerafdrukken van alle geïmporteerde bankexportrijen
+    # met de uuid van hun transactie, zodat een rij die al is opgeslagen bij
+    # een nieuwe of overlappende import wordt overgeslagen. wordt net als het
+    # journaal achteraan aangevuld ({uuid}.vingerafdruk.jsonl) en pas bij het
+    # eerste gebruik ingelezen
+    
+    map =   "gegevens\\rekeningen"
+    
+    def __init__(
+        self,
+        rekening_uuid   :   str,
+        ) -> "Vingerafdrukken":
+        
+        self.rekening_uuid  =   rekening_uuid
+        self._bekend        =   None
+        self.wachtend       =   deque()
+        self.gezien         =   set()
+        self.nieuw          =   {}
+        self.overgeslagen   =   0
+    
+    @property
+    def pad(self) -> str:
+        return os.path.join(self.map, f"{self.rekening_uuid}.vingerafdruk.jsonl")
+    
+    @property
+    def bekend(self) -> Dict[str, str]:
+        
+        if self._bekend is None:
+            self._bekend    =   {}
+            if os.path.exists(self.pad):
+                with open(self.pad, "r", encoding = "utf-8") as bestand:
+                    for regel in bestand:
+                        if regel.strip() == "":
+                            continue
+                        try:
+                            self._bekend.update(json.loads(regel))
+                        except json.JSONDecodeError:
+                            break # half geschreven laatste regel na een onderbreking
+        
+        return self._bekend
+    
+    def __contains__(self, sleutel: str) -> bool:
+        return sleutel in self.bekend or sleutel in self.nieuw
+    
+    def __len__(self) -> int:
+        return len(self.bekend) + len(self.nieuw)
+    
+    def filteren(
+        self,
+        rijen   :   Iterable[BankexportRij],
+        ) -> Iterator[BankexportRij]:
+        
+        # enkel de rijen die nog niet zijn opgeslagen; de vingerafdrukken
+        # wachten op volgorde tot hun transactie is toegevoegd (ook als de
+        # rijen in een pool van werkprocessen vooruit worden gelezen). een
+        # dubbele rij binnen dezelfde export wordt ook overgeslagen als de
+        # eerste nog wacht, zodat dat niet afhangt van hoe ver vooruit er
+        # wordt gelezen
+        self.wachtend.clear()
+        self.gezien.clear()
+        
+        for rij in rijen:
+            sleutel =   vingerafdruk(rij)
+            if sleutel in self or sleutel in self.gezien:
+                self.overgeslagen   +=  1
+                continue
+            self.wachtend.append(sleutel)
+            self.gezien.add(sleutel)
+            yield rij
+    
+    def toevoegen(
+        self,
+        transactie_uuid :   str,
+        ):
+        
+        # aan te roepen na het toevoegen van de transactie van de oudste wachtende rij
+        sleutel             =   self.wachtend.popleft()
+        self.nieuw[sleutel] =   transactie_uuid
+        self.gezien.discard(sleutel)
+    
+    def opslaan(self):
+        
+        # na het opslaan van de transacties, zodat een vingerafdruk nooit
+        # naar een transactie verwijst die er niet is
+        if len(self.nieuw) == 0:
+            return
+        
+        with open(self.pad, "a", encoding = "utf-8") as bestand:
+            for sleutel, transactie_uuid in self.nieuw.items():
+                bestand.write(json.dumps({sleutel: transactie_uuid}) + "\n")
+            bestand.flush()
+            os.fsync(bestand.fileno())
+        
+        self.bekend.update(self.nieuw)
+        self.nieuw  =   {}
+    
+    def aanvullen(
+        self,
+        rijen       :   Iterable[BankexportRij],
+        kolommen    :   pd.DataFrame,
+        ) -> int:
+        
+        # vingerafdrukken voor transacties die zijn geïmporteerd voordat er
+        # vingerafdrukken waren, uit een bankexport die al is verwerkt. een rij
+        # hoort bij een opgeslagen transactie zonder vingerafdruk met hetzelfde
+        # bedrag, beginsaldo en eindsaldo; bij meerdere de eerste na de vorige
+        # rij, omdat de saldi op volgorde van index een keten vormen
+        toegewezen  =   set(self.bekend.values()) | set(self.nieuw.values())
+        indexen     =   dict(zip(kolommen["uuid"], kolommen["index"].tolist()))
+        kandidaten  =   defaultdict(list)
+        
+        for transactie_uuid, index, bedrag, beginsaldo, eindsaldo in zip(kolommen["uuid"], kolommen["index"].tolist(), kolommen["bedrag"].tolist(), kolommen["beginsaldo"].tolist(), kolommen["eindsaldo"].tolist()):
+            if transactie_uuid not in toegewezen:
+                kandidaten[(bedrag, beginsaldo, eindsaldo)].append((index, transactie_uuid))
+        
+        vorige  =   -1
+        aantal  =   0
+        
+        for rij in rijen:
+            sleutel =   vingerafdruk(rij)
+            
+            if sleutel in self:
+                vorige  =   indexen.get(self.bekend.get(sleutel, self.nieuw.get(sleutel)), vorige)
+                continue
+            
+            lijst   =   kandidaten.get((int(round(100 * rij.transactiebedrag)), int(round(100 * rij.beginsaldo)), int(round(100 * rij.eindsaldo))), [])
+            positie =   next((positie for positie, (index, _) in enumerate(lijst) if index > vorige), None)
+            
+            if positie is None:
+                continue
+            
+            vorige, transactie_uuid =   lijst.pop(positie)
+            self.nieuw[sleutel]     =   transactie_uuid
+            aantal                  +=  1
+        
+        return aantal
+    
+    def hernoemen(
+        self,
+        hernoemingen    :   Dict[str, str],
+        ):
+        
+        # na het hernoemen van opgeslagen transacties (oud naar nieuw) het hele
+        # bestand herschrijven, eerst naar een tijdelijk bestand
+        self.opslaan()
+        
+        if not any(transactie_uuid in hernoemingen for transactie_uuid in self.bekend.values()):
+            return
+        
+        self._bekend    =   {sleutel: hernoemingen.get(transactie_uuid, transactie_uuid) for sleutel, transactie_uuid in self.bekend.items()}
+        
+        with open(f"{self.pad}.nieuw", "w", encoding = "utf-8") as bestand:
+            for sleutel, transactie_uuid in self._bekend.items():
+                bestand.write(json.dumps({sleutel: transactie_uuid}) + "\n")
+            bestand.flush()
+            os.fsync(bestand.fileno())
+        os.replace(f"{self.pad}.nieuw", self.pad)
\ No newline at end of file
@@ -1,7 +1,7 @@
 import streamlit as st
 
 from grienetsiis import open_json
-from ..gegevens.rekening import Bankrekening
+from ..gegevens.kubus import Kubus, draaien
 
 
 def rapporteren():
@@ -11,9 +11,9 @@ def rapporteren():
         return open_json("gegevens\\configuratie", "weergave", "json")
     
     @st.cache_data
-    def laden_bankrekeningen():
-        bankrekeningen = open_json("gegevens\\configuratie", "bankrekening", "json")
-        return {bankrekening_uuid: Bankrekening.openen(bankrekening_uuid).tabel() for bankrekening_uuid in bankrekeningen.keys()}
+    def laden_kubus():
+        weergave_configuratie = laden_configuratie()
+        return Kubus(weergave_configuratie["betaalrekening"]["bankrekening_uuid"]).openen()
     
     # st.markdown(
     #     r"""
@@ -30,154 +30,52 @@ def rapporteren():
     # unsafe_allow_html = True,)
     
     weergave_configuratie = laden_configuratie()
-    bankrekeningen = laden_bankrekeningen()
     
-    tabel_betaalrekening_transacties    =   bankrekeningen[weergave_configuratie["betaalrekening"]["bankrekening_uuid"]]
-    tabel_betaalrekening_transacties["jaar"] = tabel_betaalrekening_transacties["datumtijd"].dt.strftime("%Y")
+    kubus_betaalrekening    =   laden_kubus()
     
-    tabel_betaalrekening_transacties_uitgaven_hoofdcategorie = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "hoofdcategorie"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "hoofdcategorie",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_uitgaven_hoofdcategorie = draaien(kubus_betaalrekening, "jaar", "hoofdcategorie", uitsluiten = ["interne overboeking"], richting = "uitgaven").rename(index = str)
     tabel_betaalrekening_transacties_uitgaven_hoofdcategorie["totaal"] = tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.sum(axis = 1)
     tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.loc["totaal"] = tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.sum()
     tabel_betaalrekening_transacties_uitgaven_hoofdcategorie = tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_uitgaven_hoofdcategorie = tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.columns[tabel_betaalrekening_transacties_uitgaven_hoofdcategorie.loc["totaal"].argsort()]
     
-    tabel_betaalrekening_transacties_inkomsten_hoofdcategorie = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "hoofdcategorie"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "hoofdcategorie",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_inkomsten_hoofdcategorie = draaien(kubus_betaalrekening, "jaar", "hoofdcategorie", uitsluiten = ["interne overboeking"], richting = "inkomsten").rename(index = str)
     tabel_betaalrekening_transacties_inkomsten_hoofdcategorie["totaal"] = tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.sum(axis = 1)
     tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.loc["totaal"] = tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.sum()
     tabel_betaalrekening_transacties_inkomsten_hoofdcategorie = tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_inkomsten_hoofdcategorie = tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.columns[tabel_betaalrekening_transacties_inkomsten_hoofdcategorie.loc["totaal"].argsort()[::-1]]
     
-    tabel_betaalrekening_transacties_uitgaven_categorie = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "categorie"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "categorie",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_uitgaven_categorie = draaien(kubus_betaalrekening, "jaar", "categorie", uitsluiten = ["interne overboeking"], richting = "uitgaven").rename(index = str)
     tabel_betaalrekening_transacties_uitgaven_categorie["totaal"] = tabel_betaalrekening_transacties_uitgaven_categorie.sum(axis = 1)
     tabel_betaalrekening_transacties_uitgaven_categorie.loc["totaal"] = tabel_betaalrekening_transacties_uitgaven_categorie.sum()
     tabel_betaalrekening_transacties_uitgaven_categorie = tabel_betaalrekening_transacties_uitgaven_categorie.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_uitgaven_categorie = tabel_betaalrekening_transacties_uitgaven_categorie.columns[tabel_betaalrekening_transacties_uitgaven_categorie.loc["totaal"].argsort()]
     
-    tabel_betaalrekening_transacties_inkomsten_categorie = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "categorie"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "categorie",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_inkomsten_categorie = draaien(kubus_betaalrekening, "jaar", "categorie", uitsluiten = ["interne overboeking"], richting = "inkomsten").rename(index = str)
     tabel_betaalrekening_transacties_inkomsten_categorie["totaal"] = tabel_betaalrekening_transacties_inkomsten_categorie.sum(axis = 1)
     tabel_betaalrekening_transacties_inkomsten_categorie.loc["totaal"] = tabel_betaalrekening_transacties_inkomsten_categorie.sum()
     tabel_betaalrekening_transacties_inkomsten_categorie = tabel_betaalrekening_transacties_inkomsten_categorie.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_inkomsten_categorie = tabel_betaalrekening_transacties_inkomsten_categorie.columns[tabel_betaalrekening_transacties_inkomsten_categorie.loc["totaal"].argsort()[::-1]]
     
-    tabel_betaalrekening_transacties_inkomsten_bedrijf = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-        & (tabel_betaalrekening_transacties["type"] == "bedrijf")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "derde"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "derde",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_inkomsten_bedrijf = draaien(kubus_betaalrekening, "jaar", "derde", uitsluiten = ["interne overboeking"], richting = "inkomsten", type = "bedrijf").rename(index = str)
     tabel_betaalrekening_transacties_inkomsten_bedrijf["totaal"] = tabel_betaalrekening_transacties_inkomsten_bedrijf.sum(axis = 1)
     tabel_betaalrekening_transacties_inkomsten_bedrijf.loc["totaal"] = tabel_betaalrekening_transacties_inkomsten_bedrijf.sum()
     tabel_betaalrekening_transacties_inkomsten_bedrijf = tabel_betaalrekening_transacties_inkomsten_bedrijf.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_inkomsten_bedrijf = tabel_betaalrekening_transacties_inkomsten_bedrijf.columns[tabel_betaalrekening_transacties_inkomsten_bedrijf.loc["totaal"].argsort()[::-1]]
     
-    tabel_betaalrekening_transacties_uitgaven_bedrijf = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-        & (tabel_betaalrekening_transacties["type"] == "bedrijf")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "derde"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "derde",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_uitgaven_bedrijf = draaien(kubus_betaalrekening, "jaar", "derde", uitsluiten = ["interne overboeking"], richting = "uitgaven", type = "bedrijf").rename(index = str)
     tabel_betaalrekening_transacties_uitgaven_bedrijf["totaal"] = tabel_betaalrekening_transacties_uitgaven_bedrijf.sum(axis = 1)
     tabel_betaalrekening_transacties_uitgaven_bedrijf.loc["totaal"] = tabel_betaalrekening_transacties_uitgaven_bedrijf.sum()
     tabel_betaalrekening_transacties_uitgaven_bedrijf = tabel_betaalrekening_transacties_uitgaven_bedrijf.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_uitgaven_bedrijf = tabel_betaalrekening_transacties_uitgaven_bedrijf.columns[tabel_betaalrekening_transacties_uitgaven_bedrijf.loc["totaal"].argsort()]
     
-    tabel_betaalrekening_transacties_inkomsten_persoon = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-        & (tabel_betaalrekening_transacties["type"] == "persoon")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "derde"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "derde",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_inkomsten_persoon = draaien(kubus_betaalrekening, "jaar", "derde", uitsluiten = ["interne overboeking"], richting = "inkomsten", type = "persoon").rename(index = str)
     tabel_betaalrekening_transacties_inkomsten_persoon["totaal"] = tabel_betaalrekening_transacties_inkomsten_persoon.sum(axis = 1)
     tabel_betaalrekening_transacties_inkomsten_persoon.loc["totaal"] = tabel_betaalrekening_transacties_inkomsten_persoon.sum()
     tabel_betaalrekening_transacties_inkomsten_persoon = tabel_betaalrekening_transacties_inkomsten_persoon.sort_values(by = ["jaar"], ascending = False)
     kolommen_gesorteerd_inkomsten_persoon = tabel_betaalrekening_transacties_inkomsten_persoon.columns[tabel_betaalrekening_transacties_inkomsten_persoon.loc["totaal"].argsort()[::-1]]
     
-    tabel_betaalrekening_transacties_uitgaven_persoon = tabel_betaalrekening_transacties[
-        (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        & (tabel_betaalrekening_transacties["categorie"] != "interne overboeking")
-        & (tabel_betaalrekening_transacties["type"] == "persoon")
-    ].pivot_table(
-        "bedrag",
-        ["jaar", "derde"],
-        aggfunc = "sum",
-    ).reset_index(
-    ).pivot(
-        index = "jaar",
-        columns = "derde",
-        values = "bedrag",
-    )
+    tabel_betaalrekening_transacties_uitgaven_persoon = draaien(kubus_betaalrekening, "jaar", "derde", uitsluiten = ["interne overboeking"], richting = "uitgaven", type = "persoon").rename(index = str)
     tabel_betaalrekening_transacties_uitgaven_persoon["totaal"] = tabel_betaalrekening_transacties_uitgaven_persoon.sum(axis = 1)
     tabel_betaalrekening_transacties_uitgaven_persoon.loc["totaal"] = tabel_betaalrekening_transacties_uitgaven_persoon.sum()
     tabel_betaalrekening_transacties_uitgaven_persoon = tabel_betaalrekening_transacties_uitgaven_persoon.sort_values(by = ["jaar"], ascending = False)
@@ -1,6 +1,5 @@
 from calendar import month_name
 import datetime as dt
-from functools import reduce
 from typing import List
 
 import altair as alt
@@ -10,7 +9,10 @@ import streamlit as st
 from grienetsiis.gereedschap import jaar_maand_iterator, toon_bedrag
 from grienetsiis.kleuren import wit_gebroken
 from grienetsiis.lezerschrijver import open_json
+from ..gegevens.kubus import Kubus, waarde
 from ..gegevens.rekening import Bankrekening, Lening
+from ..gegevens.saldo import samenvoegen_saldi
+from ..gegevens.tabel import laden_tabel, referentietabellen
 
 
 def weergave():
@@ -22,31 +24,36 @@ def weergave():
     @st.cache_data
     def laden_bankrekeningen():
         bankrekeningen = open_json("gegevens\\configuratie", "bankrekening", "json")
-        return {bankrekening_uuid: Bankrekening.openen(bankrekening_uuid).tabel() for bankrekening_uuid in bankrekeningen.keys()}
+        referenties = referentietabellen()
+        return {bankrekening_uuid: laden_tabel(bankrekening_uuid, referenties) for bankrekening_uuid in bankrekeningen.keys()}
     
     @st.cache_data
     def laden_leningen():
         leningen = open_json("gegevens\\configuratie", "lening", "json")
-        return {lening_uuid: Lening.openen(lening_uuid).tabel() for lening_uuid in leningen.keys()}
+        referenties = referentietabellen()
+        return {lening_uuid: laden_tabel(lening_uuid, referenties) for lening_uuid in leningen.keys()}
     
     @st.cache_data
     def laden_salaris():
         weergave_configuratie = laden_configuratie()
         return Bankrekening.openen(weergave_configuratie["betaalrekening"]["bankrekening_uuid"]).salaris()
     
+    @st.cache_data
+    def laden_kubus():
+        weergave_configuratie = laden_configuratie()
+        return Kubus(weergave_configuratie["betaalrekening"]["bankrekening_uuid"]).openen()
+    
     @st.cache_data
     def maken_som(
         bankrekeningen: List[Bankrekening],
         leningen: List[Lening],
         ):
         
-        bankrekening_som                =   reduce(lambda left, right: pd.merge(left, right, on = "datumtijd", how = "outer", suffixes = ("_1", "_2")), [bankrekening[["datumtijd", "eindsaldo"]] for bankrekening in bankrekeningen.values()]).ffill().fillna(0)
-        bankrekening_som["eindsaldo"]   =   bankrekening_som.drop("datumtijd", axis=1).sum(axis=1)
-        bankrekening_som                =   bankrekening_som.loc[:, bankrekening_som.columns.intersection(["datumtijd", "eindsaldo"])]
+        # één samenvoeging van alle rekeningen, met een subtotaal per groep
+        som                 =   samenvoegen_saldi({"bankrekening": bankrekeningen.values(), "lening": leningen.values()})
         
-        lening_som                      =   reduce(lambda left, right: pd.merge(left, right, on = "datumtijd", how = "outer", suffixes = ("_1", "_2")), [lening[["datumtijd", "eindsaldo"]] for lening in leningen.values()]).ffill().fillna(0)
-        lening_som["eindsaldo"]         =   lening_som.drop("datumtijd", axis=1).sum(axis=1)
-        lening_som                      =   lening_som.loc[:, lening_som.columns.intersection(["datumtijd", "eindsaldo"])]
+        bankrekening_som    =   som[["datumtijd", "bankrekening"]].rename(columns = {"bankrekening": "eindsaldo"})
+        lening_som          =   som[["datumtijd", "lening"]].rename(columns = {"lening": "eindsaldo"})
         
         return bankrekening_som, lening_som
     
@@ -65,6 +72,7 @@ def weergave():
     leningen                        =   laden_leningen()
     bankrekening_som, lening_som    =   maken_som(bankrekeningen, leningen)
     tabel_betaalrekening_salaris    =   laden_salaris()
+    kubus_betaalrekening            =   laden_kubus()
     gegevens_kaart                  =   laden_kaart()
     
     st.markdown(
@@ -1348,43 +1356,18 @@ def weergave():
         usermeta = locale,
         )
     
-    waarde_inkomsten_jaar = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"])
-        & (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        & (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-    ]["bedrag"].sum()
-    
-    waarde_inkomsten_jaar_vorig = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"] - 1)
-        & (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        & (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-    ]["bedrag"].sum()
+    waarde_inkomsten_jaar = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_2"], richting = "inkomsten")
+    waarde_inkomsten_jaar_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_2"] - 1, richting = "inkomsten")
     
     waarde_inkomsten_jaar_verschil = waarde_inkomsten_jaar - waarde_inkomsten_jaar_vorig
     
-    waarde_salaris_jaar = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"])
-        & (tabel_betaalrekening_transacties["hoofdcategorie"] == weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
-    ]["bedrag"].sum()
-    
-    waarde_salaris_jaar_vorig = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"] - 1)
-        & (tabel_betaalrekening_transacties["hoofdcategorie"] == weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
-    ]["bedrag"].sum()
+    waarde_salaris_jaar = waarde(kubus_betaalrekening, jaar = st.session_state["domein_2"], hoofdcategorie = weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
+    waarde_salaris_jaar_vorig = waarde(kubus_betaalrekening, jaar = st.session_state["domein_2"] - 1, hoofdcategorie = weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
     
     waarde_salaris_jaar_verschil = waarde_salaris_jaar - waarde_salaris_jaar_vorig
     
-    waarde_uitgaven_jaar = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"])
-        & (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        & (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-    ]["bedrag"].sum()
-    
-    waarde_uitgaven_jaar_vorig = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_2"] - 1)
-        & (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        & (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-    ]["bedrag"].sum()
+    waarde_uitgaven_jaar = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_2"], richting = "uitgaven")
+    waarde_uitgaven_jaar_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_2"] - 1, richting = "uitgaven")
     
     waarde_uitgaven_jaar_verschil = waarde_uitgaven_jaar - waarde_uitgaven_jaar_vorig
     
@@ -1401,72 +1384,30 @@ def weergave():
     tekst_netto_jaar                =   toon_bedrag(waarde_netto_jaar)
     tekst_netto_jaar_verschil       =   toon_bedrag(waarde_netto_jaar_verschil)
     
-    waarde_inkomsten_jaarmaand = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-    &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"])
-    &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-    &   (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-    ]["bedrag"].sum()
+    waarde_inkomsten_jaarmaand = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"], richting = "inkomsten")
     
     if st.session_state["domein_3_maand"] == 1:
-        waarde_inkomsten_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"] - 1)
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == 12)
-        &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        &   (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        ]["bedrag"].sum()
+        waarde_inkomsten_jaarmaand_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"] - 1, maand = 12, richting = "inkomsten")
     else:
-        waarde_inkomsten_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"] - 1)
-        &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        &   (tabel_betaalrekening_transacties["bedrag"] > 0.0)
-        ]["bedrag"].sum()
+        waarde_inkomsten_jaarmaand_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"] - 1, richting = "inkomsten")
     
     waarde_inkomsten_jaarmaand_verschil = waarde_inkomsten_jaarmaand - waarde_inkomsten_jaarmaand_vorig
     
-    waarde_salaris_jaarmaand = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-    &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"])
-    &   (tabel_betaalrekening_transacties["hoofdcategorie"] == weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
-    ]["bedrag"].sum()
+    waarde_salaris_jaarmaand = waarde(kubus_betaalrekening, jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"], hoofdcategorie = weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
     
     if st.session_state["domein_3_maand"] == 1:
-        waarde_salaris_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"] - 1)
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == 12)
-        &   (tabel_betaalrekening_transacties["hoofdcategorie"] == weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
-        ]["bedrag"].sum()
+        waarde_salaris_jaarmaand_vorig = waarde(kubus_betaalrekening, jaar = st.session_state["domein_3_jaar"] - 1, maand = 12, hoofdcategorie = weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
     else:
-        waarde_salaris_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"] - 1)
-        &   (tabel_betaalrekening_transacties["hoofdcategorie"] == weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
-        ]["bedrag"].sum()
+        waarde_salaris_jaarmaand_vorig = waarde(kubus_betaalrekening, jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"] - 1, hoofdcategorie = weergave_configuratie["betaalrekening"]["hoofdcategorie_waarde_salaris"])
     
     waarde_salaris_jaarmaand_verschil = waarde_salaris_jaarmaand - waarde_salaris_jaarmaand_vorig
     
-    waarde_uitgaven_jaarmaand = tabel_betaalrekening_transacties.loc[
-        (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-    &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"])
-    &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-    &   (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-    ]["bedrag"].sum()
+    waarde_uitgaven_jaarmaand = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"], richting = "uitgaven")
     
     if st.session_state["domein_3_maand"] == 1:
-        waarde_uitgaven_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"] - 1)
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == 12)
-        &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        &   (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        ]["bedrag"].sum()
+        waarde_uitgaven_jaarmaand_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"] - 1, maand = 12, richting = "uitgaven")
     else:
-        waarde_uitgaven_jaarmaand_vorig = tabel_betaalrekening_transacties.loc[
-            (tabel_betaalrekening_transacties["datumtijd"].dt.year == st.session_state["domein_3_jaar"])
-        &   (tabel_betaalrekening_transacties["datumtijd"].dt.month == st.session_state["domein_3_maand"] - 1)
-        &   (tabel_betaalrekening_transacties["categorie"] != weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"])
-        &   (tabel_betaalrekening_transacties["bedrag"] < 0.0)
-        ]["bedrag"].sum()
+        waarde_uitgaven_jaarmaand_vorig = waarde(kubus_betaalrekening, uitsluiten = [weergave_configuratie["betaalrekening"]["categorie_waarde_uitsluiten"]], jaar = st.session_state["domein_3_jaar"], maand = st.session_state["domein_3_maand"] - 1, richting = "uitgaven")
     
     waarde_uitgaven_jaarmaand_verschil = waarde_uitgaven_jaarmaand - waarde_uitgaven_jaarmaand_vorig
     
@@ -0,0 +1,160 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+pytest.importorskip("grienetsiis")
+
+# platus leest de referentiegegevens relatief aan de werkmap en Transactie
+# leest zijn configuratie al bij het importeren; daarom staat er al een lege
+# gegevensmap klaar voordat de tests (en daarmee platus) worden ingelezen
+MAPPEN      =   ("gegevens", "gegevens\\configuratie", "gegevens\\derden", "gegevens\\rekeningen")
+LEEG        =   {
+    "gegevens\\configuratie":   ("bankrekening", "beoordeling", "categorie", "hoofdcategorie", "land", "lening", "locatie", "salaris"),
+    "gegevens\\derden":         ("bank", "bedrijf", "cpsp", "persoon"),
+    }
+TRANSACTIE  =   {
+    "derde_onbekend":       "onbekend",
+    "interne overboeking":  {"cat_uuid": "1e8fd286-4cdd-4836-a1c5-7e815123ea25"},
+    "rente":                {"cat_uuid": "rente", "derde_uuid": "bank"},
+    "bankkosten":           {"cat_uuid": "bankkosten", "derde_uuid": "bank"},
+    "geldopname":           {"cat_uuid": "contant"},
+    "betaalverzoek":        {"versturen": {"rabo": {"bank_uuid": "rabo"}}},
+    }
+
+_werkmappen =   []
+
+def schrijven(
+    map     :   str,
+    naam    :   str,
+    inhoud  :   dict,
+    ):
+    
+    with open(os.path.join(map, f"{naam}.json"), "w", encoding = "utf-8") as bestand:
+        json.dump(inhoud, bestand)
+
+def maken_gegevens():
+    
+    for map in MAPPEN:
+        os.makedirs(map, exist_ok = True)
+    for map, namen in LEEG.items():
+        for naam in namen:
+            schrijven(map, naam, {})
+    schrijven("gegevens\\configuratie", "transactie", TRANSACTIE)
+
+def pytest_configure(config):
+    
+    _werkmappen.append((os.getcwd(), tempfile.mkdtemp(prefix = "platus-")))
+    os.chdir(_werkmappen[-1][1])
+    maken_gegevens()
+
+def pytest_unconfigure(config):
+    
+    werkmap, tijdelijk  =   _werkmappen.pop()
+    os.chdir(werkmap)
+    shutil.rmtree(tijdelijk, ignore_errors = True)
+
+@pytest.fixture(autouse = True)
+def gegevens(tmp_path, monkeypatch):
+    
+    # per test een eigen, lege gegevensmap; het register en de opslag worden
+    # daarna opnieuw ingelezen. geeft een functie om een tabel te vullen
+    from platus.gegevens.opslag import _instanties
+    from platus.gegevens.register import register
+    
+    monkeypatch.chdir(tmp_path)
+    maken_gegevens()
+    register.vernieuwen()
+    _instanties.clear()
+    
+    def vullen(
+        tabel   :   str,
+        inhoud  :   dict,
+        ):
+        
+        map, naam, _, _ =   register.tabellen[tabel]
+        schrijven(map, naam, inhoud)
+        register.vernieuwen(tabel)
+    
+    yield vullen
+    
+    register.vernieuwen()
+    _instanties.clear()
+
+REFERENTIES =   {
+    "hoofdcategorie":   {
+        "h1":   {"naam": "vaste lasten", "kleur": "#112233"},
+        "h2":   {"naam": "huishouden", "kleur": "#445566"},
+        },
+    "categorie":        {
+        "c1":   {"naam": "huur", "hoofdcat_uuid": "h1", "kleur": "#aa0000", "trefwoorden": ["huur"]},
+        "c2":   {"naam": "boodschappen", "hoofdcat_uuid": "h2", "kleur": "#00aa00", "trefwoorden": ["albert heijn", "jumbo"]},
+        "c3":   {"naam": "salaris", "hoofdcat_uuid": "h1", "kleur": "#0000aa", "trefwoorden": ["salaris"]},
+        "1e8fd286-4cdd-4836-a1c5-7e815123ea25":   {"naam": "interne overboeking", "hoofdcat_uuid": "h1", "kleur": "#777777", "trefwoorden": []},
+        },
+    "land":             {
+        "nl":   {"naam": "Nederland", "iso_3166_1_alpha_3": "NLD", "synoniemen": []},
+        },
+    "locatie":          {
+        "l1":   {"naam": "Utrecht", "land_uuid": "nl", "breedtegraad": 52.09, "lengtegraad": 5.12, "synoniemen": []},
+        },
+    "persoon":          {
+        "p1":   {"naam": "Jan", "groep": "familie", "rekeningnummer": [], "iban": ["NL91ABNA0417164300"], "giro": []},
+        },
+    "bedrijf":          {
+        "onbekend": {"naam": "onbekend", "synoniemen": [], "uitsluiten": False, "rekeningnummer": [], "iban": [], "giro": [], "cat_uuid": None},
+        "b1":       {"naam": "Albert Heijn", "synoniemen": [], "uitsluiten": False, "rekeningnummer": [], "iban": [], "giro": [], "cat_uuid": "c2"},
+        },
+    "bankrekening":     {
+        "r1":   {"naam": "betaalrekening", "bank_uuid": "bank", "pad": "export", "rekeningnummer": "123456789", "actief_van": "2023-01-01", "iban": "NL02ABNA0123456789"},
+        "r2":   {"naam": "spaarrekening", "bank_uuid": "bank", "pad": "export", "rekeningnummer": "987654321", "actief_van": "2023-01-01", "iban": "NL44RABO0123456789"},
+        },
+    }
+
+@pytest.fixture
+def referenties(gegevens):
+    
+    for tabel, inhoud in REFERENTIES.items():
+        gegevens(tabel, inhoud)
+
+@pytest.fixture
+def transacties(referenties):
+    
+    # een rekening met een sluitende saldoketen over twee jaar, twee
+    # transacties per dag, met alle soorten derden, transacties zonder derde
+    # en pinbetalingen met locatie (later op de dag dan hun index doet vermoeden)
+    import datetime as dt
+    
+    from platus.gegevens.transactie import Transactie
+    
+    categorieen =   ["c1", "c2", "c3", "c2", "1e8fd286-4cdd-4836-a1c5-7e815123ea25"]
+    derden      =   ["p1", "b1", None, "b1", "r2"]
+    bedragen    =   [-75000, -2345, 250000, -1999, -10000]
+    transacties =   {}
+    saldo       =   100000
+    dagen       =   {}
+    
+    for index in range(240):
+        soort       =   index % 5
+        datumtijd   =   dt.datetime(2023, 1, 1) + dt.timedelta(days = 6 * (index // 2), hours = 14 if soort == 3 else 0, minutes = 30 if soort == 3 else 0)
+        dagindex    =   dagen.get(datumtijd.date(), 0)
+        dagen[datumtijd.date()] =   dagindex + 1
+        
+        transacties[f"t{index:03d}"]    =   Transactie(
+            index               =   index,
+            bedrag              =   bedragen[soort],
+            beginsaldo          =   saldo,
+            eindsaldo           =   saldo + bedragen[soort],
+            transactiemethode   =   "pinbetaling" if soort == 3 else "overboeking",
+            datumtijd           =   datumtijd,
+            dagindex            =   dagindex,
+            cat_uuid            =   categorieen[soort],
+            derde_uuid          =   derden[soort],
+            details             =   {"locatie_uuid": "l1"} if soort == 3 else None,
+            )
+        saldo   +=  bedragen[soort]
+    
+    return transacties
\ No newline at end of file
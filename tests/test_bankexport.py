@@ -0,0 +1,141 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from platus.gegevens.bankexport import BankexportRij, lezen_bankexport
+
+
+KOPREGEL    =   ["rekeningnummer", "muntsoort", "transactiedatum", "rentedatum", "beginsaldo", "eindsaldo", "transactiebedrag", "omschrijving"]
+
+MT940       =   """:20:ABN AMRO BANK NV
+:25:123456789
+:28:13501/1
+:60F:C240102EUR1234,56
+:61:2401030103D12,50N426NONREF
+:86:/TRTP/SEPA OVERBOEKING/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/J
+ JANSEN/REMI/lunch/EREF/NOTPROVIDED
+:61:2312310102C100,00N196NONREF
+:86:rente
+:62F:C240103EUR1322,06
+"""
+
+CAMT053     =   """<?xml version="1.0"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt>
+<Stmt><Id>1</Id>
+<Acct><Id><IBAN>NL91ABNA0417164300</IBAN></Id><Ccy>EUR</Ccy></Acct>
+<Bal><Tp><CdOrPrtry><Cd>OPBD</Cd></CdOrPrtry></Tp><Amt Ccy="EUR">10.00</Amt><CdtDbtInd>CRDT</CdtDbtInd></Bal>
+<Bal><Tp><CdOrPrtry><Cd>CLBD</Cd></CdOrPrtry></Tp><Amt Ccy="EUR">8.50</Amt><CdtDbtInd>CRDT</CdtDbtInd></Bal>
+<Ntry><Amt Ccy="EUR">2.50</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2024-01-05</Dt></BookgDt><ValDt><Dt>2024-01-04</Dt></ValDt><NtryDtls><TxDtls><RmtInf><Ustrd>koffie</Ustrd></RmtInf></TxDtls></NtryDtls><AddtlNtryInf>BEA, Betaalpas x</AddtlNtryInf></Ntry>
+<Ntry><Amt Ccy="EUR">1.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><BookgDt><DtTm>2024-01-06T10:00:00</DtTm></BookgDt><NtryDtls><TxDtls><RmtInf><Ustrd>a</Ustrd><Ustrd>b</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+</Stmt>
+<Stmt><Id>2</Id>
+<Acct><Id><IBAN>NL91ABNA0417164300</IBAN></Id><Ccy>EUR</Ccy></Acct>
+<Bal><Tp><CdOrPrtry><Cd>OPBD</Cd></CdOrPrtry></Tp><Amt Ccy="EUR">8.50</Amt><CdtDbtInd>CRDT</CdtDbtInd></Bal>
+<Ntry><Amt Ccy="EUR">9.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2024-01-07</Dt></BookgDt><AddtlNtryInf>rente</AddtlNtryInf></Ntry>
+</Stmt>
+</BkToCstmrStmt></Document>"""
+
+def schrijven(
+    pad     :   str,
+    inhoud  :   str,
+    ):
+    
+    with open(pad, "w", encoding = "utf-8") as bestand:
+        bestand.write(inhoud)
+
+def schrijven_xlsx(
+    pad     :   str,
+    rijen   :   list,
+    ):
+    
+    werkboek    =   openpyxl.Workbook()
+    werkboek.active.append(KOPREGEL)
+    for rij in rijen:
+        werkboek.active.append(rij)
+    werkboek.save(pad)
+
+def test_xlsx_gelijk_aan_read_excel():
+    
+    # zoals Bankrekening.verwerken_maand de export las vóór het streamen
+    schrijven_xlsx("export.xlsx", [
+        [123456789, "EUR", 20240105, 20240105, 100.0, 90.5, -9.5, "BEA, Betaalpas x"],
+        [123456789, "EUR", 20240106, 20240105, 90.5, 1090.5, 1000.0, "SEPA Overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen"],
+        [None, None, None, None, None, None, None, None],
+        [123456789, "EUR", 20240107, 20240107, 1090.5, 1090.0, -0.5, "ABN AMRO Bank N.V. Basic Package"],
+        ])
+    
+    oud =   [tuple(getattr(rij, veld) for veld in BankexportRij._fields) for _, rij in pd.read_excel("export.xlsx").dropna(how = "all").iterrows()]
+    
+    assert list(lezen_bankexport("export.xlsx")) == oud
+    assert all(isinstance(rij.transactiedatum, int) and isinstance(rij.rekeningnummer, int) for rij in lezen_bankexport("export.xlsx"))
+
+def test_xlsx_leeg():
+    
+    openpyxl.Workbook().save("leeg.xlsx")
+    assert list(lezen_bankexport("leeg.xlsx")) == []
+
+def test_txt_zonder_kopregel():
+    
+    schrijven("export.txt", "123456789\tEUR\t20240105\t1.234,56\t1.224,06\t20240105\t-10,50\tBEA, Betaalpas x  \n\n123456789\tEUR\t20240106\t1224,06\t1225,06\t20240106\t1,00\trente\n")
+    
+    assert list(lezen_bankexport("export.txt")) == [
+        BankexportRij(123456789, "EUR", 20240105, 20240105, 1234.56, 1224.06, -10.5, "BEA, Betaalpas x"),
+        BankexportRij(123456789, "EUR", 20240106, 20240106, 1224.06, 1225.06, 1.0, "rente"),
+        ]
+
+def test_csv_met_kopregel():
+    
+    schrijven("export.csv", "Rekeningnummer;Muntsoort;Transactiedatum;Rentedatum;Beginsaldo;Eindsaldo;Transactiebedrag;Omschrijving\n1;EUR;20240101;20231231;1,00;2,00;1,00;rente\n")
+    
+    assert list(lezen_bankexport("export.csv")) == [BankexportRij(1, "EUR", 20240101, 20231231, 1.0, 2.0, 1.0, "rente")]
+
+def test_mt940():
+    
+    schrijven("export.sta", MT940)
+    rijen   =   list(lezen_bankexport("export.sta"))
+    
+    assert rijen == [
+        BankexportRij(123456789, "EUR", 20240103, 20240103, 1234.56, 1222.06, -12.5, "/TRTP/SEPA OVERBOEKING/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/J JANSEN/REMI/lunch/EREF/NOTPROVIDED"),
+        BankexportRij(123456789, "EUR", 20240102, 20231231, 1222.06, 1322.06, 100.0, "rente"),
+        ]
+
+@pytest.mark.parametrize("rekening", ["NL91ABNA0417164300EUR", "ABNANL2A/NL91ABNA0417164300", "ABNANL2A/NL91ABNA0417164300EUR", "417164300EUR"])
+def test_mt940_rekening_met_muntsoort(rekening):
+    
+    # hetzelfde rekeningnummer als in de Excel- en TXT-export
+    schrijven("export.sta", MT940.replace(":25:123456789", f":25:{rekening}"))
+    
+    assert {rij.rekeningnummer for rij in lezen_bankexport("export.sta")} == {417164300}
+
+def test_camt053():
+    
+    schrijven("export.xml", CAMT053)
+    rijen   =   list(lezen_bankexport("export.xml"))
+    
+    assert rijen == [
+        BankexportRij(417164300, "EUR", 20240105, 20240104, 10.0, 7.5, -2.5, "BEA, Betaalpas x"),
+        BankexportRij(417164300, "EUR", 20240106, 20240106, 7.5, 8.5, 1.0, "a b"),
+        BankexportRij(417164300, "EUR", 20240107, 20240107, 8.5, -0.5, -9.0, "rente"),
+        ]
+
+def test_saldi_vormen_een_keten():
+    
+    schrijven("export.sta", MT940)
+    schrijven("export.xml", CAMT053)
+    
+    for pad in ("export.sta", "export.xml"):
+        rijen   =   list(lezen_bankexport(pad))
+        assert all(round(rij.beginsaldo + rij.transactiebedrag, 2) == rij.eindsaldo for rij in rijen)
+        assert all(vorige.eindsaldo == volgende.beginsaldo for vorige, volgende in zip(rijen, rijen[1:]))
+
+def test_boeking_zonder_omschrijving():
+    
+    schrijven("export.xml", CAMT053.replace("<AddtlNtryInf>rente</AddtlNtryInf>", ""))
+    
+    with pytest.raises(ValueError):
+        list(lezen_bankexport("export.xml"))
+
+def test_onbekende_extensie():
+    
+    with pytest.raises(NotImplementedError):
+        lezen_bankexport("export.pdf")
\ No newline at end of file
@@ -0,0 +1,117 @@
+import pytest
+
+from platus.gegevens.beoordeling import Beoordelingen, zelfde_locatie
+from platus.gegevens.gegevens import beoordelen
+from platus.gegevens.opslag import opslag
+from platus.gegevens.register import register
+from platus.gegevens.rekening import Bankrekening
+from platus.gegevens.transactie import Transactie
+
+
+# twee betalingen aan een onbekende werkgever en drie pinbetalingen bij een
+# onbekende Albert Heijn zonder locatie, waarvan één in een andere plaats
+WERKGEVER   =   {"t002": {"naam": "Werkgever"}, "t007": {"naam": "werkgever"}}
+WINKEL      =   {
+    "t003": {"naam": "Albert Heijn", "locatie_oud": "Utrecht", "land_oud": "NL"},
+    "t008": {"naam": "albert heijn", "locatie_oud": "UTRECHT", "land_oud": "nl"},
+    "t013": {"naam": "Albert Heijn", "locatie_oud": "Amsterdam", "land_oud": "NL"},
+    }
+
+@pytest.fixture
+def wachtrij(transacties, monkeypatch):
+    
+    for transactie_uuid in WINKEL.keys():
+        transacties[transactie_uuid].derde_uuid                 =   None
+        transacties[transactie_uuid].details["locatie_uuid"]    =   None
+    opslag().opslaan("r1", transacties)
+    
+    wachtrij    =   Beoordelingen()
+    for transactie_uuid, tijdelijk in {**WERKGEVER, **WINKEL}.items():
+        transacties[transactie_uuid].tijdelijk  =   tijdelijk
+        wachtrij.toevoegen("r1", transactie_uuid, transacties[transactie_uuid])
+    wachtrij.opslaan()
+    
+    monkeypatch.setattr(Transactie, "__repr__", lambda transactie: "transactie")
+    return wachtrij
+
+def test_groepen(wachtrij):
+    
+    # de grootste groep eerst, ongeacht hoofdletters
+    assert wachtrij.groepen() == {"derde: albert heijn": ["t003", "t008", "t013"], "derde: werkgever": ["t002", "t007"]}
+    assert wachtrij.wachtrij["t003"]["ontbreekt"] == ["derde_uuid", "locatie_uuid"]
+
+def test_zelfde_locatie():
+    
+    assert zelfde_locatie({"locatie_oud": "Utrecht", "land_oud": "NL"}, {"locatie_oud": "UTRECHT", "land_oud": "nl"})
+    assert not zelfde_locatie({"locatie_oud": "Amsterdam", "land_oud": "NL"}, {"locatie_oud": "Utrecht", "land_oud": "NL"})
+    assert not zelfde_locatie({"locatie_oud": "Utrecht", "land_oud": "BE"}, {"locatie_oud": "Utrecht", "land_oud": "NL"})
+
+def test_toepassen(wachtrij, transacties):
+    
+    opgelost                            =   transacties["t003"]
+    opgelost.derde_uuid                 =   "b1"
+    opgelost.details["locatie_uuid"]    =   "l1"
+    
+    # de locatie enkel bij dezelfde plaats en hetzelfde land, anders blijft de
+    # transactie in de wachtrij, nu in de groep van haar plaats
+    for transactie_uuid in ("t008", "t013"):
+        wachtrij.toepassen(transactie_uuid, transacties[transactie_uuid], opgelost)
+        assert transacties[transactie_uuid].derde_uuid == "b1"
+    
+    assert transacties["t008"].details == {"locatie_uuid": "l1"}
+    assert transacties["t013"].details == {"locatie_uuid": None}
+    assert "t008" not in wachtrij.wachtrij
+    assert wachtrij.wachtrij["t013"]["ontbreekt"] == ["locatie_uuid"]
+    assert wachtrij.wachtrij["t013"]["groep"] == "locatie: amsterdam, nl"
+    assert wachtrij.tijdelijk("t013") == WINKEL["t013"]
+
+def test_beoordelen_per_groep_opgeslagen(wachtrij, monkeypatch):
+    
+    # de eerste groep wordt beantwoord, bij de tweede volgt een Ctrl-C
+    antwoorden  =   []
+    geschreven  =   []
+    
+    def aanvullen(transactie):
+        if len(antwoorden) > 0:
+            raise KeyboardInterrupt
+        antwoorden.append(transactie.tijdelijk)
+        transactie.derde_uuid               =   "b1"
+        transactie.details["locatie_uuid"]  =   "l1"
+    
+    def opslaan(bankrekening, volledig = False):
+        geschreven.append(bankrekening.uuid)
+        opslaan_rekening(bankrekening, volledig)
+    
+    opslaan_rekening    =   Bankrekening.opslaan
+    monkeypatch.setattr(Transactie, "aanvullen", aanvullen)
+    monkeypatch.setattr(Bankrekening, "opslaan", opslaan)
+    register.bij_schrijven.append(lambda tabel, waarden: geschreven.append(tabel))
+    
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            beoordelen()
+    finally:
+        register.bij_schrijven.pop()
+    
+    assert antwoorden == [WINKEL["t003"]]
+    
+    # eerst de rekening, dan pas de wachtrij
+    assert geschreven == ["r1", "beoordeling"]
+    
+    # de opgeloste groep blijft bewaard, de onderbroken groep staat nog open
+    transacties =   Bankrekening.openen("r1").transacties
+    assert [transacties[transactie_uuid].derde_uuid for transactie_uuid in ("t003", "t008", "t013", "t002")] == ["b1", "b1", "b1", None]
+    assert [transacties[transactie_uuid].details for transactie_uuid in ("t003", "t008", "t013")] == [{"locatie_uuid": "l1"}, {"locatie_uuid": "l1"}, {"locatie_uuid": None}]
+    assert Beoordelingen().groepen() == {"derde: werkgever": ["t002", "t007"], "locatie: amsterdam, nl": ["t013"]}
+
+def test_beoordelen_slaat_vervallen_transacties_op(wachtrij, transacties, monkeypatch):
+    
+    # een transactie uit de wachtrij die nooit is opgeslagen, als enige groep
+    wachtrij.toevoegen("r1", "bestaat niet", transacties["t002"])
+    wachtrij.opslaan()
+    monkeypatch.setattr(Beoordelingen, "groepen", lambda zelf: {"derde: werkgever": ["bestaat niet"]})
+    
+    beoordelen()
+    
+    assert "bestaat niet" not in Beoordelingen().wachtrij
+    assert len(Beoordelingen()) == 5
\ No newline at end of file
@@ -0,0 +1,185 @@
+import copy
+import datetime as dt
+import pickle
+
+import pandas as pd
+import pytest
+
+from platus.gegevens.blok import TransactieBlok
+from platus.gegevens.transactie import Transactie
+from platus.gegevens.types import Bank, Bedrijf, Categorie, Cpsp, HoofdCategorie, Land, Locatie, Persoon
+
+
+# de volgorde van de sleutels in naar_json vóór __slots__, zoals die in de
+# opgeslagen bestanden staat
+VOLGORDE_TRANSACTIE =   ["index", "bedrag", "beginsaldo", "eindsaldo", "transactiemethode", "datumtijd", "dagindex", "cat_uuid", "derde_uuid"]
+VOLGORDE_TYPES      =   [
+    (HoofdCategorie.van_json(naam = "a", kleur = "#ffffff"),                                                                                                ["naam", "kleur"]),
+    (Categorie.van_json(naam = "a", hoofdcat_uuid = "h", kleur = "#ffffff", trefwoorden = ["x"]),                                                           ["naam", "hoofdcat_uuid", "kleur", "trefwoorden"]),
+    (Land(naam = "a", iso_3166_1_alpha_3 = "NLD", synoniemen = ["x"]),                                                                                      ["naam", "iso_3166_1_alpha_3", "synoniemen"]),
+    (Locatie(naam = "a", land_uuid = "l", breedtegraad = 1.0, lengtegraad = 2.0, synoniemen = ["y"]),                                                       ["naam", "land_uuid", "breedtegraad", "lengtegraad", "synoniemen"]),
+    (Persoon(naam = "a", groep = "g", rekeningnummer = ["1"], iban = ["NL"], giro = ["2"]),                                                                 ["naam", "iban", "rekeningnummer", "groep", "giro"]),
+    (Bedrijf(naam = "a", synoniemen = ["s"], uitsluiten = True, rekeningnummer = ["1"], iban = ["NL"], giro = ["2"], cat_uuid = "c"),                       ["naam", "iban", "rekeningnummer", "synoniemen", "giro", "uitsluiten", "cat_uuid"]),
+    (Cpsp(naam = "a", synoniemen = ["s"], uitsluiten = True, rekeningnummer = ["1"], iban = ["NL"]),                                                        ["naam", "iban", "rekeningnummer", "synoniemen", "uitsluiten"]),
+    (Bank(naam = "a", synoniemen = ["s"], rekeningnummer = ["1"], iban = ["NL"], bic = ["B"]),                                                              ["naam", "iban", "rekeningnummer", "synoniemen", "bic"]),
+    ]
+
+def naar_json(transacties) -> dict:
+    return {transactie_uuid: transactie.naar_json() for transactie_uuid, transactie in transacties.items()}
+
+def test_heen_en_terug(transacties):
+    
+    blok    =   TransactieBlok(transacties)
+    
+    assert len(blok) == len(transacties)
+    assert list(blok) == list(transacties.keys())
+    assert naar_json(blok) == naar_json(transacties)
+    assert naar_json(TransactieBlok.van_kolommen(blok.kolommen())) == naar_json(transacties)
+
+def test_wijziging_na_opvragen_komt_in_het_blok(transacties):
+    
+    blok    =   TransactieBlok(transacties)
+    
+    blok["t003"].cat_uuid                   =   "c1"
+    blok["t003"].details["locatie_uuid"]    =   "elders"
+    blok["t004"].details["opmerking"]       =   "nieuw"
+    
+    assert blok["t003"].cat_uuid == "c1"
+    assert blok["t003"].details == {"locatie_uuid": "elders"}
+    assert blok["t004"].details == {"opmerking": "nieuw"}
+    assert blok.kolommen().loc[3, "cat_uuid"] == "c1"
+    
+    # ook via values(), lijst en laatste
+    for transactie in blok.values():
+        transactie.derde_uuid   =   "p1"
+    blok.lijst[8].details.pop("locatie_uuid")
+    blok.laatste.cat_uuid   =   "c3"
+    
+    assert set(blok.kolommen()["derde_uuid"]) == {"p1"}
+    assert blok["t008"].details == {}
+    assert blok["t239"].cat_uuid == "c3"
+
+def test_wijziging_van_index_via_weergave(transacties):
+    
+    blok                    =   TransactieBlok(transacties)
+    blok["t239"].index      =   -1
+    
+    assert list(blok)[0] == "t239"
+    assert blok.laatste.index == 238
+
+def test_losse_transactie(transacties):
+    
+    blok        =   TransactieBlok(transacties)
+    transactie  =   blok["t003"]
+    
+    # kopiëren, pickelen en pop geven een losse Transactie
+    for los in (copy.copy(transactie), copy.deepcopy(transactie), pickle.loads(pickle.dumps(transactie)), transactie.losmaken()):
+        assert type(los) is Transactie
+        los.cat_uuid                =   "c1"
+        los.details["locatie_uuid"] =   "elders"
+        assert blok["t003"].cat_uuid == "c2"
+        assert blok["t003"].details == {"locatie_uuid": "l1"}
+    
+    # hernoemen zoals bij interne overboekingen
+    blok["nieuw"]   =   blok.pop("t003")
+    assert "t003" not in blok
+    assert blok["nieuw"].naar_json() == transacties["t003"].naar_json()
+    assert list(blok)[3] == "nieuw"
+    
+    with pytest.raises(KeyError):
+        transactie.cat_uuid
+    with pytest.raises(KeyError):
+        blok["t003"]
+
+def test_volgorde_van_index(transacties):
+    
+    # in omgekeerde volgorde toegevoegd, toch op volgorde van index
+    blok    =   TransactieBlok()
+    for transactie_uuid in reversed(list(transacties.keys())):
+        blok[transactie_uuid]   =   transacties[transactie_uuid]
+    
+    assert list(blok) == list(transacties.keys())
+    assert [transactie.index for transactie in blok.lijst] == list(range(len(transacties)))
+    assert blok.laatste.naar_json() == transacties["t239"].naar_json()
+    assert blok.volgende_index == len(transacties)
+    assert list(blok.kolommen()["uuid"]) == list(transacties.keys())
+
+def test_laatste_zonder_sorteren(transacties):
+    
+    # laatste volgt de hoogste index bij elke toevoeging, zonder te sorteren
+    blok        =   TransactieBlok()
+    volgorde    =   [*list(transacties.keys())[100:], *list(transacties.keys())[:100]]
+    
+    for positie, transactie_uuid in enumerate(volgorde):
+        blok[transactie_uuid]   =   transacties[transactie_uuid]
+        assert blok.laatste.index == max(transacties[eerder].index for eerder in volgorde[:positie + 1])
+    
+    assert not blok.gesorteerd
+    assert blok.laatste.naar_json() == transacties["t239"].naar_json()
+    assert not blok.gesorteerd
+    
+    # het eerste overzicht op volgorde sorteert de rijen zelf, één keer
+    assert list(blok) == list(transacties.keys())
+    assert blok.gesorteerd
+    assert blok.uuids == list(transacties.keys())
+    assert blok.transactie(3).details == {"locatie_uuid": "l1"}
+    assert naar_json(blok) == naar_json(transacties)
+
+def test_laatste_na_wijzigen_en_verwijderen(transacties):
+    
+    blok    =   TransactieBlok(transacties)
+    
+    transactie          =   blok["t239"]
+    transactie.index    =   -1
+    blok["t239"]        =   transactie
+    assert blok.laatste.index == 238
+    
+    del blok["t238"]
+    assert blok.laatste.index == 237
+    
+    del blok["t237"], blok["t236"]
+    assert list(blok)[0] == "t239"
+    assert blok.laatste.index == 235
+    assert TransactieBlok().laatste is None
+
+def test_verwijderen(transacties):
+    
+    blok    =   TransactieBlok(transacties)
+    del blok["t002"]
+    del transacties["t002"]
+    
+    assert "t002" not in blok
+    assert naar_json(blok) == naar_json(transacties)
+    assert blok["t008"].details == {"locatie_uuid": "l1"}
+    assert blok["t009"].details == {}
+
+def test_aantal_op_en_zoeken(transacties):
+    
+    blok    =   TransactieBlok(transacties)
+    
+    for datum in {transactie.datumtijd.date() for transactie in transacties.values()}:
+        assert blok.aantal_op(datum) == sum(1 for transactie in transacties.values() if transactie.datumtijd.date() == datum)
+    assert blok.aantal_op(dt.date(2030, 1, 1)) == 0
+    
+    assert blok.zoeken("derde_uuid", ["r2", "p1"]) == [transactie_uuid for transactie_uuid, transactie in transacties.items() if transactie.derde_uuid in ("r2", "p1")]
+    assert blok.zoeken("cat_uuid", ["bestaat niet"]) == []
+
+def test_kolommen_typen(transacties):
+    
+    kolommen    =   TransactieBlok(transacties).kolommen()
+    
+    assert kolommen["datumtijd"].dtype == "datetime64[ns]"
+    assert all(kolommen[veld].dtype == "int64" for veld in ("index", "bedrag", "beginsaldo", "eindsaldo", "dagindex"))
+    assert isinstance(kolommen["cat_uuid"].dtype, pd.CategoricalDtype)
+    assert kolommen["derde_uuid"].isna().sum() == sum(1 for transactie in transacties.values() if transactie.derde_uuid is None)
+
+def test_volgorde_naar_json_transactie(transacties):
+    
+    assert list(transacties["t000"].naar_json()) == VOLGORDE_TRANSACTIE
+    assert list(transacties["t003"].naar_json()) == [*VOLGORDE_TRANSACTIE, "details"]
+    assert list(TransactieBlok(transacties)["t003"].naar_json()) == [*VOLGORDE_TRANSACTIE, "details"]
+
+@pytest.mark.parametrize("waarde, volgorde", VOLGORDE_TYPES, ids = [type(waarde).__name__ for waarde, _ in VOLGORDE_TYPES])
+def test_volgorde_naar_json_types(waarde, volgorde):
+    
+    assert list(waarde.naar_json()) == volgorde
\ No newline at end of file
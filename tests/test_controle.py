@@ -0,0 +1,78 @@
+from platus.gegevens.blok import TransactieBlok
+from platus.gegevens.controle import controleren_kolommen, controleren_rekeningen, geldige_verwijzingen
+from platus.gegevens.opslag import opslag
+
+
+def kolommen_van(transacties: dict):
+    
+    kolommen    =   TransactieBlok(transacties).kolommen()
+    for veld in ("uuid", "cat_uuid", "derde_uuid"):
+        kolommen[veld]  =   kolommen[veld].astype(object)
+    return kolommen
+
+def test_sluitende_rekening(transacties):
+    
+    assert controleren_kolommen(kolommen_van(transacties), geldige_verwijzingen()) == []
+
+def test_eerste_breuk_per_controle(transacties):
+    
+    kolommen    =   kolommen_van(transacties)
+    
+    kolommen.at[50, "details"]      =   {"locatie_uuid": "nergens"}
+    kolommen.loc[100, "beginsaldo"] +=  1
+    kolommen.loc[100, "eindsaldo"]  +=  1
+    kolommen.loc[120, "eindsaldo"]  +=  1
+    kolommen.loc[150, "cat_uuid"]   =   "weg"
+    kolommen.loc[151, "derde_uuid"] =   "weg"
+    kolommen.loc[200, "dagindex"]   =   99
+    
+    breuken =   controleren_kolommen(kolommen, geldige_verwijzingen())
+    
+    assert [(breuk.controle, breuk.positie, breuk.aantal) for breuk in breuken] == [
+        ("locatie_uuid", 50, 1),
+        ("keten", 100, 3),
+        ("saldo", 120, 1),
+        ("cat_uuid", 150, 1),
+        ("derde_uuid", 151, 1),
+        ("dagindex", 200, 1),
+        ]
+    assert [breuk.transactie_uuid for breuk in breuken] == ["t050", "t100", "t120", "t150", "t151", "t200"]
+    assert breuken[1].melding == f"beginsaldo {kolommen.loc[100, "beginsaldo"]} != eindsaldo vorige transactie {kolommen.loc[99, "eindsaldo"]}"
+
+def test_ontbrekende_index(transacties):
+    
+    del transacties["t010"]
+    
+    breuken =   controleren_kolommen(kolommen_van(transacties), geldige_verwijzingen())
+    
+    assert (breuken[0].controle, breuken[0].positie, breuken[0].transactie_uuid) == ("index", 10, "t011")
+    assert breuken[0].aantal == len(transacties) - 10
+
+def test_dagindex_op_dezelfde_dag(transacties):
+    
+    # twee transacties op dezelfde dag met verwisselde dagindex
+    kolommen    =   kolommen_van(transacties)
+    dag         =   kolommen["datumtijd"].dt.normalize()
+    positie     =   next(positie for positie in range(1, len(kolommen)) if dag[positie] == dag[positie - 1])
+    kolommen.loc[positie - 1, "dagindex"], kolommen.loc[positie, "dagindex"]    =   1, 0
+    
+    breuken =   controleren_kolommen(kolommen, geldige_verwijzingen())
+    
+    assert [(breuk.controle, breuk.positie, breuk.aantal) for breuk in breuken] == [("dagindex", positie - 1, 2)]
+
+def test_controleren_rekeningen(transacties):
+    
+    opslag().opslaan("r1", transacties)
+    transacties["t030"].cat_uuid    =   "weg"
+    opslag().opslaan("r2", transacties)
+    
+    serieel     =   controleren_rekeningen(processen = 1)
+    parallel    =   controleren_rekeningen(processen = 2)
+    
+    assert serieel == parallel
+    assert serieel["r1"] == []
+    assert [(breuk.controle, breuk.positie, breuk.transactie_uuid) for breuk in serieel["r2"]] == [("cat_uuid", 30, "t030")]
+
+def test_geen_opgeslagen_rekeningen(referenties):
+    
+    assert controleren_rekeningen(processen = 1) == {}
\ No newline at end of file
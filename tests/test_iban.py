@@ -0,0 +1,93 @@
+import re
+
+import pandas as pd
+import pytest
+
+from platus.gegevens.gereedschap import iban_zoeker
+from platus.gegevens.iban import controleren_iban, kandidaten_iban, zoeken_iban, zoeken_iban_bulk
+
+
+# voorbeeld-IBAN's met een geldig controlegetal
+GELDIG  =   [
+    "NL91ABNA0417164300",
+    "BE68539007547034",
+    "DE89370400440532013000",
+    "GB29NWBK60161331926819",
+    "FR1420041010050500013M02606",
+    "CH9300762011623852957",
+    "AT611904300234573201",
+    "ES9121000418450200051332",
+    "IT60X0542811101000000123456",
+    "LU280019400644750000",
+    "CZ6508000000192000145399",
+    ]
+
+def iban_zoeker_oud(tekst: str) -> str:
+    
+    # iban_zoeker van vóór het ene patroon met mod-97-controle
+    patronen_iban   =   [
+        r".*(NL\d{2}[A-Z]{4}\d{10}).*",
+        r".*(BE\d{14}).*",
+        r".*(AT\d{18}).*",
+        r".*(CZ\d{22}).*",
+        r".*(FR\d{12}[0-9A-Z]{11}\d{2}).*",
+        r".*(DE\d{20}).*",
+        r".*(IT\d{2}[A-Z]\d{10}[0-9A-Z]{12}).*",
+        r".*(LU\d{5}[0-9A-Z]{13}).*",
+        r".*(ES\d{22}).*",
+        r".*(GB\d{2}[A-Z]{4}\d{14}).*",
+        r".*(CH\d{7}[0-9A-Z]{12}).*",
+        ]
+    
+    for patroon_iban in patronen_iban:
+        resultaat_iban  =   re.compile(patroon_iban).match(tekst.upper().replace(" ", ""))
+        if bool(resultaat_iban):
+            return resultaat_iban.group(1)
+    
+    raise NotImplementedError(f"tekst: \"{tekst}\"")
+
+@pytest.mark.parametrize("iban", GELDIG)
+def test_controleren_iban_geldig(iban):
+    
+    assert controleren_iban(iban)
+    assert controleren_iban(" ".join(iban[positie:positie + 4] for positie in range(0, len(iban), 4)).lower())
+
+@pytest.mark.parametrize("iban", GELDIG)
+def test_controleren_iban_ongeldig(iban):
+    
+    # één cijfer anders, te kort of een onbekend land
+    cijfer  =   next(positie for positie in range(4, len(iban)) if iban[positie].isdigit())
+    
+    assert not controleren_iban(iban[:cijfer] + str((int(iban[cijfer]) + 1) % 10) + iban[cijfer + 1:])
+    assert not controleren_iban(iban[:-1])
+    assert not controleren_iban("XX" + iban[2:])
+
+def test_zoeken_iban_op_volgorde_van_voorkomen():
+    
+    tekst   =   "van BE68 5390 0754 7034 naar nl91abna0417164300 via NL91ABNA0417164301"
+    
+    assert kandidaten_iban(tekst) == ["BE68539007547034", "NL91ABNA0417164300", "NL91ABNA0417164301"]
+    assert zoeken_iban(tekst) == ["BE68539007547034", "NL91ABNA0417164300"]
+
+def test_zoeken_iban_bulk():
+    
+    teksten =   pd.Series([f"IBAN: {iban} BIC: XXX" for iban in GELDIG] + ["geen", None, "NL91ABNA0417164301"], dtype = object)
+    
+    assert zoeken_iban_bulk(teksten).tolist() == [zoeken_iban(tekst or "") for tekst in teksten]
+    assert zoeken_iban_bulk(list(teksten.fillna(""))).tolist() == zoeken_iban_bulk(teksten).tolist()
+
+@pytest.mark.parametrize("iban", GELDIG)
+def test_iban_zoeker_gelijk_aan_oud(iban):
+    
+    for tekst in (f"SEPA Overboeking IBAN: {iban} BIC: ABNANL2A Naam: J Jansen", f"/TRTP/SEPA OVERBOEKING/IBAN/{iban}/BIC/ABNANL2A/NAME/J Jansen", iban):
+        assert iban_zoeker(tekst) == iban_zoeker_oud(tekst) == iban
+
+def test_iban_zoeker_zonder_geldig_controlegetal():
+    
+    with pytest.warns(UserWarning):
+        assert iban_zoeker("Naam: x IBAN: NL91ABNA0417164301 BIC") == "NL91ABNA0417164301"
+
+def test_iban_zoeker_zonder_iban():
+    
+    with pytest.raises(NotImplementedError):
+        iban_zoeker("geen rekeningnummer")
\ No newline at end of file
@@ -0,0 +1,135 @@
+import copy
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from platus.gegevens.blok import TransactieBlok
+from platus.gegevens.kubus import DIMENSIES, Kubus, draaien, maken_kubus, versie_referenties, waarde
+from platus.gegevens.opslag import opslag
+from platus.gegevens.rekening import Bankrekening
+from platus.gegevens.tabel import laden_tabel, maken_tabel, referentietabellen
+from .conftest import REFERENTIES
+
+
+def naar_tabel(transacties: dict) -> pd.DataFrame:
+    
+    # de tabel zoals de weergave en het rapport die vóór de kubus filterden
+    tabel           =   pd.DataFrame(transactie.naar_tabel() for transactie in sorted(transacties.values(), key = lambda transactie: transactie.index))
+    tabel["jaar"]   =   tabel["datumtijd"].dt.strftime("%Y")
+    return tabel
+
+def test_kubus_gelijk_aan_groeperen(transacties):
+    
+    tabel   =   naar_tabel(transacties)
+    kubus   =   maken_kubus(maken_tabel(TransactieBlok(transacties).kolommen()))
+    
+    verwacht    =   tabel.assign(
+        jaar        =   tabel["datumtijd"].dt.year,
+        maand       =   tabel["datumtijd"].dt.month,
+        richting    =   np.select([tabel["bedrag"] > 0, tabel["bedrag"] < 0], ["inkomsten", "uitgaven"], "nul"),
+        ).groupby(DIMENSIES, dropna = False).agg(bedrag = ("bedrag", "sum"), aantal = ("bedrag", "size")).reset_index()
+    
+    assert kubus["aantal"].sum() == len(tabel)
+    assert kubus[DIMENSIES].astype(str).values.tolist() == verwacht[DIMENSIES].astype(str).values.tolist()
+    np.testing.assert_allclose(kubus["bedrag"].to_numpy() / 100, verwacht["bedrag"].to_numpy(), atol = 1e-6)
+    assert kubus["aantal"].tolist() == verwacht["aantal"].tolist()
+
+@pytest.mark.parametrize("jaar", [2023, 2024])
+def test_waarde_gelijk_aan_filteren(transacties, jaar):
+    
+    tabel   =   naar_tabel(transacties)
+    kubus   =   maken_kubus(maken_tabel(TransactieBlok(transacties).kolommen()))
+    in_jaar =   tabel["datumtijd"].dt.year == jaar
+    
+    # zoals de kengetallen van de weergave vóór de kubus
+    assert waarde(kubus, uitsluiten = ["interne overboeking"], jaar = jaar, richting = "inkomsten") == pytest.approx(tabel.loc[in_jaar & (tabel["categorie"] != "interne overboeking") & (tabel["bedrag"] > 0.0)]["bedrag"].sum())
+    assert waarde(kubus, uitsluiten = ["interne overboeking"], jaar = jaar, richting = "uitgaven") == pytest.approx(tabel.loc[in_jaar & (tabel["categorie"] != "interne overboeking") & (tabel["bedrag"] < 0.0)]["bedrag"].sum())
+    assert waarde(kubus, jaar = jaar, hoofdcategorie = "vaste lasten") == pytest.approx(tabel.loc[in_jaar & (tabel["hoofdcategorie"] == "vaste lasten")]["bedrag"].sum())
+    assert waarde(kubus, jaar = jaar, maand = [1, 2, 3], type = ["persoon", "bedrijf"]) == pytest.approx(tabel.loc[in_jaar & tabel["datumtijd"].dt.month.isin([1, 2, 3]) & tabel["type"].isin(["persoon", "bedrijf"])]["bedrag"].sum())
+    assert waarde(kubus, jaar = 1999) == 0
+
+@pytest.mark.parametrize("kolommen, richting, filters", [
+    ("hoofdcategorie", "uitgaven", {}),
+    ("categorie", "inkomsten", {}),
+    ("derde", "uitgaven", {"type": "bedrijf"}),
+    ("derde", "uitgaven", {"type": "persoon"}),
+    ])
+def test_draaien_gelijk_aan_pivot_table(transacties, kolommen, richting, filters):
+    
+    tabel       =   naar_tabel(transacties)
+    kubus       =   maken_kubus(maken_tabel(TransactieBlok(transacties).kolommen()))
+    selectie    =   ((tabel["bedrag"] < 0.0) if richting == "uitgaven" else (tabel["bedrag"] > 0.0)) & (tabel["categorie"] != "interne overboeking")
+    for dimensie, waarde_filter in filters.items():
+        selectie    &=  tabel[dimensie] == waarde_filter
+    
+    # zoals de tabellen van het rapport vóór de kubus
+    oud     =   tabel[selectie].pivot_table("bedrag", ["jaar", kolommen], aggfunc = "sum").reset_index().pivot(index = "jaar", columns = kolommen, values = "bedrag")
+    nieuw   =   draaien(kubus, "jaar", kolommen, uitsluiten = ["interne overboeking"], richting = richting, **filters).rename(index = str)
+    
+    pd.testing.assert_frame_equal(nieuw, oud, check_exact = False)
+
+def test_bijwerken_per_maand_gelijk_aan_opnieuw(transacties):
+    
+    eerste  =   {transactie_uuid: transactie for transactie_uuid, transactie in transacties.items() if transactie.datumtijd < dt.datetime(2024, 1, 15)}
+    nieuw   =   [transactie_uuid for transactie_uuid in transacties if transactie_uuid not in eerste]
+    kubus   =   Kubus("r1")
+    
+    opslag().opslaan("r1", eerste)
+    kubus.bijwerken(TransactieBlok(eerste))
+    
+    # de nieuwe transacties beginnen halverwege een maand die al in de kubus staat
+    opslag().opslaan("r1", transacties, nieuw = nieuw)
+    kubus.bijwerken(TransactieBlok(transacties), {(transacties[transactie_uuid].datumtijd.year, transacties[transactie_uuid].datumtijd.month) for transactie_uuid in nieuw})
+    
+    _, bijgewerkt   =   kubus.lezen()
+    pd.testing.assert_frame_equal(bijgewerkt, maken_kubus(laden_tabel("r1")))
+    assert kubus.geldig()
+
+def test_openen_bouwt_alleen_opnieuw_op_bij_andere_versie(transacties, gegevens):
+    
+    opslag().opslaan("r1", transacties)
+    kubus   =   Kubus("r1")
+    
+    pd.testing.assert_frame_equal(kubus.openen(), maken_kubus(laden_tabel("r1")))
+    tijd    =   os.stat(kubus.pad).st_mtime_ns
+    kubus.openen()
+    assert os.stat(kubus.pad).st_mtime_ns == tijd
+    
+    # een andere naam van een categorie maakt de kubus ongeldig
+    categorieen                 =   copy.deepcopy(REFERENTIES["categorie"])
+    categorieen["c1"]["naam"]   =   "wonen"
+    gegevens("categorie", categorieen)
+    
+    assert not kubus.geldig()
+    assert "wonen" in set(kubus.openen()["categorie"])
+    assert kubus.geldig()
+
+def test_versie_referenties(referenties, gegevens):
+    
+    versie  =   versie_referenties(referentietabellen())
+    
+    # een andere kleur telt niet mee, een verwisseling van namen wel
+    categorieen                 =   copy.deepcopy(REFERENTIES["categorie"])
+    categorieen["c1"]["kleur"]  =   "#ffffff"
+    gegevens("categorie", categorieen)
+    assert versie_referenties(referentietabellen()) == versie
+    
+    categorieen["c1"]["naam"], categorieen["c2"]["naam"]    =   categorieen["c2"]["naam"], categorieen["c1"]["naam"]
+    gegevens("categorie", categorieen)
+    assert versie_referenties(referentietabellen()) != versie
+
+def test_rekening_opslaan_werkt_kubus_bij(transacties):
+    
+    opslag().opslaan("r1", transacties)
+    bankrekening    =   Bankrekening.openen("r1")
+    
+    transactie          =   bankrekening.transacties["t001"]
+    transactie.cat_uuid =   "c1"
+    bankrekening.transacties["t001"]    =   transactie
+    bankrekening.opslaan(volledig = True)
+    
+    pd.testing.assert_frame_equal(Kubus("r1").openen(), maken_kubus(laden_tabel("r1")))
+    assert laden_tabel("r1").loc[1, "categorie"] == "huur"
\ No newline at end of file
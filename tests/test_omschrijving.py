@@ -0,0 +1,78 @@
+import pytest
+
+from platus.gegevens.omschrijving import Ontleder, ontleder
+
+
+# per formaat een omschrijving zoals in de bankexport en de velden die het
+# patroon van vóór de Ontleder eruit haalde
+OMSCHRIJVINGEN  =   [
+    ("rente 01-01-2024 t/m 31-03-2024",                                                                                                 "rente",        {}),
+    ("BEA, Betaalpas   Albert Heijn 1234,PAS123 NR:AB12C3, 05.01.24/14:30 Utrecht",                                                     "pinbetaling",  {"derde_naam": "Albert Heijn 1234", "pasnummer": "123", "locatie": "Utrecht"}),
+    ("GEA, Betaalpas   Geldmaat Utrecht,PAS123 NR:GM0001, 05.01.24/14:30 Utrecht",                                                      "geldopname",   {"derde_naam": "Geldmaat Utrecht", "pasnummer": "123", "locatie": "Utrecht"}),
+    ("SEPA Overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen Betalingskenm.: 123456",                                    "overboeking",  {"iban": "NL91ABNA0417164300", "bic": "ABNANL2A", "betalingskenmerk": "123456"}),
+    ("SEPA Overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen Omschrijving: huur januari Kenmerk: 42",                    "overboeking",  {"iban": "NL91ABNA0417164300", "betalingsomschrijving": "huur januari ", "betalingskenmerk": "42"}),
+    ("SEPA Overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen Omschrijving: huur januari",                                "overboeking",  {"iban": "NL91ABNA0417164300", "betalingsomschrijving": "huur januari"}),
+    ("SEPA Overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen",                                                          "overboeking",  {"iban": "NL91ABNA0417164300", "naam": "J Jansen"}),
+    ("/TRTP/SEPA OVERBOEKING/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/J Jansen/REMI/lunch/EREF/NOTPROVIDED",                           "overboeking",  {"iban": "NL91ABNA0417164300", "naam": "J Jansen", "betalingsomschrijving": "lunch", "betalingskenmerk": "NOTPROVIDED"}),
+    ("/TRTP/SEPA OVERBOEKING/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/J Jansen/EREF/NOTPROVIDED",                                      "overboeking",  {"naam": "J Jansen", "betalingskenmerk": "NOTPROVIDED"}),
+    ("SEPA iDEAL IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: Winkel Omschrijving: bestelling 1 Kenmerk: 05-01-2024 14:30 0050001",     "ideal",        {"naam": "Winkel ", "datumtijd": "05-01-2024 14:30", "betalingskenmerk": "0050001"}),
+    ("/TRTP/iDEAL/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/Winkel/REMI/bestelling 1/EREF/05-01-2024 14:30 0050001",                    "ideal",        {"naam": "Winkel", "betalingsomschrijving": "bestelling 1", "datumtijd": "05-01-2024 14:30"}),
+    ("SEPA Incasso algemeen doorlopend Incassant: NL00ZZZ Naam: Energie Machtiging: M1 Omschrijving: termijn IBAN: NL91ABNA0417164300",  "incasso",      {"incassant": "NL00ZZZ ", "machtiging": "M1 ", "iban": "NL91ABNA0417164300"}),
+    ("ABN AMRO Bank N.V.               Basic Package",                                                                                  "bankkosten",   {}),
+    ]
+
+@pytest.mark.parametrize("omschrijving, formaat, velden", OMSCHRIJVINGEN, ids = [f"{formaat}-{positie}" for positie, (_, formaat, _) in enumerate(OMSCHRIJVINGEN)])
+def test_ontleden(omschrijving, formaat, velden):
+    
+    resultaat   =   ontleder.ontleden(omschrijving)
+    
+    assert resultaat.formaat == formaat
+    assert {veld: resultaat.velden.get(veld) for veld in velden} == velden
+
+def test_prefix_zonder_hoofdletters():
+    
+    assert ontleder.ontleden("sepa overboeking IBAN: NL91ABNA0417164300 BIC: ABNANL2A Naam: J Jansen").formaat == "overboeking"
+    assert ontleder.ontleden("Rente").formaat == "rente"
+
+def test_langste_prefix_gaat_voor():
+    
+    proef   =   Ontleder().registreren("kort", "SEPA").registreren("lang", "SEPA iDEAL").registreren("ander", "SEPAX")
+    
+    assert proef.ontleden("SEPA iDEAL IBAN").formaat == "lang"
+    assert proef.ontleden("SEPA Overboeking").formaat == "kort"
+    assert proef.ontleden("sepax").formaat == "ander"
+
+def test_prefix_enkel_aan_het_begin():
+    
+    with pytest.raises(NotImplementedError):
+        ontleder.ontleden("Omschrijving: rente")
+
+def test_eerste_passende_variant():
+    
+    proef   =   Ontleder().registreren("soort", "X", [
+        (("a:", "b:"),  r"^X a:(?P<a>\S+) b:(?P<b>\S+)$"),
+        (("a:",),       r"^X a:(?P<a>\S+)"),
+        ((),            r"^X"),
+        ])
+    
+    assert proef.ontleden("X a:1 b:2").velden == {"a": "1", "b": "2"}
+    assert proef.ontleden("X a:1 c:2").velden == {"a": "1"}
+    assert proef.ontleden("X").velden == {}
+
+def test_variant_past_niet():
+    
+    proef   =   Ontleder().registreren("soort", "X", [(("a:",), r"^X a:(?P<a>\d+)$")])
+    
+    with pytest.raises(ValueError):
+        proef.ontleden("X a:geen getal")
+
+def test_treffers_tijden_en_meters():
+    
+    gemeten =   []
+    proef   =   Ontleder().registreren("een", "1").registreren("twee", "2").toevoegen_meter(lambda formaat, duur: gemeten.append((formaat, duur)))
+    
+    for omschrijving in ("1", "2", "2"):
+        proef.meten(proef.ontleden(omschrijving).formaat, 0.5)
+    
+    assert proef.statistiek() == {"twee": (2, 1.0), "een": (1, 0.5)}
+    assert gemeten == [("een", 0.5), ("twee", 0.5), ("twee", 0.5)]
\ No newline at end of file
@@ -0,0 +1,150 @@
+from contextlib import closing
+import datetime as dt
+import os
+import sqlite3
+
+import pytest
+
+from platus.gegevens.opslag import KOLOMMEN, JsonOpslag, opslag
+from platus.gegevens.transactie import Transactie
+
+
+def maken_transacties(aantal: int) -> dict:
+    
+    transacties =   {}
+    saldo       =   0
+    
+    for index in range(aantal):
+        transacties[f"t{index}"]    =   Transactie(
+            index               =   index,
+            bedrag              =   100 * (index + 1),
+            beginsaldo          =   saldo,
+            eindsaldo           =   saldo + 100 * (index + 1),
+            transactiemethode   =   "overboeking",
+            datumtijd           =   dt.datetime(2024, 1, 1 + index),
+            cat_uuid            =   "c",
+            derde_uuid          =   "d",
+            details             =   {"betalingsomschrijving": f"regel {index}"} if index % 2 else None,
+            )
+        saldo   +=  100 * (index + 1)
+    
+    return transacties
+
+def naar_json(transacties: dict) -> dict:
+    return {transactie_uuid: transactie.naar_json() for transactie_uuid, transactie in transacties.items()}
+
+def regels(pad: str) -> int:
+    
+    with open(pad, "r", encoding = "utf-8") as bestand:
+        return sum(1 for _ in bestand)
+
+def test_journaal_wordt_aangevuld_en_afgespeeld():
+    
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(5)
+    
+    opslag.opslaan("r", transacties, nieuw = ["t0", "t1", "t2"])
+    
+    assert not os.path.exists(opslag.pad("r"))
+    assert regels(opslag.pad_journaal("r")) == 3
+    assert naar_json(opslag.openen("r")) == naar_json({transactie_uuid: transacties[transactie_uuid] for transactie_uuid in ("t0", "t1", "t2")})
+    
+    opslag.opslaan("r", transacties, nieuw = ["t3", "t4"])
+    
+    assert regels(opslag.pad_journaal("r")) == 5
+    assert naar_json(opslag.openen("r")) == naar_json(transacties)
+    assert list(opslag.kolommen("r")["uuid"]) == list(transacties.keys())
+
+def test_journaal_gaat_voor_op_basisbestand():
+    
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(3)
+    
+    opslag.opslaan("r", transacties)
+    transacties["t1"].cat_uuid  =   "gewijzigd"
+    opslag.opslaan("r", transacties, nieuw = ["t1"])
+    
+    assert opslag.openen("r")["t1"].cat_uuid == "gewijzigd"
+    assert opslag.kolommen("r")["cat_uuid"].tolist() == ["c", "gewijzigd", "c"]
+
+def test_half_geschreven_regel_wordt_genegeerd():
+    
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(3)
+    
+    opslag.opslaan("r", transacties, nieuw = list(transacties.keys()))
+    with open(opslag.pad_journaal("r"), "a", encoding = "utf-8") as bestand:
+        bestand.write("{\"uuid\": \"t9\", \"transac")
+    
+    assert naar_json(opslag.openen("r")) == naar_json(transacties)
+
+def test_compacteren():
+    
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(4)
+    
+    opslag.opslaan("r", transacties, nieuw = list(transacties.keys()))
+    voor        =   naar_json(opslag.openen("r"))
+    opslag.compacteren("r")
+    
+    assert not os.path.exists(opslag.pad_journaal("r"))
+    assert sorted(os.listdir(opslag.map)) == ["r.json"]
+    assert naar_json(opslag.openen("r")) == voor == naar_json(transacties)
+
+def test_compacteren_na_onderbreking():
+    
+    # onderbroken na het vervangen van het basisbestand, vóór het verwijderen
+    # van het journaal: opnieuw afspelen geeft hetzelfde resultaat
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(4)
+    
+    opslag.opslaan("r", transacties, nieuw = list(transacties.keys()))
+    with open(opslag.pad_journaal("r"), "r", encoding = "utf-8") as bestand:
+        journaal    =   bestand.read()
+    opslag.compacteren("r")
+    with open(opslag.pad_journaal("r"), "w", encoding = "utf-8") as bestand:
+        bestand.write(journaal)
+    
+    assert naar_json(opslag.openen("r")) == naar_json(transacties)
+
+def test_compacteren_vanaf_drempel(gegevens):
+    
+    gegevens("opslag", {"formaat": "json", "journaal_compacteren": 3})
+    
+    opslag      =   JsonOpslag()
+    transacties =   maken_transacties(3)
+    
+    opslag.opslaan("r", transacties, nieuw = ["t0", "t1"])
+    assert os.path.exists(opslag.pad_journaal("r"))
+    
+    opslag.opslaan("r", transacties, nieuw = ["t2"])
+    assert not os.path.exists(opslag.pad_journaal("r"))
+    assert naar_json(opslag.openen("r")) == naar_json(transacties)
+
+@pytest.mark.parametrize("formaat", ["json", "parquet", "sqlite"])
+def test_rekening_zonder_transacties(formaat):
+    
+    # een net aangemaakte rekening wordt met {} opgeslagen
+    opslag(formaat).opslaan("r", {})
+    
+    assert opslag(formaat).bestaat("r")
+    assert list(opslag(formaat).kolommen("r").columns) == KOLOMMEN
+    assert len(opslag(formaat).blok("r")) == 0
+    assert opslag(formaat).openen("r") == {}
+
+def test_sqlite_backup_per_rekening():
+    
+    opslag_sqlite   =   opslag("sqlite")
+    transacties     =   maken_transacties(3)
+    
+    opslag_sqlite.opslaan("r", transacties)
+    opslag_sqlite.opslaan("s", maken_transacties(2))
+    opslag_sqlite.backup("r", transacties)
+    opslag_sqlite.backup("s", {})
+    
+    # elk een eigen bestand met enkel de eigen rekening
+    for rekening_uuid, aantal in (("r", 3), ("s", 0)):
+        with closing(sqlite3.connect(opslag_sqlite.pad_backup(rekening_uuid))) as verbinding:
+            assert verbinding.execute("SELECT DISTINCT rekening_uuid FROM rekening").fetchall() == [(rekening_uuid,)]
+            assert verbinding.execute("SELECT COUNT(*) FROM transactie").fetchone()[0] == aantal
+    assert opslag_sqlite.pad_backup("r") != opslag_sqlite.pad_backup("s")
\ No newline at end of file
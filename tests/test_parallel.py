@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytest
+
+from platus.gegevens.bankexport import BankexportRij
+from platus.gegevens.cpsp import cpsp_herkenner
+from platus.gegevens.omschrijving import ontleder
+from platus.gegevens.parallel import ontleden_parallel
+from platus.gegevens.register import register
+from platus.gegevens.transactie import Transactie
+
+
+# per soort rij een omschrijving; een betaalverzoek leert het IBAN van de bank
+# en een betaling via Mollie het IBAN van de cpsp, elk met wisselende IBAN's
+# zodat verschillende werkprocessen dezelfde en andere IBAN's leren
+OMSCHRIJVINGEN  =   [
+    lambda positie: "rente 01-01-2024 t/m 31-03-2024",
+    lambda positie: f"BEA, Betaalpas   Albert Heijn,PAS123 NR:AB12C3, 05.01.24/14:{positie:02d} Utrecht",
+    lambda positie: f"/TRTP/SEPA OVERBOEKING/IBAN/NL91ABNA0417164300/BIC/ABNANL2A/NAME/Jan/REMI/huur {positie}/EREF/NOTPROVIDED",
+    lambda positie: f"/TRTP/iDEAL/IBAN/NL00MOLL000000000{positie // 6 % 3}/BIC/ABNANL2A/NAME/Stichting Mollie Payments/REMI/bestelling {positie}/EREF/05-01-2024 14:30 00{positie:05d}",
+    lambda positie: f"/TRTP/iDEAL/IBAN/NL00RABO000000000{positie // 6 % 4}/BIC/RABONL2U/NAME/Rabobank betaalverzoek/REMI/00{positie:05d} Piet NL44RABO0123456789/EREF/05-01-2024 14:30 00{positie:05d}",
+    lambda positie: "ABN AMRO Bank N.V.               Basic Package",
+    ]
+
+class Terugdraaien(Exception):
+    pass
+
+@pytest.fixture
+def export(referenties, gegevens):
+    
+    gegevens("cpsp", {"mollie": {"naam": "Mollie", "synoniemen": [], "uitsluiten": False, "rekeningnummer": [], "iban": []}})
+    gegevens("bank", {"rabo": {"naam": "Rabobank", "synoniemen": [], "rekeningnummer": [], "iban": ["NL00RABO0000000000"], "bic": []}})
+    
+    rijen   =   []
+    saldo   =   100.0
+    
+    for positie in range(60):
+        bedrag  =   round(1.25 * (positie % 7 - 3), 2)
+        rijen.append(BankexportRij(123456789, "EUR", 20240105, 20240105, saldo, round(saldo + bedrag, 2), bedrag, OMSCHRIJVINGEN[positie % len(OMSCHRIJVINGEN)](positie)))
+        saldo   =   round(saldo + bedrag, 2)
+    
+    return rijen
+
+def ontleden(
+    rijen       :   list,
+    processen   :   int,
+    ) -> tuple:
+    
+    # de transacties, wat er is geleerd en de statistiek van de ontleder; de
+    # sessie wordt daarna teruggedraaid, zodat de volgende keer opnieuw leert
+    treffers    =   Counter(ontleder.treffers)
+    gemeten     =   Counter()
+    ontleder.toevoegen_meter(lambda formaat, duur: gemeten.update([formaat]))
+    
+    try:
+        with pytest.raises(Terugdraaien):
+            with register.sessie():
+                if processen == 1:
+                    transacties =   [Transactie.van_bankexport(rij) for rij in rijen]
+                else:
+                    transacties =   list(ontleden_parallel(rijen, processen, grootte = 4))
+                geleerd =   {
+                    "cpsp": {cpsp_uuid: sorted(ibans) for cpsp_uuid, ibans in cpsp_herkenner.geleerd.items()},
+                    "bank": {bank_uuid: sorted(bank.iban) for bank_uuid, bank in register["bank"].items()},
+                    }
+                raise Terugdraaien
+    finally:
+        ontleder.meters.pop()
+        cpsp_herkenner.geleerd  =   {}
+    
+    return [(transactie.naar_json(), transactie.tijdelijk) for transactie in transacties], geleerd, dict(ontleder.treffers - treffers), dict(gemeten)
+
+def test_parallel_gelijk_aan_serieel(export):
+    
+    transacties_serieel, geleerd_serieel, treffers_serieel, gemeten_serieel     =   ontleden(export, 1)
+    transacties_parallel, geleerd_parallel, treffers_parallel, gemeten_parallel =   ontleden(export, 2)
+    
+    assert transacties_parallel == transacties_serieel
+    assert treffers_parallel == treffers_serieel == {"rente": 10, "pinbetaling": 10, "overboeking": 10, "ideal": 20, "bankkosten": 10}
+    assert gemeten_parallel == gemeten_serieel == treffers_serieel
+    
+    # de geleerde IBAN's van banken en cpsp's komen terug in het hoofdproces
+    assert geleerd_parallel == geleerd_serieel
+    assert geleerd_serieel["cpsp"] == {"mollie": [f"NL00MOLL000000000{rest}" for rest in range(3)]}
+    assert geleerd_serieel["bank"] == {"rabo": [f"NL00RABO000000000{rest}" for rest in range(4)]}
+    
+    # en zijn na het terugdraaien weer weg
+    assert list(register["bank"]["rabo"].iban) == ["NL00RABO0000000000"]
+
+def test_fout_in_werkproces(export):
+    
+    # de fout van een rij komt in het hoofdproces, na de rijen ervoor
+    export[13]  =   export[13]._replace(muntsoort = "USD")
+    transacties =   []
+    
+    with pytest.raises(NotImplementedError):
+        with register.sessie():
+            for transactie in ontleden_parallel(export, 2, grootte = 4):
+                transacties.append(transactie)
+    
+    assert len(transacties) == 13
\ No newline at end of file
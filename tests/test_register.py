@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+from platus.gegevens.register import register
+
+
+def lezen(tabel: str) -> dict:
+    
+    map, naam, _, _ =   register.tabellen[tabel]
+    with open(os.path.join(map, f"{naam}.json"), "r", encoding = "utf-8") as bestand:
+        return json.load(bestand)
+
+def test_vastleggen_bij_buitenste_einde(referenties):
+    
+    with register.sessie():
+        with register.sessie():
+            register.opslaan("salaris", {"a": 1})
+            register.opslaan("land", {})
+        
+        # de binnenste sessie legt nog niets vast
+        assert lezen("salaris") == {}
+        assert register["salaris"] == {"a": 1}
+        
+        register.opslaan("salaris", {"a": 2})
+    
+    assert lezen("salaris") == {"a": 2}
+    assert lezen("land") == {}
+    assert register["land"] == {}
+
+def test_terugdraaien_bij_fout(referenties):
+    
+    geschreven  =   []
+    register.bij_schrijven.append(lambda tabel, waarden: geschreven.append(tabel))
+    
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            with register.sessie():
+                register.opslaan("salaris", {"a": 1})
+                with register.sessie():
+                    register.opslaan("land", {})
+                    raise KeyboardInterrupt
+    finally:
+        register.bij_schrijven.pop()
+    
+    # de bestanden en de tabellen zijn als vóór de sessie
+    assert lezen("salaris") == {}
+    assert register["salaris"] == {}
+    assert set(register["land"].keys()) == {"nl"}
+    assert geschreven == []
+    assert not os.path.exists(os.path.join("gegevens\\configuratie", "salaris.nieuw.json"))
+    
+    # ook daarna gaat opslaan weer meteen naar het bestand
+    register.opslaan("salaris", {"b": 1})
+    assert lezen("salaris") == {"b": 1}
+
+def test_fout_in_binnenste_sessie_die_wordt_afgevangen(referenties):
+    
+    # enkel de buitenste sessie draait terug, een afgevangen fout binnenin
+    # laat de eerdere wijzigingen staan
+    with register.sessie():
+        register.opslaan("salaris", {"a": 1})
+        try:
+            with register.sessie():
+                raise ValueError
+        except ValueError:
+            pass
+    
+    assert lezen("salaris") == {"a": 1}
+
+def test_vastleggen_als_controlepunt(referenties):
+    
+    with pytest.raises(KeyboardInterrupt):
+        with register.sessie():
+            register.opslaan("salaris", {"a": 1})
+            register.vastleggen()
+            assert lezen("salaris") == {"a": 1}
+            
+            register.opslaan("salaris", {"a": 2})
+            raise KeyboardInterrupt
+    
+    # terug naar het laatste controlepunt
+    assert lezen("salaris") == {"a": 1}
+    assert register["salaris"] == {"a": 1}
+
+def test_bij_schrijven_na_vervangen(referenties):
+    
+    geschreven  =   []
+    register.bij_schrijven.append(lambda tabel, waarden: geschreven.append((tabel, lezen(tabel) == dict(waarden))))
+    
+    try:
+        with register.sessie():
+            register.opslaan("salaris", {"a": 1})
+            register.opslaan("land", {})
+            assert geschreven == []
+    finally:
+        register.bij_schrijven.pop()
+    
+    # één keer per tabel en pas als het bestand al is vervangen
+    assert sorted(geschreven) == [("land", True), ("salaris", True)]
+
+def test_bewerken_geeft_eigen_kopie(referenties):
+    
+    categorieen             =   register.bewerken("categorie")
+    categorieen["c1"].naam  =   "wonen"
+    assert register["categorie"]["c1"].naam == "huur"
+    
+    # met sleutels alleen een kopie van die waarden
+    categorieen =   register.bewerken("categorie", ["c2"])
+    assert categorieen["c2"] is not register["categorie"]["c2"]
+    assert categorieen["c1"] is register["categorie"]["c1"]
+    
+    with pytest.raises(TypeError):
+        register["categorie"]["c9"] =   categorieen["c1"]
\ No newline at end of file
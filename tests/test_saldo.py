@@ -0,0 +1,109 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from platus.gegevens.saldo import samenvoegen_saldi
+
+
+def maken_som_oud(
+    bankrekeningen  :   dict,
+    leningen        :   dict,
+    ):
+    
+    # maken_som uit de weergave van vóór samenvoegen_saldi
+    bankrekening_som                =   reduce(lambda left, right: pd.merge(left, right, on = "datumtijd", how = "outer", suffixes = ("_1", "_2")), [bankrekening[["datumtijd", "eindsaldo"]] for bankrekening in bankrekeningen.values()]).ffill().fillna(0)
+    bankrekening_som["eindsaldo"]   =   bankrekening_som.drop("datumtijd", axis=1).sum(axis=1)
+    bankrekening_som                =   bankrekening_som.loc[:, bankrekening_som.columns.intersection(["datumtijd", "eindsaldo"])]
+    
+    lening_som                      =   reduce(lambda left, right: pd.merge(left, right, on = "datumtijd", how = "outer", suffixes = ("_1", "_2")), [lening[["datumtijd", "eindsaldo"]] for lening in leningen.values()]).ffill().fillna(0)
+    lening_som["eindsaldo"]         =   lening_som.drop("datumtijd", axis=1).sum(axis=1)
+    lening_som                      =   lening_som.loc[:, lening_som.columns.intersection(["datumtijd", "eindsaldo"])]
+    
+    return bankrekening_som, lening_som
+
+def maken_rekening(
+    generator   :   np.random.Generator,
+    aantal      :   int,
+    ) -> pd.DataFrame:
+    
+    # oplopende, per rekening unieke tijdstippen; tussen rekeningen vallen ze soms samen
+    uren    =   np.sort(generator.choice(np.arange(20000), aantal, replace = False))
+    
+    return pd.DataFrame({
+        "index":        np.arange(aantal),
+        "datumtijd":    pd.Timestamp("2020-01-01") + pd.to_timedelta(uren, unit = "h"),
+        "eindsaldo":    np.round(generator.normal(0, 1000, aantal), 2),
+        })
+
+@pytest.fixture
+def rekeningen():
+    
+    # maken_som kon niet meer dan drie rekeningen per groep samenvoegen (de
+    # achtervoegsels gaan dan dubbel), samenvoegen_saldi wel
+    generator   =   np.random.default_rng(1)
+    return {nummer: maken_rekening(generator, 400) for nummer in range(3)}, {nummer: maken_rekening(generator, 200) for nummer in range(2)}
+
+def test_gelijk_aan_maken_som(rekeningen):
+    
+    bankrekeningen, leningen    =   rekeningen
+    bankrekening_som, lening_som    =   maken_som_oud(bankrekeningen, leningen)
+    som                             =   samenvoegen_saldi({"bankrekening": bankrekeningen.values(), "lening": leningen.values()}).set_index("datumtijd")
+    
+    # de oude som heeft een rij per tijdstip van zijn eigen groep
+    for groep, oud in (("bankrekening", bankrekening_som), ("lening", lening_som)):
+        oud =   oud.sort_values("datumtijd").set_index("datumtijd")["eindsaldo"]
+        np.testing.assert_allclose(som[groep].reindex(oud.index).to_numpy(), oud.to_numpy(), atol = 1e-6)
+    
+    np.testing.assert_allclose(som["eindsaldo"].to_numpy(), (som["bankrekening"] + som["lening"]).to_numpy(), atol = 1e-6)
+    assert som.index.is_unique and som.index.is_monotonic_increasing
+
+def test_meer_dan_drie_rekeningen(rekeningen):
+    
+    bankrekeningen, _   =   rekeningen
+    generator           =   np.random.default_rng(2)
+    extra               =   {nummer: maken_rekening(generator, 100) for nummer in range(3)}
+    som                 =   samenvoegen_saldi({"bankrekening": [*bankrekeningen.values(), *extra.values()]})
+    los                 =   [samenvoegen_saldi({"bankrekening": rekeningen.values()}).set_index("datumtijd")["bankrekening"] for rekeningen in (bankrekeningen, extra)]
+    
+    # de som van twee losse sommen, elk doorgetrokken naar alle tijdstippen
+    verwacht            =   sum(deel.reindex(som["datumtijd"]).ffill().fillna(0) for deel in los)
+    np.testing.assert_allclose(som["bankrekening"].to_numpy(), verwacht.to_numpy(), atol = 1e-6)
+
+def test_datumtijd_niet_op_volgorde_van_index():
+    
+    # een pinbetaling die later is verwerkt: het saldo op elk tijdstip is het
+    # eindsaldo van de laatste transactie (op datumtijd, dan index) tot dan
+    rekening    =   pd.DataFrame({
+        "index":        [0, 1, 2, 3],
+        "datumtijd":    pd.to_datetime(["2024-01-01 00:00", "2024-01-03 00:00", "2024-01-02 14:30", "2024-01-03 00:00"]),
+        "eindsaldo":    [100.0, 80.0, 90.0, 70.0],
+        })
+    
+    som =   samenvoegen_saldi({"bankrekening": [rekening]})
+    
+    assert som["datumtijd"].tolist() == list(pd.to_datetime(["2024-01-01 00:00", "2024-01-02 14:30", "2024-01-03 00:00"]))
+    assert som["bankrekening"].tolist() == [100.0, 90.0, 70.0]
+
+def test_resoluties(rekeningen):
+    
+    bankrekeningen, leningen    =   rekeningen
+    groepen                     =   {"bankrekening": bankrekeningen.values(), "lening": leningen.values()}
+    som                         =   samenvoegen_saldi(groepen).set_index("datumtijd")
+    
+    for resolutie, frequentie in (("dag", "D"), ("maand", "ME")):
+        verwacht    =   som.resample(frequentie).last().ffill().reset_index()
+        pd.testing.assert_frame_equal(samenvoegen_saldi(groepen, resolutie), verwacht)
+
+def test_onbekende_resolutie():
+    
+    with pytest.raises(ValueError):
+        samenvoegen_saldi({"bankrekening": []}, "week")
+
+def test_zonder_transacties():
+    
+    som =   samenvoegen_saldi({"bankrekening": [], "lening": [pd.DataFrame(columns = ["index", "datumtijd", "eindsaldo"])]}, "maand")
+    
+    assert len(som) == 0
+    assert list(som.columns) == ["datumtijd", "bankrekening", "lening", "eindsaldo"]
\ No newline at end of file
@@ -0,0 +1,110 @@
+from contextlib import closing
+import datetime as dt
+import sqlite3
+
+import pytest
+
+from platus.gegevens.opslag import JsonOpslag, SqliteOpslag, omzetten, opslag
+from platus.gegevens.register import register
+
+
+def naar_json(transacties: dict) -> dict:
+    return {transactie_uuid: transactie.naar_json() for transactie_uuid, transactie in transacties.items()}
+
+def test_heen_en_terug(transacties):
+    
+    opslag_sqlite   =   SqliteOpslag()
+    opslag_sqlite.opslaan("r1", transacties)
+    
+    assert opslag_sqlite.bestaat("r1")
+    assert not opslag_sqlite.bestaat("r2")
+    assert naar_json(opslag_sqlite.openen("r1")) == naar_json(transacties)
+    assert naar_json(opslag_sqlite.blok("r1")) == naar_json(transacties)
+    assert list(opslag_sqlite.kolommen("r1")["uuid"]) == list(transacties.keys())
+
+def test_aanvullen_en_vervangen(transacties):
+    
+    opslag_sqlite   =   SqliteOpslag()
+    eerste          =   {transactie_uuid: transacties[transactie_uuid] for transactie_uuid in list(transacties.keys())[:100]}
+    
+    opslag_sqlite.opslaan("r1", eerste)
+    opslag_sqlite.opslaan("r1", transacties, nieuw = list(transacties.keys())[100:])
+    assert naar_json(opslag_sqlite.openen("r1")) == naar_json(transacties)
+    
+    # volledig opslaan vervangt de rekening, andere rekeningen blijven staan
+    opslag_sqlite.opslaan("r2", eerste)
+    opslag_sqlite.opslaan("r1", eerste)
+    assert naar_json(opslag_sqlite.openen("r1")) == naar_json(eerste)
+    assert naar_json(opslag_sqlite.openen("r2")) == naar_json(eerste)
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"van": dt.datetime(2023, 6, 1), "tot": dt.datetime(2023, 12, 31, 23, 59)},
+    {"derde_uuid": "b1"},
+    {"cat_uuid": "c2", "van": dt.datetime(2024, 1, 1)},
+    {"derde_uuid": "p1", "cat_uuid": "c2"},
+    ])
+def test_zoeken_gelijk_aan_filteren(transacties, filters):
+    
+    # de SQL-voorwaarden tegen het filteren op de kolommen van Opslag.zoeken
+    JsonOpslag().opslaan("r1", transacties)
+    SqliteOpslag().opslaan("r1", transacties)
+    
+    assert naar_json(SqliteOpslag().zoeken("r1", **filters)) == naar_json(JsonOpslag().zoeken("r1", **filters))
+
+def test_schema_en_indexen(transacties):
+    
+    opslag_sqlite   =   SqliteOpslag()
+    opslag_sqlite.opslaan("r1", transacties)
+    
+    with closing(sqlite3.connect(opslag_sqlite.pad())) as verbinding:
+        indexen =   {rij[0] for rij in verbinding.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactie'")}
+        plan    =   " ".join(str(rij) for rij in verbinding.execute("EXPLAIN QUERY PLAN SELECT * FROM transactie WHERE derde_uuid = ? AND datumtijd >= ?", ("b1", "2024-01-01")))
+        
+        assert {"transactie_index", "transactie_datumtijd", "transactie_derde", "transactie_categorie"} <= indexen
+        assert "transactie_derde" in plan
+        
+        # een transactie met een kapotte saldoketen wordt geweigerd
+        with pytest.raises(sqlite3.IntegrityError):
+            verbinding.execute("INSERT INTO transactie VALUES ('r1', 'x', 999, 0, 10, 0, 11, 'overboeking', '2024-01-01T00:00:00', NULL, NULL, NULL)")
+        with pytest.raises(sqlite3.IntegrityError):
+            verbinding.execute("INSERT INTO transactie VALUES ('r1', 'x', 0, 0, 10, 0, 10, 'overboeking', '2024-01-01T00:00:00', NULL, NULL, NULL)")
+
+def test_spiegelen_referentie(referenties, gegevens):
+    
+    gegevens("opslag", {"formaat": "sqlite"})
+    
+    bedrijven                   =   register.bewerken("bedrijf", ["b1"])
+    bedrijven["b1"].iban        =   ["NL91ABNA0417164300"]
+    bedrijven["b1"].synoniemen  =   ["ah"]
+    register.opslaan("bedrijf", bedrijven)
+    
+    with closing(sqlite3.connect(SqliteOpslag().pad())) as verbinding:
+        assert verbinding.execute("SELECT uuid, naam, synoniemen, cat_uuid FROM bedrijf ORDER BY uuid").fetchall() == [("b1", "Albert Heijn", "[\"ah\"]", "c2"), ("onbekend", "onbekend", None, None)]
+        assert verbinding.execute("SELECT * FROM iban").fetchall() == [("NL91ABNA0417164300", "bedrijf", "b1")]
+    
+    # een nieuwe versie vervangt de hele tabel
+    bedrijven   =   register.bewerken("bedrijf")
+    del bedrijven["onbekend"]
+    bedrijven["b1"].iban    =   []
+    register.opslaan("bedrijf", bedrijven)
+    
+    with closing(sqlite3.connect(SqliteOpslag().pad())) as verbinding:
+        assert verbinding.execute("SELECT uuid FROM bedrijf").fetchall() == [("b1",)]
+        assert verbinding.execute("SELECT * FROM iban").fetchall() == []
+
+def test_omzetten_van_json_naar_sqlite(transacties):
+    
+    JsonOpslag().opslaan("r1", transacties)
+    JsonOpslag().opslaan("r2", {})
+    
+    omzetten("sqlite", "json")
+    
+    assert naar_json(opslag("sqlite").openen("r1")) == naar_json(transacties)
+    assert opslag("sqlite").bestaat("r2")
+    assert len(opslag("sqlite").blok("r2")) == 0
+    
+    with closing(sqlite3.connect(SqliteOpslag().pad())) as verbinding:
+        for tabel in SqliteOpslag.REFERENTIETABELLEN.keys():
+            assert {rij[0] for rij in verbinding.execute(f"SELECT uuid FROM {tabel}")} == set(register[tabel].keys())
+        assert verbinding.execute("SELECT * FROM iban").fetchall() == [("NL91ABNA0417164300", "persoon", "p1")]
\ No newline at end of file
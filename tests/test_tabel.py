@@ -0,0 +1,39 @@
+import pandas as pd
+
+from platus.gegevens.blok import TransactieBlok
+from platus.gegevens.opslag import opslag
+from platus.gegevens.rekening import Bankrekening
+from platus.gegevens.tabel import KOLOMMEN_TABEL, laden_tabel, maken_tabel, referentietabellen
+
+
+def naar_tabel(transacties: dict) -> pd.DataFrame:
+    
+    # zoals Rekening.tabel vóór maken_tabel: één naar_tabel per transactie
+    return pd.DataFrame(transactie.naar_tabel() for transactie in sorted(transacties.values(), key = lambda transactie: transactie.index))
+
+def test_maken_tabel_gelijk_aan_naar_tabel(transacties):
+    
+    pd.testing.assert_frame_equal(maken_tabel(TransactieBlok(transacties).kolommen()), naar_tabel(transacties))
+
+def test_laden_tabel_gelijk_aan_tabel(transacties):
+    
+    opslag().opslaan("r1", transacties)
+    rekening    =   Bankrekening.openen("r1")
+    
+    pd.testing.assert_frame_equal(laden_tabel("r1"), naar_tabel(transacties))
+    pd.testing.assert_frame_equal(rekening.tabel(), naar_tabel(transacties))
+
+def test_maken_tabel_zonder_locaties(transacties):
+    
+    # een kolom zonder enige waarde blijft een kolom met None, net als bij naar_tabel
+    zonder  =   {transactie_uuid: transactie for transactie_uuid, transactie in transacties.items() if not transactie.details}
+    
+    pd.testing.assert_frame_equal(maken_tabel(TransactieBlok(zonder).kolommen()), naar_tabel(zonder))
+    assert maken_tabel(TransactieBlok(zonder).kolommen())["locatie"].isna().all()
+
+def test_maken_tabel_leeg(referenties):
+    
+    tabel   =   maken_tabel(TransactieBlok().kolommen(), referentietabellen())
+    
+    assert len(tabel) == 0
+    assert list(tabel.columns) == KOLOMMEN_TABEL
\ No newline at end of file
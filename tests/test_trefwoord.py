@@ -0,0 +1,85 @@
+import pandas as pd
+
+from platus.gegevens.register import register
+from platus.gegevens.trefwoord import Automaat, TrefwoordAutomaat
+
+
+CATEGORIEEN =   {
+    "boodschappen": {"naam": "boodschappen", "hoofdcat_uuid": "h", "kleur": "#000000", "trefwoorden": ["albert heijn", "jumbo", "ah"]},
+    "huur":         {"naam": "huur", "hoofdcat_uuid": "h", "kleur": "#000000", "trefwoorden": ["huur"]},
+    "vervoer":      {"naam": "vervoer", "hoofdcat_uuid": "h", "kleur": "#000000", "trefwoorden": ["ns", "albert heijn to go", "huurauto"]},
+    "overig":       {"naam": "overig", "hoofdcat_uuid": "h", "kleur": "#000000", "trefwoorden": ["jumbo"]},
+    }
+
+def categoriseren_oud(tekst: str) -> str | None:
+    
+    # Transactie.verwerken_cat_uuid van vóór de automaat: de eerste
+    # categorie in het register met een trefwoord in de tekst
+    for cat_uuid, categorie in register["categorie"].items():
+        for trefwoord in categorie.trefwoorden:
+            if trefwoord in tekst.casefold():
+                return cat_uuid
+    return None
+
+def test_alle_treffers_ook_binnen_elkaar():
+    
+    automaat    =   Automaat().opbouwen([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    
+    assert sorted(automaat.zoeken("USHERS")) == [(1, "she"), (2, "he"), (2, "hers")]
+    assert automaat.zoeken("") == []
+
+def test_dubbel_en_leeg_trefwoord():
+    
+    automaat    =   Automaat().opbouwen([("a", "eerste"), ("", "leeg"), ("a", "tweede")])
+    
+    assert automaat.prioriteit == {"a": (0, "eerste")}
+    assert automaat.zoeken("aa") == [(0, "a"), (1, "a")]
+
+def test_gelijk_aan_oud_zonder_conflict(gegevens):
+    
+    gegevens("categorie", CATEGORIEEN)
+    automaat    =   TrefwoordAutomaat()
+    
+    # hoogstens één categorie per tekst, of de langste hoort bij de eerste categorie
+    for tekst in ("Albert Heijn 1234 Utrecht", "HUUR januari", "NS GROEP IZ NS REIZIGERS", "Jumbo Houten", "Albert Heijn HUUR", "onbekend", ""):
+        assert automaat.categoriseren(tekst) == categoriseren_oud(tekst)
+
+def test_langste_trefwoord_gaat_voor(gegevens):
+    
+    gegevens("categorie", CATEGORIEEN)
+    automaat    =   TrefwoordAutomaat()
+    
+    # de oude lus gaf de eerste categorie, de automaat het langste trefwoord
+    assert categoriseren_oud("Albert Heijn to go Centraal") == "boodschappen"
+    assert automaat.categoriseren("Albert Heijn to go Centraal") == "vervoer"
+    assert automaat.categoriseren("huurauto Sixt") == "vervoer"
+
+def test_bij_gelijke_lengte_eerste_categorie(gegevens):
+    
+    gegevens("categorie", CATEGORIEEN)
+    automaat    =   TrefwoordAutomaat()
+    
+    # "jumbo" staat bij boodschappen en overig; het dubbele trefwoord blijft bij de eerste
+    assert automaat.categoriseren("Jumbo") == "boodschappen"
+    # "ah" en "ns" even lang: boodschappen staat eerder in het register, ongeacht de positie
+    assert automaat.categoriseren("ns ah") == "boodschappen"
+
+def test_opnieuw_opbouwen_na_wijziging(gegevens):
+    
+    gegevens("categorie", CATEGORIEEN)
+    automaat    =   TrefwoordAutomaat()
+    assert automaat.categoriseren("Coolblue") is None
+    
+    gegevens("categorie", {**CATEGORIEEN, "elektronica": {"naam": "elektronica", "hoofdcat_uuid": "h", "kleur": "#000000", "trefwoorden": ["coolblue"]}})
+    assert automaat.categoriseren("Coolblue") == "elektronica"
+
+def test_categoriseren_bulk(gegevens):
+    
+    gegevens("categorie", CATEGORIEEN)
+    automaat    =   TrefwoordAutomaat()
+    teksten     =   pd.Series(["Albert Heijn", None, "huur", "Albert Heijn", "niets"], index = [5, 6, 7, 8, 9], dtype = object)
+    
+    uitkomst    =   automaat.categoriseren_bulk(teksten)
+    
+    assert list(uitkomst.index) == [5, 6, 7, 8, 9]
+    assert uitkomst.tolist() == [automaat.categoriseren(tekst or "") for tekst in teksten]
\ No newline at end of file
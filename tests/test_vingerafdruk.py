@@ -0,0 +1,131 @@
+import json
+import os
+
+import openpyxl
+
+from platus.gegevens.bankexport import BankexportRij
+from platus.gegevens.gegevens import importeren
+from platus.gegevens.opslag import opslag
+from platus.gegevens.rekening import Bankrekening
+from platus.gegevens.vingerafdruk import Vingerafdrukken, vingerafdruk
+
+
+def maken_rijen(aantal: int) -> list:
+    
+    rijen   =   []
+    saldo   =   10.0
+    
+    for dag in range(aantal):
+        rijen.append(BankexportRij(123456789, "EUR", 20240201 + dag, 20240201 + dag, saldo, round(saldo + 0.25, 2), 0.25, f"rente  februari {dag}"))
+        saldo   =   round(saldo + 0.25, 2)
+    
+    return rijen
+
+def schrijven_export(rijen: list):
+    
+    werkboek    =   openpyxl.Workbook()
+    werkboek.active.append(list(BankexportRij._fields))
+    for rij in rijen:
+        werkboek.active.append(list(rij))
+    werkboek.save(Bankrekening.openen("r1").pad_maand(2024, 2))
+
+def lezen_bestand(pad: str) -> dict:
+    
+    bekend  =   {}
+    with open(pad, "r", encoding = "utf-8") as bestand:
+        for regel in bestand:
+            bekend.update(json.loads(regel))
+    return bekend
+
+def test_vingerafdruk():
+    
+    rij =   maken_rijen(1)[0]
+    
+    assert vingerafdruk(rij) == vingerafdruk(rij._replace(omschrijving = "RENTE februari   0 "))
+    assert vingerafdruk(rij) != vingerafdruk(rij._replace(beginsaldo = 10.01, eindsaldo = 10.26))
+    assert vingerafdruk(rij) != vingerafdruk(rij._replace(rentedatum = 20240202))
+
+def test_filteren_en_opslaan():
+    
+    rijen           =   maken_rijen(4)
+    vingerafdrukken =   Vingerafdrukken("r")
+    
+    for positie, rij in enumerate(vingerafdrukken.filteren(rijen[:2])):
+        vingerafdrukken.toevoegen(f"t{positie}")
+    vingerafdrukken.opslaan()
+    
+    # een nieuw exemplaar leest het bestand
+    vingerafdrukken =   Vingerafdrukken("r")
+    nieuw           =   list(vingerafdrukken.filteren(rijen))
+    
+    assert nieuw == rijen[2:]
+    assert vingerafdrukken.overgeslagen == 2
+    assert len(vingerafdrukken) == 2
+
+def test_dubbele_rij_in_dezelfde_export():
+    
+    # ook als de eerste rij nog wacht op zijn transactie
+    rijen           =   maken_rijen(3)
+    vingerafdrukken =   Vingerafdrukken("r")
+    
+    assert list(vingerafdrukken.filteren([rijen[0], rijen[1], rijen[0], rijen[2], rijen[1]])) == rijen
+    assert vingerafdrukken.overgeslagen == 2
+
+def test_half_geschreven_regel():
+    
+    rijen           =   maken_rijen(2)
+    vingerafdrukken =   Vingerafdrukken("r")
+    
+    for positie, rij in enumerate(vingerafdrukken.filteren(rijen)):
+        vingerafdrukken.toevoegen(f"t{positie}")
+    vingerafdrukken.opslaan()
+    with open(vingerafdrukken.pad, "a", encoding = "utf-8") as bestand:
+        bestand.write("{\"abc")
+    
+    assert Vingerafdrukken("r").bekend == {vingerafdruk(rijen[0]): "t0", vingerafdruk(rijen[1]): "t1"}
+
+def test_hernoemen():
+    
+    rijen           =   maken_rijen(2)
+    vingerafdrukken =   Vingerafdrukken("r")
+    
+    for positie, rij in enumerate(vingerafdrukken.filteren(rijen)):
+        vingerafdrukken.toevoegen(f"t{positie}")
+    vingerafdrukken.hernoemen({"t1": "t9"})
+    
+    assert lezen_bestand(vingerafdrukken.pad) == {vingerafdruk(rijen[0]): "t0", vingerafdruk(rijen[1]): "t9"}
+    assert not os.path.exists(f"{vingerafdrukken.pad}.nieuw")
+
+def test_overlappende_import_wordt_overgeslagen(referenties):
+    
+    rijen   =   maken_rijen(8)
+    
+    schrijven_export(rijen[:5])
+    importeren(["r1"], "2024-02", processen = 1)
+    assert len(opslag().kolommen("r1")) == 5
+    
+    # dezelfde maand opnieuw, nu met drie rijen meer
+    schrijven_export(rijen)
+    importeren(["r1"], "2024-02", processen = 1)
+    importeren(["r1"], "2024-02", processen = 1)
+    
+    kolommen    =   opslag().kolommen("r1")
+    assert kolommen["index"].tolist() == list(range(8))
+    assert kolommen["eindsaldo"].tolist() == [int(round(100 * rij.eindsaldo)) for rij in rijen]
+    assert len(lezen_bestand(Vingerafdrukken("r1").pad)) == 8
+
+def test_aanvullen_geeft_dezelfde_vingerafdrukken(referenties):
+    
+    rijen   =   maken_rijen(6)
+    
+    schrijven_export(rijen)
+    importeren(["r1"], "2024-02", processen = 1)
+    voor    =   lezen_bestand(Vingerafdrukken("r1").pad)
+    
+    # alsof de rijen zijn geïmporteerd voordat er vingerafdrukken waren
+    os.remove(Vingerafdrukken("r1").pad)
+    bankrekening    =   Bankrekening.openen("r1")
+    
+    assert bankrekening.aanvullen_vingerafdrukken(bankrekening.pad_maand(2024, 2)) == 6
+    assert lezen_bestand(Vingerafdrukken("r1").pad) == voor
+    assert Bankrekening.openen("r1").aanvullen_vingerafdrukken(bankrekening.pad_maand(2024, 2)) == 0
\ No newline at end of file